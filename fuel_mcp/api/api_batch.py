@@ -0,0 +1,372 @@
+"""
+api_batch.py
+============
+Batch correction endpoints.
+
+POST /vcf/batch computes VCF for many {rho15, tempC} records through the
+vectorized vcf_iso_official_batch() path. Input is a JSON array or an
+NDJSON stream; output is streamed back as NDJSON, MCP_BATCH_CHUNK_ROWS
+records at a time, so an NDJSON upload of 10^6 rows never sits in memory
+as a whole. Rows that cannot be computed (bad record, out-of-range
+density) are reported inline as {"row": i, "error": ...} and do not fail
+the batch. A final {"summary": {...}} record closes the stream, and the
+batch is written to the history as one summarized entry.
+
+POST /auto_correct/batch takes a whole tank sounding sheet (fuel, observed
+volume or mass, temperature, optional rho15 per tank) and runs it through
+auto_correct_batch(): densities are looked up once per fuel and the VCF,
+V15, mass and equivalents are computed for all tanks at once. The response
+holds per-tank results, per-fuel subtotals and sheet totals, and the sheet
+is logged as one record.
+"""
+
+import json
+import math
+import os
+import time
+from typing import AsyncIterator, Iterable
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from fuel_mcp import __version__
+from fuel_mcp.api.responses import MCPJSONResponse
+from fuel_mcp.core.async_logger import log_error_async, log_query_async
+from fuel_mcp.core.executors import run_cpu
+from fuel_mcp.core.metrics import stage_timer
+from fuel_mcp.core.response_schema import error_response, success_response
+from fuel_mcp.core.vcf_official_full import (
+    EQUIVALENTS,
+    VCF_INVALID,
+    VCF_TABLE_IDS,
+    auto_correct_batch,
+    density_error,
+    vcf_iso_official_batch,
+)
+
+router = APIRouter(tags=["Batch corrections"])
+
+CHUNK_ROWS = int(os.getenv("MCP_BATCH_CHUNK_ROWS", "10000"))
+MAX_SHEET_TANKS = 10_000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+# =====================================================
+# 📥 Input
+# =====================================================
+class BadRecord:
+    """Placeholder for an input line that could not be decoded."""
+
+    __slots__ = ("message",)
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def is_ndjson(request: Request) -> bool:
+    content_type = request.headers.get("content-type", "")
+    return "ndjson" in content_type or "jsonlines" in content_type
+
+
+def _decode_line(line: bytes) -> object:
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        return BadRecord(f"Invalid JSON: {e}")
+
+
+async def iter_ndjson(request: Request) -> AsyncIterator[object]:
+    """Decode an NDJSON request body record by record as it arrives (blank lines skipped)."""
+    pending = b""
+    async for block in request.stream():
+        pending += block
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _decode_line(line)
+    if pending.strip():
+        yield _decode_line(pending)
+
+
+async def iter_records(request: Request, key: str = "rows") -> AsyncIterator[object]:
+    """
+    Records of a batch body: NDJSON (streamed), a JSON array, or a JSON
+    object holding the array under `key`. Raises ValueError for a JSON body
+    of any other shape.
+    """
+    if is_ndjson(request):
+        async for record in iter_ndjson(request):
+            yield record
+        return
+    raw = await request.body()
+    payload = json.loads(raw) if raw.strip() else []
+    if isinstance(payload, dict):
+        payload = payload.get(key)
+    if not isinstance(payload, list):
+        raise ValueError(f"Body must be a JSON array, an object with a '{key}' array, or NDJSON.")
+    for record in payload:
+        yield record
+
+
+async def iter_chunks(records: AsyncIterator[object], size: int) -> AsyncIterator[list]:
+    chunk = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _number(record: object, field: str) -> float:
+    if not isinstance(record, dict):
+        raise ValueError("record must be a JSON object")
+    value = record.get(field)
+    if value is None:
+        raise ValueError(f"missing '{field}'")
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"'{field}' must be a number")
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"'{field}' must be a number") from None
+    if not math.isfinite(number):  # "nan" / "inf" parse as floats
+        raise ValueError(f"'{field}' must be a finite number")
+    return number
+
+
+def ndjson_lines(records: Iterable[dict]) -> bytes:
+    return b"".join(orjson.dumps(r, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n" for r in records)
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose generator is still reading the request body.
+
+    The stock class listens for a client disconnect on the same receive
+    channel, which starves request.stream(); here the generator owns the
+    channel (a disconnect surfaces as ClientDisconnect from request.stream()).
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+# =====================================================
+# 🧮 POST /vcf/batch
+# =====================================================
+def vcf_chunk(first_row: int, records: list) -> tuple[list[dict], int]:
+    """VCF output records for one chunk of input records, and the number of errors among them."""
+    n = len(records)
+    rho = np.full(n, 850.0)  # placeholder for rows that fail to decode; overwritten by their error
+    temp = np.full(n, 15.0)
+    errors: dict[int, str] = {}
+    for i, record in enumerate(records):
+        if isinstance(record, BadRecord):
+            errors[i] = record.message
+            continue
+        try:
+            rho[i] = _number(record, "rho15")
+            temp[i] = _number(record, "tempC")
+        except ValueError as e:
+            errors[i] = str(e)
+
+    with stage_timer("vcf_batch"):
+        out = vcf_iso_official_batch(rho, temp, invalid="mask")
+    invalid = out["table"] == VCF_INVALID
+    for i in np.flatnonzero(invalid).tolist():
+        errors.setdefault(i, density_error(float(rho[i])))
+
+    rows = []
+    vcf, a, b = out["VCF"].tolist(), out["coefficient_a"].tolist(), out["exponent_b"].tolist()
+    tables = out["table"].tolist()
+    rho_l, temp_l = rho.tolist(), temp.tolist()
+    for i in range(n):
+        if i in errors:
+            rows.append({"row": first_row + i, "error": errors[i]})
+        else:
+            rows.append({
+                "row": first_row + i,
+                "rho15": rho_l[i],
+                "tempC": temp_l[i],
+                "table": VCF_TABLE_IDS[tables[i]],
+                "coefficient_a": a[i],
+                "exponent_b": b[i],
+                "VCF": vcf[i],
+            })
+    return rows, len(errors)
+
+
+@router.post("/vcf/batch")
+async def vcf_batch(request: Request):
+    """
+    Compute VCF for many {"rho15", "tempC"} records.
+
+    Body: a JSON array (or {"rows": [...]}) or NDJSON
+    (Content-Type: application/x-ndjson). Response: NDJSON, one record per
+    input row in order, then a {"summary": ...} record.
+    """
+
+    async def stream():
+        started = time.perf_counter()
+        rows = errors = chunks = 0
+        chunk_size = CHUNK_ROWS
+        try:
+            async for chunk in iter_chunks(iter_records(request), chunk_size):
+                out, failed = await run_cpu(vcf_chunk, rows, chunk)
+                rows += len(chunk)
+                errors += failed
+                chunks += 1
+                yield ndjson_lines(out)
+        except ValueError as e:
+            log_error_async("api_batch", f"/vcf/batch: {e}")
+            yield ndjson_lines([{"error": f"❌ Invalid batch body: {e}"}])
+            errors += 1
+
+        summary = {
+            "rows": rows,
+            "ok": rows - min(errors, rows),
+            "errors": errors,
+            "chunks": chunks,
+            "chunk_size": chunk_size,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        log_query_async(f"vcf_batch {rows} rows", summary, "vcf_batch", summary["ok"] > 0)
+        yield ndjson_lines([{"summary": summary}])
+
+    return BodyStreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
+
+
+# =====================================================
+# ⚖️ POST /auto_correct/batch
+# =====================================================
+def _sheet_inputs(tanks: list) -> tuple[dict, dict[int, str]]:
+    """Column arrays for auto_correct_batch() and {index: error} for tanks that cannot be computed."""
+    n = len(tanks)
+    cols = {
+        "fuel": [""] * n,
+        "tempC": np.full(n, 15.0),
+        "volume_m3": np.full(n, np.nan),
+        "mass_ton": np.full(n, np.nan),
+        "rho15": np.full(n, np.nan),
+    }
+    errors: dict[int, str] = {}
+    for i, tank in enumerate(tanks):
+        try:
+            if isinstance(tank, BadRecord):
+                raise ValueError(tank.message)
+            if not isinstance(tank, dict):
+                raise ValueError("tank must be a JSON object")
+            fuel = tank.get("fuel")
+            if not isinstance(fuel, str) or not fuel.strip():
+                raise ValueError("missing 'fuel'")
+            cols["fuel"][i] = fuel.strip().lower()
+            cols["tempC"][i] = _number(tank, "tempC")
+            has_volume, has_mass = tank.get("volume_m3") is not None, tank.get("mass_ton") is not None
+            if has_volume == has_mass:
+                raise ValueError("Provide either volume_m3 or mass_ton (not both).")
+            if has_volume:
+                cols["volume_m3"][i] = _number(tank, "volume_m3")
+            else:
+                cols["mass_ton"][i] = _number(tank, "mass_ton")
+            if tank.get("rho15") is not None:
+                cols["rho15"][i] = _number(tank, "rho15")
+        except ValueError as e:
+            errors[i] = str(e)
+            cols["fuel"][i] = ""
+            cols["volume_m3"][i], cols["mass_ton"][i] = 1.0, np.nan  # computed as a placeholder, then dropped
+            cols["rho15"][i] = 850.0
+    return cols, errors
+
+
+def correct_sheet(tanks: list) -> dict:
+    """Per-tank results, per-fuel subtotals and totals for one tank sheet."""
+    cols, errors = _sheet_inputs(tanks)
+    with stage_timer("auto_correct_batch"):
+        out = auto_correct_batch(cols["fuel"], cols["tempC"], cols["volume_m3"], cols["mass_ton"], cols["rho15"])
+    for i in np.flatnonzero(out["table"] == VCF_INVALID).tolist():
+        errors.setdefault(i, density_error(float(out["rho15"][i])))
+
+    ok = np.ones(len(tanks), dtype=bool)
+    ok[list(errors)] = False
+    columns = {name: values.tolist() for name, values in out.items()}
+    results, by_fuel = [], {}
+    for i, tank in enumerate(tanks):
+        row = {"row": i}
+        if isinstance(tank, dict) and tank.get("tank") is not None:
+            row["tank"] = tank["tank"]
+        if i in errors:
+            row["error"] = errors[i]
+            results.append(row)
+            continue
+        volume_input = columns["volume_input"][i]
+        row.update({
+            "fuel": cols["fuel"][i],
+            "mode": "volume_input" if volume_input else "mass_input",
+            "tempC": float(cols["tempC"][i]),
+            "rho15": columns["rho15"][i],
+            "table": VCF_TABLE_IDS[columns["table"][i]],
+            "VCF": columns["VCF"][i],
+        })
+        if volume_input:
+            row["observed_m3"] = float(cols["volume_m3"][i])
+        else:
+            row["rhoT_ton_m3"] = columns["rhoT_ton_m3"][i]
+            row["volume_obs_m3"] = columns["volume_obs_m3"][i]
+        row["V15_m3"] = columns["V15_m3"][i]
+        row["mass_ton"] = columns["mass_ton"][i]
+        row["equivalents"] = {"m3_15C": columns["m3_15C"][i], **{c: columns[c][i] for c, _, _ in EQUIVALENTS}}
+        results.append(row)
+
+        subtotal = by_fuel.setdefault(row["fuel"], {"tanks": 0, "V15_m3": 0.0, "mass_ton": 0.0})
+        subtotal["tanks"] += 1
+        subtotal["V15_m3"] += row["V15_m3"]
+        subtotal["mass_ton"] += row["mass_ton"]
+
+    for subtotal in by_fuel.values():
+        subtotal["V15_m3"] = round(subtotal["V15_m3"], 3)
+        subtotal["mass_ton"] = round(subtotal["mass_ton"], 3)
+    totals = {
+        "tanks": len(tanks),
+        "ok": int(ok.sum()),
+        "errors": len(errors),
+        "V15_m3": round(float(out["V15_m3"][ok].sum()), 3),
+        "mass_ton": round(float(out["mass_ton"][ok].sum()), 3),
+        **{c: round(float(out[c][ok].sum()), ndigits) for c, _, ndigits in EQUIVALENTS},
+    }
+    return {"tanks": results, "by_fuel": by_fuel, "totals": totals}
+
+
+@router.post("/auto_correct/batch")
+async def auto_correct_sheet(request: Request):
+    """
+    Correct a whole tank sounding sheet in one call.
+
+    Body: {"tanks": [{"tank", "fuel", "tempC", "volume_m3" | "mass_ton", "rho15"?}, ...]},
+    a bare JSON array of tanks, or NDJSON. Tanks that cannot be computed
+    carry an "error" and are left out of the totals.
+    """
+    query_str = "auto_correct_batch"
+    try:
+        tanks = [tank async for tank in iter_records(request, key="tanks")]
+        if not tanks:
+            raise ValueError("No tanks in the sheet.")
+        if len(tanks) > MAX_SHEET_TANKS:
+            raise ValueError(f"Too many tanks ({len(tanks)}); limit is {MAX_SHEET_TANKS}.")
+        query_str = f"auto_correct_batch {len(tanks)} tanks"
+        result = await run_cpu(correct_sheet, tanks)
+    except ValueError as e:
+        log_error_async("api_batch", f"/auto_correct/batch: {e}")
+        return MCPJSONResponse(
+            status_code=400,
+            content=error_response(str(e), query_str, "error", __version__, "/auto_correct/batch"),
+        )
+
+    totals = result["totals"]
+    log_query_async(query_str, {"totals": totals, "by_fuel": result["by_fuel"]}, "auto_correct_batch", totals["ok"] > 0)
+    return MCPJSONResponse(content=success_response(result, query_str, "auto_correct_batch", __version__))
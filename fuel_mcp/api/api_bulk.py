@@ -0,0 +1,375 @@
+"""
+api_bulk.py
+===========
+Bulk corrections for uploaded tank-history files.
+
+POST /bulk/correct accepts a CSV or Parquet upload with the columns
+fuel, tempC, volume_m3 | mass_ton and optional rho15 (case-insensitive),
+and starts a background job. The job reads the file in fixed-size chunks
+(MCP_BULK_CHUNK_ROWS), runs each chunk through auto_correct_batch() and
+appends the enriched rows to an output file of the same format, so memory
+is bounded by the chunk size rather than the file size. Results go to
+`calc_`-prefixed columns (calc_table, calc_VCF, calc_V15_m3,
+calc_mass_ton, calc_volume_obs_m3, equivalents, calc_error); the uploaded
+columns are passed through unchanged, so an enriched file can be uploaded
+again (its calc_* columns are then recomputed).
+
+GET /bulk/jobs/{job_id} reports progress, chunk size and row throughput;
+GET /bulk/jobs/{job_id}/result downloads the enriched file when done.
+Parquet needs pyarrow (optional dependency).
+
+Jobs are per-process: they live in this process's job table and "bulk"
+pool, so with several server workers the status / result requests must
+reach the worker that accepted the upload (run one worker or use sticky
+routing), and jobs do not survive a restart. On shutdown cancel_jobs()
+drops queued jobs and stops running ones after their current chunk.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, File, Query, UploadFile
+from fastapi.responses import FileResponse
+
+from fuel_mcp import __version__
+from fuel_mcp.api.responses import MCPJSONResponse
+from fuel_mcp.core.async_logger import log_error_async, log_query_async
+from fuel_mcp.core.executors import get_pool, run_io
+from fuel_mcp.core.metrics import stage_timer
+from fuel_mcp.core.response_schema import error_response, success_response
+from fuel_mcp.core.vcf_official_full import EQUIVALENTS, VCF_INVALID, VCF_TABLE_IDS, auto_correct_batch, density_error
+
+router = APIRouter(prefix="/bulk", tags=["Bulk corrections"])
+
+# =====================================================
+# ⚙️ Settings
+# =====================================================
+CHUNK_ROWS = int(os.getenv("MCP_BULK_CHUNK_ROWS", "100000"))
+WORKERS = int(os.getenv("MCP_BULK_WORKERS", "2"))
+BULK_DIR = Path(os.getenv("MCP_BULK_DIR", Path(tempfile.gettempdir()) / "fuel_mcp_bulk"))
+MAX_JOBS = 50  # finished jobs kept (with their files) before the oldest are dropped
+
+FORMATS = ("csv", "parquet")
+MEDIA_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+OUTPUT_PREFIX = "calc_"  # keeps results apart from input columns such as mass_ton
+RESULT_FIELDS = ("table", "VCF", "V15_m3", "mass_ton", "volume_obs_m3", "m3_15C",
+                 *(column for column, _, _ in EQUIVALENTS), "error")
+OUTPUT_COLUMNS = tuple(OUTPUT_PREFIX + field for field in RESULT_FIELDS)
+ERROR_COLUMN = OUTPUT_COLUMNS[-1]
+_TABLE_LABELS = np.array((*VCF_TABLE_IDS, None), dtype=object)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet support requires pyarrow (pip install pyarrow).") from None
+    return pq
+
+
+# =====================================================
+# 🧮 Chunk processing
+# =====================================================
+def correct_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Input columns unchanged plus the OUTPUT_COLUMNS; rows that cannot be computed get a calc_error."""
+    columns = {str(c).lower().strip(): c for c in df.columns}
+    missing = [name for name in ("fuel", "tempc") if name not in columns]
+    if "volume_m3" not in columns and "mass_ton" not in columns:
+        missing.append("volume_m3 | mass_ton")
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    def numeric(name: str) -> np.ndarray:
+        if name not in columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[columns[name]], errors="coerce").to_numpy(dtype=np.float64)
+
+    fuel = df[columns["fuel"]].fillna("").astype(str).str.strip().str.lower().to_numpy(dtype=object)
+    temp, volume, mass, rho = numeric("tempc"), numeric("volume_m3"), numeric("mass_ton"), numeric("rho15")
+
+    errors = np.full(len(df), None, dtype=object)
+    errors[np.isnan(volume) == np.isnan(mass)] = "Provide either volume_m3 or mass_ton (not both)."
+    for name, values in (("rho15", rho), ("mass_ton", mass), ("volume_m3", volume), ("tempC", temp)):
+        errors[np.isinf(values)] = f"'{name}' must be a finite number"
+    errors[np.isnan(temp)] = "missing or non-numeric 'tempC'"
+    errors[fuel == ""] = "missing 'fuel'"
+
+    bad = errors != None  # noqa: E711 — element-wise on an object array
+    if bad.any():  # computed with placeholders, then blanked
+        fuel, temp, volume, mass, rho = fuel.copy(), temp.copy(), volume.copy(), mass.copy(), rho.copy()
+        temp[bad], volume[bad], mass[bad], rho[bad] = 15.0, 1.0, np.nan, 850.0
+
+    out = auto_correct_batch(fuel, temp, volume, mass, rho)
+    invalid = (out["table"] == VCF_INVALID) & ~bad
+    for i in np.flatnonzero(invalid).tolist():
+        errors[i] = density_error(float(out["rho15"][i]))
+    bad |= invalid
+
+    result = df.copy()
+    codes = np.where(bad, len(VCF_TABLE_IDS), out["table"])
+    result[OUTPUT_COLUMNS[0]] = pd.array(_TABLE_LABELS[codes], dtype="string")
+    for field, column in zip(RESULT_FIELDS[1:-1], OUTPUT_COLUMNS[1:-1]):
+        result[column] = np.where(bad, np.nan, out[field])
+    result[ERROR_COLUMN] = pd.array(errors, dtype="string")  # fixed dtype keeps the Parquet schema stable
+    return result
+
+
+def _read_chunks(path: Path, fmt: str, chunk_rows: int, progress):
+    """Yield DataFrames of at most chunk_rows rows; progress(fraction) after each."""
+    if fmt == "parquet":
+        pq = _require_pyarrow()
+        parquet = pq.ParquetFile(path)
+        total = parquet.metadata.num_rows or 1
+        done = 0
+        for batch in parquet.iter_batches(batch_size=chunk_rows):
+            done += batch.num_rows
+            progress(done / total)
+            yield batch.to_pandas()
+        return
+
+    size = path.stat().st_size or 1
+    with open(path, "rb") as f:
+        for chunk in pd.read_csv(f, chunksize=chunk_rows):
+            progress(min(f.tell() / size, 1.0))
+            yield chunk
+
+
+def _output_schema(df: pd.DataFrame, source_schema):
+    """Parquet schema for every output chunk: source column types plus fixed calc_* types."""
+    import pyarrow as pa
+    pinned = {OUTPUT_COLUMNS[0]: pa.string(), ERROR_COLUMN: pa.string()}
+    return pa.schema([
+        pa.field(name, pinned.get(name, pa.float64()) if name in OUTPUT_COLUMNS
+                 else source_schema.field(name).type)
+        for name in df.columns
+    ])
+
+
+class _Writer:
+    """Appends enriched chunks to one CSV or Parquet output file.
+
+    Parquet chunks are all converted with one schema taken from the source
+    file, so a column that is all-null (or an integer column with nulls) in
+    one chunk cannot change type between chunks.
+    """
+
+    def __init__(self, path: Path, fmt: str, source: Path):
+        self.path = path
+        self.fmt = fmt
+        self.source = source
+        self.schema = None
+        self._parquet = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.fmt == "csv":
+            df.to_csv(self.path, mode="a", header=not self.path.exists(), index=False)
+            return
+        import pyarrow as pa
+        pq = _require_pyarrow()
+        if self._parquet is None:
+            self.schema = _output_schema(df, pq.read_schema(self.source))
+            self._parquet = pq.ParquetWriter(self.path, self.schema)
+        self._parquet.write_table(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False, safe=False))
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+# =====================================================
+# 🗂️ Jobs
+# =====================================================
+class BulkJob:
+    """One uploaded file being corrected chunk by chunk."""
+
+    def __init__(self, filename: str, fmt: str, chunk_rows: int, source: Path):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.format = fmt
+        self.chunk_rows = chunk_rows
+        self.source = source
+        self.output = source.with_name(f"{self.id}_corrected.{fmt}")
+        self.status = "queued"
+        self.progress = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.chunks = 0
+        self.error: str | None = None
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.future: Future | None = None
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        """A queued job never starts; a running one stops after its current chunk."""
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self.status = "cancelled"
+            self.source.unlink(missing_ok=True)
+
+    def run(self) -> None:
+        self.status = "running"
+        self.started = time.perf_counter()
+        writer = _Writer(self.output, self.format, self.source)
+        try:
+            for chunk in _read_chunks(self.source, self.format, self.chunk_rows, self._set_progress):
+                if self._cancel.is_set():
+                    self.status = "cancelled"
+                    break
+                with stage_timer("bulk_chunk"):
+                    enriched = correct_frame(chunk)
+                writer.write(enriched)
+                self.rows += len(enriched)
+                self.errors += int(enriched[ERROR_COLUMN].notna().sum())
+                self.chunks += 1
+            else:
+                self.status = "done"
+                self.progress = 1.0
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            log_error_async("api_bulk", f"/bulk/correct {self.filename}: {e}")
+        finally:
+            writer.close()
+            if self.status != "done":
+                self.output.unlink(missing_ok=True)
+            self.finished = time.perf_counter()
+            self.source.unlink(missing_ok=True)
+            summary = self.to_dict()
+            log_query_async(f"bulk_correct {self.filename}", summary, "bulk_correct", self.status == "done")
+
+    def _set_progress(self, fraction: float) -> None:
+        self.progress = round(fraction, 4)
+
+    def to_dict(self) -> dict:
+        elapsed = None
+        if self.started is not None:
+            elapsed = (self.finished or time.perf_counter()) - self.started
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "format": self.format,
+            "status": self.status,
+            "progress": self.progress,
+            "rows": self.rows,
+            "errors": self.errors,
+            "chunks": self.chunks,
+            "chunk_rows": self.chunk_rows,
+            "elapsed_sec": None if elapsed is None else round(elapsed, 3),
+            "rows_per_sec": round(self.rows / elapsed, 1) if elapsed else None,
+            "error": self.error,
+            "status_url": f"/bulk/jobs/{self.id}",
+            "result_url": f"/bulk/jobs/{self.id}/result",
+        }
+
+
+_JOBS: dict[str, BulkJob] = {}
+_JOBS_LOCK = threading.Lock()
+
+
+def _register(job: BulkJob) -> None:
+    with _JOBS_LOCK:
+        _JOBS[job.id] = job
+        finished = [j for j in _JOBS.values() if j.status in ("done", "failed", "cancelled")]
+        for old in finished[:max(0, len(finished) - MAX_JOBS)]:
+            old.output.unlink(missing_ok=True)
+            del _JOBS[old.id]
+
+
+def get_job(job_id: str) -> BulkJob | None:
+    return _JOBS.get(job_id)
+
+
+def cancel_jobs() -> int:
+    """Cancel every queued or running job (service shutdown); returns how many."""
+    with _JOBS_LOCK:
+        pending = [j for j in _JOBS.values() if j.status in ("queued", "running")]
+    for job in pending:
+        job.cancel()
+    return len(pending)
+
+
+def _detect_format(filename: str, requested: str | None) -> str:
+    fmt = (requested or Path(filename).suffix.lstrip(".") or "csv").lower()
+    if fmt == "pq":
+        fmt = "parquet"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported file format '{fmt}' (use {', '.join(FORMATS)}).")
+    if fmt == "parquet":
+        _require_pyarrow()
+    return fmt
+
+
+# =====================================================
+# 📤 Endpoints
+# =====================================================
+def _spool(upload, source: Path) -> None:
+    BULK_DIR.mkdir(parents=True, exist_ok=True)
+    with open(source, "wb") as f:
+        shutil.copyfileobj(upload, f)  # the upload is closed when the request ends
+
+
+@router.post("/correct")
+async def bulk_correct(
+    file: UploadFile = File(..., description="CSV or Parquet with fuel, tempC, volume_m3 | mass_ton, rho15?"),
+    format: str | None = Query(None, description="csv | parquet (default: from the file extension)"),
+    chunk_rows: int = Query(CHUNK_ROWS, ge=1, le=1_000_000, description="Rows per processing chunk"),
+):
+    """Start a bulk correction job for an uploaded file; poll status_url, then fetch result_url."""
+    filename = file.filename or "upload"
+    try:
+        fmt = _detect_format(filename, format)
+        source = BULK_DIR / f"{uuid.uuid4().hex}_{Path(filename).name}"
+        await run_io(_spool, file.file, source)
+    except (ValueError, OSError) as e:
+        log_error_async("api_bulk", f"/bulk/correct {filename}: {e}")
+        return MCPJSONResponse(
+            status_code=400,
+            content=error_response(str(e), f"bulk_correct {filename}", "error", __version__, "/bulk/correct"),
+        )
+
+    job = BulkJob(filename, fmt, chunk_rows, source)
+    _register(job)
+    job.future = get_pool("bulk", WORKERS).submit(job.run)
+    return MCPJSONResponse(
+        status_code=202,
+        content=success_response(job.to_dict(), f"bulk_correct {filename}", "bulk_correct", __version__),
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def bulk_job_status(job_id: str):
+    job = get_job(job_id)
+    if job is None:
+        return MCPJSONResponse(
+            status_code=404,
+            content=error_response(f"Unknown job '{job_id}'", job_id, "error", __version__, "/bulk/jobs"),
+        )
+    return MCPJSONResponse(content=success_response(job.to_dict(), job_id, "bulk_job", __version__))
+
+
+@router.get("/jobs/{job_id}/result")
+async def bulk_job_result(job_id: str):
+    job = get_job(job_id)
+    if job is None or job.status != "done":
+        message = f"Unknown job '{job_id}'" if job is None else f"Job is {job.status}"
+        return MCPJSONResponse(
+            status_code=404 if job is None else 409,
+            content=error_response(message, job_id, "error", __version__, "/bulk/jobs/result"),
+        )
+    stem = Path(job.filename).stem
+    return FileResponse(
+        job.output,
+        media_type=MEDIA_TYPES[job.format],
+        filename=f"{stem}_corrected.{job.format}",
+        headers={"X-Chunk-Rows": str(job.chunk_rows), "X-Rows": str(job.rows),
+                 "X-Rows-Per-Second": str(job.to_dict()["rows_per_sec"])},
+    )
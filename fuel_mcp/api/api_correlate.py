@@ -2,23 +2,106 @@
 api_correlate.py
 ================
 ASTM / ISO correlation lookup API.
-Uses normalized CSV tables under fuel_mcp/tables/official/normalized/.
+Uses normalized CSV tables under fuel_mcp/tables/official/normalized/
+(read through their compiled, memory-mapped column artifacts).
 Performs linear interpolation for values between table points.
 Supports bidirectional (reverse) lookups with case-insensitive columns.
+
+Each (table, input column) pair is prepared once — coerced to float and
+sorted by the input column — and cached until the source CSV changes.
+POST /correlate/batch interpolates a whole array of values with one
+np.interp call per output column. Its errors carry an HTTP status:
+400 unreadable body or missing table/column, 404 unknown table, 422
+invalid values or column, 500 internal failure.
 """
 
-from fastapi import APIRouter, Query
+import json
+import threading
+
+from fastapi import APIRouter, Query, Request
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from fuel_mcp.api.responses import MCPJSONResponse
+from fuel_mcp.core.executors import run_cpu, run_io
+from fuel_mcp.tables.compiled_store import load_frame
+
 router = APIRouter(prefix="/correlate", tags=["ASTM correlations"])
 
 DATA_DIR = Path(__file__).parent.parent / "tables" / "official" / "normalized"
+MAX_BATCH_VALUES = 100_000
+
+
+# =====================================================
+# ⚡ Prepared (sorted) tables
+# =====================================================
+class SortedTable:
+    """One table's numeric columns as float arrays sorted by an input column."""
+
+    def __init__(self, df: pd.DataFrame, column: str):
+        df = df.dropna(subset=[column])
+        x = df[column].astype(float).values
+        sort_idx = np.argsort(x)
+        self.rows = len(df)
+        self.x = x[sort_idx]
+        self.outputs = {
+            col: df[col].astype(float).values[sort_idx]
+            for col in df.columns if col != column
+        }
+
+    def interpolate(self, values: np.ndarray) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """Clamp `values` to the table range and interpolate every output column."""
+        clamped = np.clip(values, self.x[0], self.x[-1])
+        return clamped, {col: np.interp(clamped, self.x, y) for col, y in self.outputs.items()}
+
+
+_PREPARED: dict[tuple[str, str], tuple[int, SortedTable]] = {}
+_PREPARED_LOCK = threading.Lock()
+
+
+def _load_table(file: Path) -> pd.DataFrame:
+    df = load_frame(file.name)
+    df.columns = [c.lower().strip() for c in df.columns]
+    # Convert to numeric safely
+    return df.apply(pd.to_numeric, errors="coerce")
+
+
+def get_sorted_table(table: str, column: str) -> SortedTable | dict:
+    """
+    Cached SortedTable for (table, column), rebuilt when the CSV's mtime
+    changes. Returns an {"error": ...} dict for unknown tables/columns.
+    """
+    file = DATA_DIR / f"{table}.csv"
+    try:
+        mtime_ns = file.stat().st_mtime_ns
+    except OSError:
+        return {"error": f"❌ Table '{table}.csv' not found in {DATA_DIR}"}
+
+    key = (table, column)
+    cached = _PREPARED.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    df = _load_table(file)
+    if column not in df.columns:
+        return {"error": f"❌ Column '{column}' not found. Available: {list(df.columns)}"}
+    prepared = SortedTable(df, column)
+    if prepared.rows == 0:
+        return {"error": f"⚠️ No valid numeric data for column '{column}' in table '{table}'."}
+
+    with _PREPARED_LOCK:
+        _PREPARED[key] = (mtime_ns, prepared)
+    return prepared
+
+
+def clear_correlate_cache() -> None:
+    with _PREPARED_LOCK:
+        _PREPARED.clear()
 
 
 @router.get("/")
-def correlate(
+async def correlate(
     table: str = Query(..., description="CSV table filename (without .csv extension)"),
     column: str = Query(..., description="Input column name (any column name, case-insensitive)"),
     value: float = Query(..., description="Value to interpolate (x-value)"),
@@ -29,40 +112,15 @@ def correlate(
     - Interpolates all numeric outputs.
     - Handles unsorted data safely.
     """
-    file = DATA_DIR / f"{table}.csv"
-    if not file.exists():
-        return {"error": f"❌ Table '{table}.csv' not found in {DATA_DIR}"}
-
+    column = column.lower().strip()
     try:
-        df = pd.read_csv(file)
-        df.columns = [c.lower().strip() for c in df.columns]
-        column = column.lower().strip()
-
-        if column not in df.columns:
-            return {"error": f"❌ Column '{column}' not found. Available: {list(df.columns)}"}
-
-        # Convert to numeric safely
-        df = df.apply(pd.to_numeric, errors="coerce")
-        df = df.dropna(subset=[column])
-
-        if df.empty:
-            return {"error": f"⚠️ No valid numeric data for column '{column}' in table '{table}'."}
-
-        # Prepare and sort x-values
-        x = df[column].astype(float).values
-        sort_idx = np.argsort(x)
-        x_sorted = x[sort_idx]
+        prepared = await run_io(get_sorted_table, table, column)  # loads the table on a cache miss
+        if isinstance(prepared, dict):
+            return prepared
 
         # Clamp input value within range to prevent extrapolation
-        value_clamped = max(min(value, np.max(x_sorted)), np.min(x_sorted))
-
-        results = {}
-        for col in df.columns:
-            if col == column:
-                continue
-            y = df[col].astype(float).values
-            y_sorted = y[sort_idx]
-            results[col] = round(float(np.interp(value_clamped, x_sorted, y_sorted)), 4)
+        value_clamped, outputs = prepared.interpolate(np.float64(value))
+        results = {col: round(float(y), 4) for col, y in outputs.items()}
 
         return {
             "result": {
@@ -70,11 +128,11 @@ def correlate(
                 "input": {column: value},
                 "outputs": results,
                 "_meta": {
-                    "rows": len(df),
-                    "source": file.name,
+                    "rows": prepared.rows,
+                    "source": f"{table}.csv",
                     "interpolation": "linear",
                     "reverse_supported": True,
-                    "clamped": value != value_clamped,
+                    "clamped": bool(value != value_clamped),
                 },
             },
             "mode": "correlate",
@@ -85,4 +143,103 @@ def correlate(
     except Exception as e:
         return {
             "error": f"⚠️ Exception while correlating '{table}' column '{column}': {str(e)}"
-        }
\ No newline at end of file
+        }
+
+
+# =====================================================
+# 📦 Batch interpolation
+# =====================================================
+def _parse_batch_body(raw: bytes, content_type: str) -> tuple[dict, list]:
+    """
+    Accept either a JSON object {"table", "column", "values": [...]} (or a
+    bare JSON array of values), or NDJSON with one value — a number or
+    {"value": x} — per line. Returns (options, values).
+    """
+    text = raw.decode("utf-8")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        values = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            values.append(item["value"] if isinstance(item, dict) else item)
+        return {}, values
+
+    payload = json.loads(text) if text.strip() else {}
+    if isinstance(payload, list):
+        return {}, payload
+    if not isinstance(payload, dict):
+        raise ValueError("Body must be a JSON object, a JSON array of values, or NDJSON.")
+    return payload, payload.get("values", [])
+
+
+def _batch_error(status_code: int, message: str) -> MCPJSONResponse:
+    return MCPJSONResponse(status_code=status_code, content={"error": message})
+
+
+@router.post("/batch")
+async def correlate_batch(
+    request: Request,
+    table: str | None = Query(None, description="CSV table filename (without .csv); may also be given in the JSON body"),
+    column: str | None = Query(None, description="Input column name; may also be given in the JSON body"),
+):
+    """
+    Interpolate many values against one table in a single request.
+
+    Body: JSON {"table": ..., "column": ..., "values": [..]} or NDJSON
+    (Content-Type: application/x-ndjson) with table/column as query params.
+    Outputs are returned column-wise, aligned with the input values.
+    """
+    try:
+        options, raw_values = _parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    except (ValueError, KeyError, TypeError, UnicodeDecodeError) as e:
+        return _batch_error(400, f"❌ Invalid batch body: {e}")
+
+    table = table or options.get("table")
+    column = (column or options.get("column") or "").lower().strip()
+    if not table or not column:
+        return _batch_error(400, "❌ Both 'table' and 'column' are required.")
+
+    try:
+        values = np.asarray(raw_values, dtype=np.float64).ravel()
+    except (ValueError, TypeError):
+        return _batch_error(422, "❌ 'values' must be an array of numbers.")
+    if values.size == 0:
+        return _batch_error(422, "❌ 'values' is empty.")
+    if values.size > MAX_BATCH_VALUES:
+        return _batch_error(422, f"❌ Too many values ({values.size}); limit is {MAX_BATCH_VALUES}.")
+    if not np.all(np.isfinite(values)):
+        return _batch_error(422, "❌ 'values' must be finite numbers.")
+
+    try:
+        prepared = await run_io(get_sorted_table, table, column)
+        if isinstance(prepared, dict):
+            known = (DATA_DIR / f"{table}.csv").exists()
+            return _batch_error(422 if known else 404, prepared["error"])  # bad column vs unknown table
+
+        clamped, outputs = await run_cpu(prepared.interpolate, values)
+        clamped_mask = values != clamped
+
+        return {
+            "result": {
+                "table": table,
+                "input_column": column,
+                "count": int(values.size),
+                "inputs": values.tolist(),
+                "outputs": {col: [round(v, 4) for v in y.tolist()] for col, y in outputs.items()},
+                "clamped": clamped_mask.tolist(),
+                "_meta": {
+                    "rows": prepared.rows,
+                    "source": f"{table}.csv",
+                    "interpolation": "linear",
+                    "reverse_supported": True,
+                    "clamped_count": int(clamped_mask.sum()),
+                },
+            },
+            "mode": "correlate_batch",
+            "version": "1.5.1",
+            "timestamp": pd.Timestamp.utcnow().isoformat(),
+        }
+
+    except Exception as e:
+        return _batch_error(500, f"⚠️ Exception while correlating '{table}' column '{column}': {str(e)}")
@@ -0,0 +1,107 @@
+"""
+api_metrics.py
+==============
+Prometheus-compatible metrics for the API.
+
+MetricsMiddleware records every HTTP request into the in-process registry
+(core.metrics) by route template, method and status code. GET /metrics/prom
+serves the registry as Prometheus text together with runtime gauges read
+at scrape time from in-memory stats only — query / embedding cache hit
+rates, log-queue depth and executor pools. No SQLite access.
+"""
+
+import sys
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from fuel_mcp.core.async_logger import get_log_stats
+from fuel_mcp.core.executors import pool_stats
+from fuel_mcp.core.metrics import get_metrics
+from fuel_mcp.core.regex_parser import get_query_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"  # 404s are not labelled by raw path (unbounded cardinality)
+
+
+# =====================================================
+# ⏱️ Middleware
+# =====================================================
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each request until its last body chunk is sent."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # an exception before the response starts counts as a server error
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")  # set by the router on the shared scope once matched
+            get_metrics().observe_request(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - started,
+            )
+
+
+# =====================================================
+# 📈 Runtime gauges
+# =====================================================
+def runtime_families():
+    """Cache, log-queue and executor families (all from in-memory counters)."""
+    log = get_log_stats()
+    yield "log_queue_depth", "gauge", "Log records waiting for the background writer.", [({}, log["queue_depth"])]
+    yield "log_queue_capacity", "gauge", "Capacity of the log queue.", [({}, log["queue_capacity"])]
+    yield "log_records_written_total", "counter", "Log records written to SQLite.", [({}, log["written"])]
+    yield "log_records_dropped_total", "counter", "Log records dropped by the queue policy.", [({}, log["dropped"])]
+
+    caches = {"query": get_query_cache().stats()}
+    rag = sys.modules.get("fuel_mcp.core.rag_bridge")  # never import the RAG stack just to scrape
+    if rag is not None:
+        caches["embedding"] = rag.get_embedding_cache().stats()
+    yield "cache_hits_total", "counter", "Cache hits.", [({"cache": c}, s["hits"]) for c, s in caches.items()]
+    yield "cache_misses_total", "counter", "Cache misses.", [({"cache": c}, s["misses"]) for c, s in caches.items()]
+    yield "cache_hit_ratio", "gauge", "Cache hits / lookups.", [({"cache": c}, s["hit_rate"]) for c, s in caches.items()]
+    yield "cache_entries", "gauge", "Entries held by the cache.", [({"cache": c}, s["size"]) for c, s in caches.items()]
+
+    pools = pool_stats()
+    for key, kind, help_text in (
+        ("max_workers", "gauge", "Worker threads configured for the pool."),
+        ("active", "gauge", "Tasks running on the pool."),
+        ("queued", "gauge", "Tasks waiting for a pool worker."),
+        ("completed", "counter", "Tasks completed by the pool."),
+        ("failed", "counter", "Tasks that raised on the pool."),
+        ("utilization", "gauge", "Busy worker-seconds / available worker-seconds."),
+    ):
+        name = f"executor_{key}_total" if kind == "counter" else f"executor_{key}"
+        yield name, kind, help_text, [({"pool": p}, s[key]) for p, s in pools.items()]
+
+
+get_metrics().add_collector(runtime_families)
+
+
+# =====================================================
+# 📤 Endpoints
+# =====================================================
+@router.get("/prom", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of request, stage, cache, log-queue and pool metrics."""
+    return PlainTextResponse(get_metrics().render_prometheus(), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -7,10 +7,9 @@ Includes regex-based natural language query parsing with reverse conversion supp
 """
 
 from fastapi import FastAPI, Query
-from fastapi.responses import JSONResponse
 from pathlib import Path
+import asyncio
 import logging
-import sqlite3
 import platform
 import numpy as np
 from datetime import datetime, UTC
@@ -19,13 +18,33 @@ from contextlib import asynccontextmanager
 # -----------------------------------------------------
 # ✅ Core imports
 # -----------------------------------------------------
-from fuel_mcp.core.regex_parser import process_query
+from fuel_mcp.core.regex_parser import get_query_cache, process_query
 from fuel_mcp.core.vcf_official_full import vcf_iso_official, auto_correct
 from fuel_mcp.core.unit_converter import convert as unit_convert
+from fuel_mcp.core.fuel_density_loader import get_fuel_density
 from fuel_mcp.core.response_schema import success_response, error_response
-from fuel_mcp.core.db_logger import get_recent_queries, init_db, DB_PATH
-from fuel_mcp.core.async_logger import log_query_async, log_error_async
+from fuel_mcp.core.db_logger import (
+    DB_PATH,
+    close_connections,
+    get_connection,
+    get_counts_by_mode,
+    get_query_counts,
+    error_history,
+    init_db,
+    query_history,
+    snapshot_metrics,
+)
+from fuel_mcp.core.conversion_engine import warm_table_cache
+from fuel_mcp.core.async_logger import (
+    get_log_stats,
+    log_error_async,
+    log_query_async,
+    start_log_writer,
+    stop_log_writer,
+)
 from fuel_mcp.core.error_handler import log_error
+from fuel_mcp.core.executors import pool_stats, run_cpu, run_io, shutdown_pools
+from fuel_mcp.api.responses import MCPJSONResponse, ResponseSchemaMiddleware
 from fuel_mcp.tool_integration import mcp_tool
 from fuel_mcp import __version__
 
@@ -41,8 +60,23 @@ async def lifespan(app: FastAPI):
     try:
         init_db()
         logging.info("🧩 SQLite initialized successfully (lifespan startup).")
+        start_log_writer()
+        warmed = warm_table_cache()
+        logging.info(f"📦 Table cache warmed ({warmed} ASTM tables).")
+        from fuel_mcp.core.rag_bridge import ONLINE_MODE, WARM_EMBEDDER, get_connectivity, get_embedder
+        if ONLINE_MODE is None:
+            get_connectivity().probe_async()  # never block startup on the network
+        if WARM_EMBEDDER:
+            get_embedder().warm()  # background thread; first semantic query won't wait for a cold load
+            logging.info("🧠 Local embedding model warming in background.")
         yield
     finally:
+        await asyncio.to_thread(stop_log_writer)  # drain queued log records
+        uptime = (datetime.now(UTC) - START_TIME).total_seconds()
+        await asyncio.to_thread(snapshot_metrics, uptime)  # metrics_log row per service run
+        cancel_bulk_jobs()  # queued uploads are dropped, running ones stop after their chunk
+        await asyncio.to_thread(shutdown_pools, cancel_futures=True)
+        close_connections()
         logging.info("🧹 Fuel MCP API shutting down cleanly.")
 
 
@@ -54,11 +88,14 @@ app = FastAPI(
     version=__version__,
     description="ISO 91-1 / ASTM D1250 Marine Fuel Correction Processor",
     lifespan=lifespan,
+    default_response_class=MCPJSONResponse,
 )
+app.add_middleware(ResponseSchemaMiddleware)  # ?schema=v2 / X-MCP-Schema: v2 → lean responses
 init_db()
 
 LOG_FILE = Path("logs/mcp_queries.log")
 LOG_FILE.parent.mkdir(exist_ok=True)
+MAX_PAGE_SIZE = 1000  # /history, /errors: page with before_id instead of huge limits
 
 logging.basicConfig(
     level=logging.INFO,
@@ -71,15 +108,22 @@ logging.basicConfig(
 # 🔧 Include Routers (AFTER app definition)
 # =====================================================
 from .api_correlate import router as correlate_router
+from .api_batch import router as batch_router
+from .api_bulk import cancel_jobs as cancel_bulk_jobs, router as bulk_router
+from .api_metrics import MetricsMiddleware, router as metrics_router
 
 app.include_router(correlate_router)
+app.include_router(batch_router)
+app.include_router(bulk_router)
+app.include_router(metrics_router)
+app.add_middleware(MetricsMiddleware)  # per-route counts and latency for /metrics/prom
 
 
 # =====================================================
 # 🧠 /query — Intelligent Parser + Unified Schema
 # =====================================================
 @app.get("/query")
-def run_query(text: str = Query(...)):
+async def run_query(text: str = Query(...)):
     """
     Automatically interprets natural-language queries such as:
       - "convert 500 L diesel @ 30°C"
@@ -87,7 +131,7 @@ def run_query(text: str = Query(...)):
       - "convert 2 tons of diesel to m3 @ 25°C"
     """
     try:
-        result = process_query(text)
+        result = await run_cpu(process_query, text)  # parsing, interpolation, embeddings
         mode = result.get("mode", "unknown")
 
         if "error" in result:
@@ -97,13 +141,13 @@ def run_query(text: str = Query(...)):
             raise ValueError(f"Unsupported query mode: {mode}")
 
         log_query_async(text, result, mode, True)
-        return JSONResponse(content=success_response(result, text, mode, app.version))
+        return MCPJSONResponse(content=success_response(result, text, mode, app.version))
 
     except Exception as e:
-        log_error(e, query=text, module="mcp_api")
+        await run_io(log_error, e, query=text, module="mcp_api")
         log_error_async("mcp_api", str(e))
         log_query_async(text, {"error": str(e)}, "error", False)
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=400,
             content=error_response(str(e), text, "error", app.version, "/query"),
         )
@@ -113,16 +157,16 @@ def run_query(text: str = Query(...)):
 # ⚙️ /convert — Unified schema
 # =====================================================
 @app.get("/convert")
-def convert_units(value: float = Query(...), from_unit: str = Query(...), to_unit: str = Query(...)):
+async def convert_units(value: float = Query(...), from_unit: str = Query(...), to_unit: str = Query(...)):
     query_str = f"convert {value} {from_unit}->{to_unit}"
     try:
         result = unit_convert(value, from_unit, to_unit)
         log_query_async(query_str, result, "unit_convert", True)
-        return JSONResponse(content=success_response(result, query_str, "unit_convert", app.version))
+        return MCPJSONResponse(content=success_response(result, query_str, "unit_convert", app.version))
     except Exception as e:
-        log_error(e, query=query_str, module="unit_converter")
+        await run_io(log_error, e, query=query_str, module="unit_converter")
         log_error_async("unit_converter", str(e))
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=400,
             content=error_response(str(e), query_str, "error", app.version, "/convert"),
         )
@@ -132,16 +176,16 @@ def convert_units(value: float = Query(...), from_unit: str = Query(...), to_uni
 # 🧮 /vcf — Unified schema
 # =====================================================
 @app.get("/vcf")
-def get_vcf(rho15: float = Query(...), tempC: float = Query(...)):
+async def get_vcf(rho15: float = Query(...), tempC: float = Query(...)):
     query_str = f"vcf {rho15}@{tempC}"
     try:
         result = vcf_iso_official(rho15=rho15, tempC=tempC)
         log_query_async(query_str, result, "vcf", True)
-        return JSONResponse(content=success_response(result, query_str, "vcf", app.version))
+        return MCPJSONResponse(content=success_response(result, query_str, "vcf", app.version))
     except Exception as e:
-        log_error(e, query=query_str, module="vcf_iso_official")
+        await run_io(log_error, e, query=query_str, module="vcf_iso_official")
         log_error_async("vcf_iso_official", str(e))
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=400,
             content=error_response(str(e), query_str, "error", app.version, "/vcf"),
         )
@@ -151,28 +195,26 @@ def get_vcf(rho15: float = Query(...), tempC: float = Query(...)):
 # ⚖️ /auto_correct — Unified schema + dynamic density loader
 # =====================================================
 @app.get("/auto_correct")
-def auto_correction(
+async def auto_correction(
     fuel: str = Query(...),
     volume_m3: float | None = None,
     mass_ton: float | None = None,
     tempC: float = Query(...),
     rho15: float | None = None,
 ):
-    from fuel_mcp.core.fuel_density_loader import get_fuel_density
-
     query_str = f"auto_correct {fuel}@{tempC}"
     try:
-        rho15 = rho15 or get_fuel_density(fuel)
-        result = auto_correct(fuel=fuel, volume_m3=volume_m3, mass_ton=mass_ton, tempC=tempC)
+        rho15 = rho15 or await run_io(get_fuel_density, fuel)  # registry refresh may read the fuel file
+        result = auto_correct(fuel=fuel, volume_m3=volume_m3, mass_ton=mass_ton, tempC=tempC, rho15=rho15)
         result["fuel"] = fuel
         result["rho15"] = round(rho15, 3)
 
         log_query_async(query_str, result, "auto_correct", True)
-        return JSONResponse(content=success_response(result, query_str, "auto_correct", app.version))
+        return MCPJSONResponse(content=success_response(result, query_str, "auto_correct", app.version))
     except Exception as e:
-        log_error(e, query=query_str, module="mcp_api")
+        await run_io(log_error, e, query=query_str, module="mcp_api")
         log_error_async("mcp_api", str(e))
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=400,
             content=error_response(str(e), query_str, "error", app.version, "/auto_correct"),
         )
@@ -181,25 +223,29 @@ def auto_correction(
 # =====================================================
 # 🧠 /debug — schema consistent
 # =====================================================
+def _debug_snapshot() -> dict:
+    log_size = LOG_FILE.stat().st_size / 1024 if LOG_FILE.exists() else 0
+    db_size = Path(DB_PATH).stat().st_size / 1024 if Path(DB_PATH).exists() else 0
+    return {
+        "service": "Fuel MCP Diagnostic Snapshot",
+        "version": app.version,
+        "python_version": platform.python_version(),
+        "os": f"{platform.system()} {platform.release()}",
+        "uptime_sec": round((datetime.now(UTC) - START_TIME).total_seconds(), 2),
+        "db_path": str(DB_PATH.resolve()),
+        "db_size_kb": round(db_size, 2),
+        "log_file": str(LOG_FILE.resolve()),
+        "log_size_kb": round(log_size, 2),
+    }
+
+
 @app.get("/debug")
-def get_debug_info():
+async def get_debug_info():
     try:
-        log_size = LOG_FILE.stat().st_size / 1024 if LOG_FILE.exists() else 0
-        db_size = Path(DB_PATH).stat().st_size / 1024 if Path(DB_PATH).exists() else 0
-        result = {
-            "service": "Fuel MCP Diagnostic Snapshot",
-            "version": app.version,
-            "python_version": platform.python_version(),
-            "os": f"{platform.system()} {platform.release()}",
-            "uptime_sec": round((datetime.now(UTC) - START_TIME).total_seconds(), 2),
-            "db_path": str(DB_PATH.resolve()),
-            "db_size_kb": round(db_size, 2),
-            "log_file": str(LOG_FILE.resolve()),
-            "log_size_kb": round(log_size, 2),
-        }
-        return JSONResponse(content=success_response(result, "debug info", "debug", app.version))
+        result = await run_io(_debug_snapshot)
+        return MCPJSONResponse(content=success_response(result, "debug info", "debug", app.version))
     except Exception as e:
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=500,
             content=error_response(str(e), "debug", "error", app.version, "/debug"),
         )
@@ -208,15 +254,27 @@ def get_debug_info():
 # =====================================================
 # 📡 /status — Unified schema
 # =====================================================
+def _status_snapshot() -> dict:
+    from fuel_mcp.core.rag_bridge import connectivity_status, current_mode, get_embedder, get_embedding_cache
+    return {
+        "status": "ok",
+        "mode": current_mode().upper(),
+        "connectivity": connectivity_status(),
+        "log_queue": get_log_stats(),
+        "embedder": get_embedder().status(),
+        "embedding_cache": get_embedding_cache().stats(),
+        "query_cache": get_query_cache().stats(),
+    }
+
+
 @app.get("/status")
-def get_status():
+async def get_status():
     try:
-        from fuel_mcp.core.rag_bridge import ONLINE_MODE
-        mode = "ONLINE" if ONLINE_MODE else "OFFLINE"
-        result = {"status": "ok", "mode": mode}
-        return JSONResponse(content=success_response(result, "status check", "status", app.version))
+        result = await run_io(_status_snapshot)  # first call imports the RAG stack
+        result["executors"] = pool_stats()
+        return MCPJSONResponse(content=success_response(result, "status check", "status", app.version))
     except Exception as e:
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=500,
             content=error_response(str(e), "status check", "error", app.version, "/status"),
         )
@@ -225,24 +283,34 @@ def get_status():
 # =====================================================
 # ⚠️ /errors — Unified schema
 # =====================================================
+def _page(entries: list[dict], limit: int) -> dict:
+    """Keyset page: pass next_before_id back as before_id; None once the history is exhausted."""
+    return {"entries": entries, "next_before_id": entries[-1]["id"] if len(entries) == limit else None}
+
+
+def _recent_errors(limit: int, module: str | None, before_id: int | None,
+                   since: datetime | None, until: datetime | None) -> dict:
+    rows = error_history(limit, before_id, module, since, until)
+    entries = [
+        {"id": i, "timestamp": ts, "module": mod, "message": msg, "stacktrace": stack}
+        for i, ts, mod, msg, stack in rows
+    ]
+    return _page(entries, limit)
+
+
 @app.get("/errors")
-def get_errors(limit: int = 20, module: str | None = None):
+async def get_errors(
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    module: str | None = None,
+    before_id: int | None = Query(None, description="Cursor: only entries with a smaller id (next_before_id)"),
+    since: datetime | None = Query(None, description="Inclusive lower bound on timestamp (ISO 8601)"),
+    until: datetime | None = Query(None, description="Exclusive upper bound on timestamp (ISO 8601)"),
+):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        if module:
-            cur.execute(
-                "SELECT timestamp, module, message, stacktrace FROM errors WHERE module = ? ORDER BY id DESC LIMIT ?",
-                (module, limit),
-            )
-        else:
-            cur.execute("SELECT timestamp, module, message, stacktrace FROM errors ORDER BY id DESC LIMIT ?", (limit,))
-        rows = cur.fetchall()
-        conn.close()
-        result = [{"timestamp": ts, "module": mod, "message": msg, "stacktrace": stack} for ts, mod, msg, stack in rows]
-        return JSONResponse(content=success_response(result, f"errors (module={module})", "errors", app.version))
+        result = await run_io(_recent_errors, limit, module, before_id, since, until)
+        return MCPJSONResponse(content=success_response(result, f"errors (module={module})", "errors", app.version))
     except Exception as e:
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=500,
             content=error_response(str(e), "errors", "error", app.version, "/errors"),
         )
@@ -251,27 +319,25 @@ def get_errors(limit: int = 20, module: str | None = None):
 # =====================================================
 # 📊 /metrics — Unified schema
 # =====================================================
+def _query_counts() -> tuple[dict, dict]:
+    conn = get_connection()
+    return get_query_counts(conn), get_counts_by_mode(conn)  # materialized counters, no COUNT(*) scans
+
+
 @app.get("/metrics")
-def get_metrics():
+async def get_metrics():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM queries")
-        total = cur.fetchone()[0]
-        cur.execute("SELECT COUNT(*) FROM queries WHERE success = 1")
-        success = cur.fetchone()[0]
-        cur.execute("SELECT COUNT(*) FROM queries WHERE success = 0")
-        failed = cur.fetchone()[0]
-        conn.close()
+        counts, by_mode = await run_io(_query_counts)
         result = {
-            "total_queries": total,
-            "successful_queries": success,
-            "failed_queries": failed,
+            "total_queries": counts["total"],
+            "successful_queries": counts["successful"],
+            "failed_queries": counts["failed"],
             "uptime_seconds": round((datetime.now(UTC) - START_TIME).total_seconds(), 2),
+            "by_mode": by_mode,
         }
-        return JSONResponse(content=success_response(result, "metrics", "metrics", app.version))
+        return MCPJSONResponse(content=success_response(result, "metrics", "metrics", app.version))
     except Exception as e:
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=500,
             content=error_response(str(e), "metrics", "error", app.version, "/metrics"),
         )
@@ -281,13 +347,21 @@ def get_metrics():
 # 🧾 /history — Unified schema
 # =====================================================
 @app.get("/history")
-def get_history(limit: int = 20):
+async def get_history(
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    before_id: int | None = Query(None, description="Cursor: only entries with a smaller id (next_before_id)"),
+    mode: str | None = None,
+    success: bool | None = None,
+    since: datetime | None = Query(None, description="Inclusive lower bound on timestamp (ISO 8601)"),
+    until: datetime | None = Query(None, description="Exclusive upper bound on timestamp (ISO 8601)"),
+):
     try:
-        rows = get_recent_queries(limit)
-        result = [{"timestamp": ts, "query": q, "mode": m, "success": bool(s)} for ts, q, m, s in rows]
-        return JSONResponse(content=success_response(result, "history", "history", app.version))
+        rows = await run_io(query_history, limit, before_id, mode, success, since, until)
+        entries = [{"id": i, "timestamp": ts, "query": q, "mode": m, "success": bool(s)} for i, ts, q, m, s in rows]
+        result = _page(entries, limit)
+        return MCPJSONResponse(content=success_response(result, "history", "history", app.version))
     except Exception as e:
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=500,
             content=error_response(str(e), "history", "error", app.version, "/history"),
         )
@@ -296,16 +370,19 @@ def get_history(limit: int = 20):
 # =====================================================
 # 📜 /logs — Unified schema
 # =====================================================
+def _tail_log(limit: int) -> dict:
+    if not LOG_FILE.exists():
+        return {"message": "No log file yet."}
+    return {"entries": LOG_FILE.read_text().splitlines()[-limit:]}
+
+
 @app.get("/logs")
-def get_logs(limit: int = 20):
+async def get_logs(limit: int = 20):
     try:
-        if not LOG_FILE.exists():
-            result = {"message": "No log file yet."}
-        else:
-            result = {"entries": LOG_FILE.read_text().splitlines()[-limit:]}
-        return JSONResponse(content=success_response(result, "logs", "logs", app.version))
+        result = await run_io(_tail_log, limit)
+        return MCPJSONResponse(content=success_response(result, "logs", "logs", app.version))
     except Exception as e:
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=500,
             content=error_response(str(e), "logs", "error", app.version, "/logs"),
         )
@@ -315,7 +392,7 @@ def get_logs(limit: int = 20):
 # 🧰 /tool — Unified schema
 # =====================================================
 @app.get("/tool")
-def get_tool_schema():
+async def get_tool_schema():
     try:
         schema = {
             "type": "function",
@@ -331,9 +408,9 @@ def get_tool_schema():
                 },
             },
         }
-        return JSONResponse(content=success_response(schema, "tool schema", "tool", app.version))
+        return MCPJSONResponse(content=success_response(schema, "tool schema", "tool", app.version))
     except Exception as e:
-        return JSONResponse(
+        return MCPJSONResponse(
             status_code=500,
             content=error_response(str(e), "tool", "error", app.version, "/tool"),
         )
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+fuel_mcp/api/responses.py
+=========================
+
+orjson-backed JSON response class and the middleware that selects the
+response schema (legacy v1 / lean v2) for each request.
+"""
+
+from urllib.parse import parse_qs
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from fuel_mcp.core.response_schema import SCHEMA_HEADER, SCHEMA_PARAM, negotiate_schema, reset_schema, use_schema
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+_SCHEMA_HEADER = SCHEMA_HEADER.lower().encode("latin-1")
+
+
+class MCPJSONResponse(JSONResponse):
+    """JSONResponse serialized with orjson (numpy scalars/arrays included)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+class ResponseSchemaMiddleware:
+    """
+    Pure ASGI middleware: reads `?schema=` / X-MCP-Schema and selects the
+    schema for every response built while handling the request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        param = None
+        if SCHEMA_PARAM.encode() in scope.get("query_string", b""):
+            values = parse_qs(scope["query_string"].decode("latin-1")).get(SCHEMA_PARAM)
+            param = values[-1] if values else None
+        header = next((v.decode("latin-1") for k, v in scope["headers"] if k == _SCHEMA_HEADER), None)
+
+        token = use_schema(negotiate_schema(param, header))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_schema(token)
@@ -4,39 +4,300 @@ fuel_mcp/core/async_logger.py
 
 Asynchronous wrapper for DB logging — ensures that inserts
 to SQLite (queries/errors) never block FastAPI response time.
+
+Records go into a bounded in-memory queue drained by one background
+writer thread, which groups them into multi-row `executemany`
+transactions. A batch is flushed when it reaches MCP_LOG_BATCH_SIZE
+records or MCP_LOG_FLUSH_INTERVAL seconds after its first record.
+
+When the queue is full, MCP_LOG_POLICY decides what happens:
+    drop   — discard the new record (default; also used for unknown values)
+    block  — wait up to MCP_LOG_BLOCK_TIMEOUT seconds for space, then drop;
+             callers on a running event loop never wait themselves: their
+             record is handed to an "io" pool thread (core.executors) that
+             does the waiting, so a full queue holds records back without
+             stalling the async API (at most queue-capacity records wait
+             like this; beyond that they are dropped)
+    sample — above 80 % full keep only 1 in MCP_LOG_SAMPLE_RATE records
 """
 
 import asyncio
+import atexit
 import logging
-from fuel_mcp.core.db_logger import log_query, log_error
+import os
+import queue
+import threading
+import time
+from datetime import datetime, UTC
+
+from fuel_mcp.core.db_logger import log_query, log_error, write_log_batch
+from fuel_mcp.core.executors import io_pool
+
+# =====================================================
+# ⚙️ Settings
+# =====================================================
+POLICIES = ("drop", "block", "sample")
+
+
+def _resolve_policy(name: str) -> str:
+    """A bad MCP_LOG_POLICY must not break importing the API / CLI: fall back to drop."""
+    policy = name.strip().lower()
+    if policy not in POLICIES:
+        logging.warning(f"⚠️ Unknown MCP_LOG_POLICY '{name}' (use {POLICIES}) — falling back to 'drop'.")
+        return "drop"
+    return policy
+
 
+QUEUE_SIZE = int(os.getenv("MCP_LOG_QUEUE_SIZE", "10000"))
+BATCH_SIZE = int(os.getenv("MCP_LOG_BATCH_SIZE", "200"))
+FLUSH_INTERVAL = float(os.getenv("MCP_LOG_FLUSH_INTERVAL", "0.5"))
+POLICY = _resolve_policy(os.getenv("MCP_LOG_POLICY", "drop"))
+BLOCK_TIMEOUT = float(os.getenv("MCP_LOG_BLOCK_TIMEOUT", "1.0"))
+SAMPLE_RATE = int(os.getenv("MCP_LOG_SAMPLE_RATE", "10"))
+SAMPLE_THRESHOLD = 0.8
 
-async def _run_in_thread(func, *args, **kwargs):
-    """Run blocking function inside a thread pool executor."""
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
+_STOP = object()
 
 
-def _has_event_loop() -> bool:
-    """Check if an asyncio event loop is currently running."""
+def _on_event_loop() -> bool:
     try:
         asyncio.get_running_loop()
-        return True
-    except Exception:
+    except RuntimeError:
         return False
+    return True
 
 
-def log_query_async(query: str, result: dict | str, mode: str, success: bool):
-    """Schedule async non-blocking query log."""
-    if _has_event_loop():
+# =====================================================
+# ✍️ Single background writer
+# =====================================================
+class LogWriter:
+    """Bounded queue + one thread that writes log records in batches."""
+
+    def __init__(self, maxsize: int = QUEUE_SIZE, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL, policy: str = POLICY,
+                 block_timeout: float = BLOCK_TIMEOUT, sample_rate: int = SAMPLE_RATE):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown log queue policy '{policy}' (use {POLICIES})")
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.sample_rate = max(1, sample_rate)
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.deferred = 0
+        self.sampled_out = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self._seen = 0
+        self._waiting = 0  # deferred records not yet queued or dropped
+        self._lock = threading.Lock()
+        self._settled = threading.Condition(self._lock)
+        self._thread: threading.Thread | None = None
+
+    # -------------------------------------------------
+    # ▶️ Lifecycle
+    # -------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name="mcp-log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """Write everything still queued, then stop the thread. True if fully drained."""
+        if not self.running:
+            return self.queue.empty()
+        with self._settled:  # deferred records must land before the stop marker
+            self._settled.wait_for(lambda: not self._waiting, timeout)
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return False
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every record queued so far has been written (or timeout)."""
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    # -------------------------------------------------
+    # 📥 Enqueue (request path)
+    # -------------------------------------------------
+    def submit(self, record: tuple) -> bool:
+        """Queue a ("query" | "error", row) record. Returns False if it was not accepted."""
+        if not self.running:
+            self.start()
+
+        if self.policy == "sample" and self.queue.qsize() >= SAMPLE_THRESHOLD * self.queue.maxsize:
+            with self._lock:
+                self._seen += 1
+                keep = self._seen % self.sample_rate == 0
+                if not keep:
+                    self.sampled_out += 1
+            if not keep:
+                return False
+
+        on_loop = self.policy == "block" and _on_event_loop()
+        try:
+            if self.policy == "block" and not on_loop:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            if on_loop and self._defer(record):
+                return True
+            with self._lock:
+                self.dropped += 1
+            return False
+
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def _defer(self, record: tuple) -> bool:
+        """Block policy on the event loop: wait for queue space on an io pool thread."""
+        with self._lock:
+            if self._waiting >= self.queue.maxsize:
+                return False
+            self._waiting += 1
+            self.deferred += 1
+        io_pool().submit(self._put_deferred, record)
+        return True
+
+    def _put_deferred(self, record: tuple) -> None:
         try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(_run_in_thread(log_query, query, result, mode, success))
-            return
+            self.queue.put(record, timeout=self.block_timeout)
+            accepted = True
+        except queue.Full:
+            accepted = False
+        with self._settled:
+            self._waiting -= 1
+            if accepted:
+                self.enqueued += 1
+            else:
+                self.dropped += 1
+            self._settled.notify_all()
+
+    # -------------------------------------------------
+    # 🧵 Writer loop
+    # -------------------------------------------------
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self.queue.get()
+            if first is _STOP:
+                self.queue.task_done()
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self.queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch: list[tuple]) -> None:
+        queries = [row for kind, row in batch if kind == "query"]
+        errors = [row for kind, row in batch if kind == "error"]
+        try:
+            write_log_batch(queries, errors)
+            self.written += len(batch)
         except Exception as e:
-            logging.warning(f"⚠️ Async log scheduling failed: {e}")
+            self.failed += len(batch)
+            logging.error(f"❌ Log batch write failed ({len(batch)} records): {e}")
+        finally:
+            self.batches += 1
+            self.last_batch_size = len(batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+            for _ in batch:
+                self.queue.task_done()
+
+    # -------------------------------------------------
+    # 📊 Stats
+    # -------------------------------------------------
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "policy": self.policy,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "deferred": self.deferred,
+            "sampled_out": self.sampled_out,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": round(self.written / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+_WRITER = LogWriter()
+
+
+def get_writer() -> LogWriter:
+    return _WRITER
+
+
+def start_log_writer() -> None:
+    _WRITER.start()
+
+
+def stop_log_writer(timeout: float = 5.0) -> bool:
+    """Drain the queue and stop the writer (FastAPI lifespan shutdown / atexit)."""
+    drained = _WRITER.stop(timeout)
+    if not drained:
+        logging.warning(f"⚠️ Log writer stopped with {_WRITER.queue.qsize()} records still queued.")
+    return drained
+
 
-    # fallback if no event loop
+def get_log_stats() -> dict:
+    return _WRITER.stats()
+
+
+atexit.register(stop_log_writer)
+
+
+# =====================================================
+# 🧠 Public API (unchanged signatures)
+# =====================================================
+def log_query_async(query: str, result: dict | str, mode: str, success: bool):
+    """Queue a query log for the background writer (never touches SQLite on the caller's thread)."""
+    row = (datetime.now(UTC).isoformat(), query, mode, str(result), int(success))
+    try:
+        _WRITER.submit(("query", row))
+        return
+    except Exception as e:
+        logging.warning(f"⚠️ Async log scheduling failed: {e}")
+
+    # fallback if the writer cannot be used
     logging.warning("⚠️ Async log fallback → running synchronously.")
     try:
         log_query(query, result, mode, success)
@@ -45,18 +306,17 @@ def log_query_async(query: str, result: dict | str, mode: str, success: bool):
 
 
 def log_error_async(module: str, message: str):
-    """Schedule async non-blocking error log."""
-    if _has_event_loop():
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(_run_in_thread(log_error, module, message))
-            return
-        except Exception as e:
-            logging.warning(f"⚠️ Async error scheduling failed: {e}")
+    """Queue an error log for the background writer."""
+    row = (datetime.now(UTC).isoformat(), module, message, "")
+    try:
+        _WRITER.submit(("error", row))
+        return
+    except Exception as e:
+        logging.warning(f"⚠️ Async error scheduling failed: {e}")
 
-    # fallback if no event loop
+    # fallback if the writer cannot be used
     logging.warning("⚠️ Async error log fallback → running synchronously.")
     try:
         log_error(module, message)
     except Exception as e:
-        logging.error(f"❌ Sync log_error fallback failed: {e}")
\ No newline at end of file
+        logging.error(f"❌ Sync log_error fallback failed: {e}")
@@ -0,0 +1,105 @@
+"""
+fuel_mcp/core/cache.py
+======================
+
+Small thread-safe LRU cache with optional TTL and hit/miss counters,
+shared by the RAG embedding cache and the /query result cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry.
+
+    With `ttl` (seconds), entries older than ttl count as misses and are
+    dropped on access.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = max(0, maxsize)
+        self.ttl = ttl
+        self.clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING and self.ttl is not None and self.clock() - item[0] >= self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                item = _MISSING
+            if item is _MISSING:
+                if count:
+                    self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            if count:
+                self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = (self.clock(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computing (outside the lock) and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def update(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        for key, value in items:
+            self.set(key, value)
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        """Live (key, value) pairs, least recently used first."""
+        with self._lock:
+            now = self.clock()
+            return [
+                (key, value) for key, (stamp, value) in self._data.items()
+                if self.ttl is None or now - stamp < self.ttl
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -13,6 +13,8 @@ Usage examples:
     mcp-cli db stats
     mcp-cli db clean --days 30
     mcp-cli db vacuum
+    mcp-cli db rebuild-counters
+    mcp-cli db migrate
 """
 
 import sys
@@ -22,7 +24,17 @@ import sqlite3
 from datetime import datetime, timedelta
 from fuel_mcp.tool_interface import mcp_query
 from fuel_mcp.core.setup_env import initialize_environment, LOG_FILE
-from fuel_mcp.core.db_logger import get_recent_queries, log_query, DB_PATH
+from fuel_mcp.core.db_logger import (
+    DB_PATH,
+    SCHEMA_VERSION,
+    get_connection,
+    get_query_counts,
+    get_recent_queries,
+    log_query,
+    migrate,
+    rebuild_query_counters,
+    schema_version,
+)
 
 # =====================================================
 # 📊 DB Maintenance Utilities
@@ -35,25 +47,12 @@ def db_stats():
         print("⚠️ Database not found.")
         return
 
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-
-    cur.execute("SELECT COUNT(*) FROM queries")
-    total = cur.fetchone()[0] or 0
-
-    cur.execute("SELECT COUNT(*) FROM queries WHERE success = 1")
-    success = cur.fetchone()[0] or 0
-
-    cur.execute("SELECT COUNT(*) FROM queries WHERE success = 0")
-    failed = cur.fetchone()[0] or 0
-
-    cur.execute("SELECT timestamp FROM queries ORDER BY id DESC LIMIT 1")
-    last_query = cur.fetchone()
-
-    cur.execute("SELECT timestamp FROM errors ORDER BY id DESC LIMIT 1")
-    last_error = cur.fetchone()
+    conn = get_connection()  # creates / backfills query_counters on older databases
+    counts = get_query_counts(conn)
+    total, success, failed = counts["total"], counts["successful"], counts["failed"]
 
-    conn.close()
+    last_query = conn.execute("SELECT timestamp FROM queries ORDER BY id DESC LIMIT 1").fetchone()
+    last_error = conn.execute("SELECT timestamp FROM errors ORDER BY id DESC LIMIT 1").fetchone()
 
     ratio = (success / total * 100) if total > 0 else 0
     print("📊 Fuel MCP — Database Statistics")
@@ -74,14 +73,12 @@ def db_clean(days: int = 30):
         return
 
     cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
+    conn = get_connection()  # migrated on open, so the timestamp indexes exist
 
-    cur.execute("DELETE FROM queries WHERE timestamp < ?", (cutoff,))
-    cur.execute("DELETE FROM errors WHERE timestamp < ?", (cutoff,))
-    deleted = conn.total_changes
-    conn.commit()
-    conn.close()
+    # rowcount, not total_changes: the query_counters triggers change rows too
+    with conn:
+        deleted = conn.execute("DELETE FROM queries WHERE timestamp < ?", (cutoff,)).rowcount
+        deleted += conn.execute("DELETE FROM errors WHERE timestamp < ?", (cutoff,)).rowcount
 
     print(f"🧹 Removed {deleted} old records (older than {days} days).")
 
@@ -104,6 +101,38 @@ def db_vacuum():
     print(f"  • Size reduced: {before:.1f} KB → {after:.1f} KB")
 
 
+def db_rebuild_counters():
+    """Recompute the materialized query counters from the queries table."""
+    initialize_environment(verbose=False)
+    if not os.path.exists(DB_PATH):
+        print("⚠️ Database not found.")
+        return
+
+    rows = rebuild_query_counters(get_connection())
+    counts = get_query_counts()
+    print("🔁 Query counters rebuilt")
+    print(f"  • Counter rows:  {rows}")
+    print(f"  • Total queries: {counts['total']}")
+
+
+def db_migrate():
+    """Apply pending schema migrations and report the schema version."""
+    initialize_environment(verbose=False)
+    if not os.path.exists(DB_PATH):
+        print("⚠️ Database not found.")
+        return
+
+    conn = sqlite3.connect(DB_PATH)  # not get_connection(): that would migrate on open
+    try:
+        before = schema_version(conn)
+        applied = migrate(conn)
+    finally:
+        conn.close()
+    print("🧱 Schema migrations")
+    print(f"  • Version: {before} → {before if not applied else applied[-1]} (latest {SCHEMA_VERSION})")
+    print(f"  • Applied: {', '.join(map(str, applied)) or 'none — already up to date'}")
+
+
 # =====================================================
 # 🔍 Status and Logs
 # =====================================================
@@ -207,7 +236,7 @@ def main():
         show_history()
     elif cmd == "db":
         if len(args) < 2:
-            print("Usage: mcp-cli db [stats|clean|vacuum] [--days N]")
+            print("Usage: mcp-cli db [stats|clean|vacuum|rebuild-counters|migrate] [--days N]")
             return
         sub = args[1].lower()
         if sub == "stats":
@@ -222,8 +251,12 @@ def main():
             db_clean(days)
         elif sub == "vacuum":
             db_vacuum()
+        elif sub == "rebuild-counters":
+            db_rebuild_counters()
+        elif sub == "migrate":
+            db_migrate()
         else:
-            print("Available db commands: stats, clean, vacuum")
+            print("Available db commands: stats, clean, vacuum, rebuild-counters, migrate")
     else:
         print(f"❌ Unknown command: {cmd}")
         print("Available: status, log, vcf, convert, history, db")
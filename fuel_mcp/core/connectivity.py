@@ -0,0 +1,182 @@
+"""
+fuel_mcp/core/connectivity.py
+=============================
+
+Online-connectivity state for the RAG layer, without import-time probes.
+
+- The probe (an HTTP reachability check) runs lazily on first use or in a
+  background thread, and its result is cached for MCP_CONNECTIVITY_TTL seconds.
+  Only the very first probe can hold up a caller; once a result is cached,
+  a stale one is served while a background probe refreshes it.
+- A circuit breaker tracks failures of real online calls: after
+  MCP_CIRCUIT_FAILURES consecutive failures it opens (offline) for
+  MCP_CIRCUIT_COOLDOWN seconds, then lets one trial call through
+  (half-open). A successful trial closes it again.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, UTC
+from typing import Callable
+
+# =====================================================
+# ⚙️ Settings
+# =====================================================
+PROBE_TTL = float(os.getenv("MCP_CONNECTIVITY_TTL", "300"))
+FAILURE_THRESHOLD = int(os.getenv("MCP_CIRCUIT_FAILURES", "3"))
+COOLDOWN = float(os.getenv("MCP_CIRCUIT_COOLDOWN", "60"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+# =====================================================
+# 🔌 Circuit breaker
+# =====================================================
+class CircuitBreaker:
+    """Consecutive-failure breaker with a timed half-open trial."""
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN,
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.last_error: str | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if an online call may be attempted now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self, error: BaseException | str | None = None) -> None:
+        with self._lock:
+            self.failures += 1
+            if error is not None:
+                self.last_error = error if isinstance(error, str) else type(error).__name__
+            if self.state == HALF_OPEN or self.failures >= self.threshold:
+                self.state = OPEN
+                self.opened_at = self.clock()
+            self._trial_running = False
+
+    def status(self) -> dict:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = round(max(0.0, self.cooldown - (self.clock() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "threshold": self.threshold,
+            "retry_in_seconds": retry_in,
+            "last_error": self.last_error,
+        }
+
+
+# =====================================================
+# 🌐 Connectivity manager
+# =====================================================
+class ConnectivityManager:
+    """Cached reachability probe + circuit breaker deciding online vs offline."""
+
+    def __init__(self, probe: Callable[[], bool], ttl: float = PROBE_TTL,
+                 breaker: CircuitBreaker | None = None, clock: Callable[[], float] = time.monotonic):
+        self.probe_fn = probe
+        self.ttl = ttl
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.clock = clock
+        self.reachable: bool | None = None  # None = not probed yet
+        self.checked_at: float | None = None
+        self.checked_at_iso: str | None = None
+        self.probe_ms: float | None = None
+        self.probes = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def _stale(self) -> bool:
+        return self.checked_at is None or self.clock() - self.checked_at >= self.ttl
+
+    def probe(self) -> bool:
+        """Run the probe now (serialized) and cache its result."""
+        with self._lock:
+            started = time.perf_counter()
+            try:
+                reachable = bool(self.probe_fn())
+            except Exception:
+                reachable = False
+            self.probe_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.reachable = reachable
+            self.checked_at = self.clock()
+            self.checked_at_iso = datetime.now(UTC).isoformat()
+            self.probes += 1
+            return reachable
+
+    def probe_async(self) -> threading.Thread | None:
+        """Refresh the cached result in a background thread (None if a probe is already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return None
+            self._thread = threading.Thread(target=self.probe, name="mcp-connectivity-probe", daemon=True)
+            self._thread.start()
+            return self._thread
+
+    def is_reachable(self, block: bool = True) -> bool:
+        """
+        Cached probe result. Before the first result exists, block=True
+        probes inline (or waits for a probe already running); otherwise a
+        stale result is returned while probe_async() refreshes it.
+        """
+        if self._stale():
+            if block and self.reachable is None:
+                running = self._thread
+                if running is not None and running.is_alive():
+                    running.join()  # e.g. the startup probe: wait for it instead of probing twice
+                if self.reachable is None:
+                    return self.probe()
+            else:
+                self.probe_async()
+        return bool(self.reachable)
+
+    def allow_online(self, block: bool = True) -> bool:
+        """True if an online call should be attempted (reachable and breaker not open)."""
+        return self.is_reachable(block) and self.breaker.allow()
+
+    def record_success(self) -> None:
+        self.breaker.record_success()
+
+    def record_failure(self, error: BaseException | str | None = None) -> None:
+        self.breaker.record_failure(error)
+
+    @property
+    def online(self) -> bool:
+        """Last known mode, without probing."""
+        return bool(self.reachable) and self.breaker.state != OPEN
+
+    def status(self) -> dict:
+        age = None if self.checked_at is None else round(self.clock() - self.checked_at, 1)
+        return {
+            "reachable": self.reachable,
+            "last_probe": self.checked_at_iso,
+            "probe_age_seconds": age,
+            "probe_ms": self.probe_ms,
+            "probe_ttl_seconds": self.ttl,
+            "probes": self.probes,
+            "circuit": self.breaker.status(),
+        }
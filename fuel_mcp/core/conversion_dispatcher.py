@@ -2,8 +2,7 @@
 # fuel_mcp/core/conversion_dispatcher.py
 import json
 from pathlib import Path
-from fuel_mcp.core.conversion_engine import load_table_from_registry
-import pandas as pd
+from fuel_mcp.core.conversion_engine import get_table_arrays
 
 
 # =====================================================
@@ -41,12 +40,10 @@ def convert(conversion_type: str, value: float) -> dict:
     if conversion_type == "density_to_mass":
         # Table 54B
         table_name = "ASTM_Table54B_Density15C_to_Short_and_Long_Tons_per_CubicMeter_norm.csv"
-        df = load_table_from_registry(table_name)
-        x = df["density_15c_kg_per_m3"]
-        y1 = df["short_tons_per_cubicmeter"]
-        y2 = df["long_tons_per_cubicmeter"]
-        short_ton = float(y1.iloc[(x - value).abs().idxmin()])
-        long_ton = float(y2.iloc[(x - value).abs().idxmin()])
+        table = get_table_arrays(table_name, "density_15c_kg_per_m3")
+        short_ton, long_ton = table.nearest(
+            value, "short_tons_per_cubicmeter", "long_tons_per_cubicmeter"
+        )
         return {
             "input_density_15C": value,
             "short_tons_per_m3": short_ton,
@@ -57,10 +54,8 @@ def convert(conversion_type: str, value: float) -> dict:
     elif conversion_type == "density_to_volume":
         # Table 53B
         table_name = "ASTM_Table53B_Density15C_to_CubicMeters_per_MetricTon_norm.csv"
-        df = load_table_from_registry(table_name)
-        x = df["density_15c_kg_per_m3"]
-        y = df["cubic_meters_per_tonne"]
-        result = float(y.iloc[(x - value).abs().idxmin()])
+        table = get_table_arrays(table_name, "density_15c_kg_per_m3")
+        (result,) = table.nearest(value, "cubic_meters_per_tonne")
         return {
             "input_density_15C": value,
             "cubic_meters_per_tonne": result,
@@ -70,10 +65,8 @@ def convert(conversion_type: str, value: float) -> dict:
     elif conversion_type == "air_correction":
         # Table 56
         table_name = "ASTM_Table56_Density15C_to_VacuoAirFactor_norm.csv"
-        df = load_table_from_registry(table_name)
-        x = df["density_15c_kg_per_l"]
-        y = df["weight_in_vacuo_to_air_factor"]
-        result = float(y.iloc[(x - value).abs().idxmin()])
+        table = get_table_arrays(table_name, "density_15c_kg_per_l")
+        (result,) = table.nearest(value, "weight_in_vacuo_to_air_factor")
         return {
             "input_density_15C": value,
             "weight_in_vacuo_to_air_factor": result,
@@ -3,12 +3,19 @@ conversion_engine.py
 ====================
 Handles loading and simple interpolation from ASTM/ISO normalized tables.
 Used internally by the dispatcher and MCP core for conversions.
+
+Hot tables are parsed once into a process-wide cache of contiguous NumPy
+arrays sorted by their key column; nearest-row lookups use np.searchsorted.
 """
 
+import threading
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import json
 
+from fuel_mcp.tables.compiled_store import load_columns, load_frame
+
 
 # =====================================================
 # 🔧 Load registry (safe with fallback)
@@ -34,15 +41,93 @@ def load_table_from_registry(table_name: str) -> pd.DataFrame:
         table_name (str): CSV filename (e.g. ASTM_Table54B_...csv)
 
     Returns:
-        pd.DataFrame: Loaded and parsed table.
+        pd.DataFrame: Loaded table (backed by the memory-mapped compiled artifact).
     """
-    base = Path(__file__).parents[1] / "tables" / "official" / "normalized"
-    path = base / table_name
+    return load_frame(table_name)
 
-    if not path.exists():
-        raise FileNotFoundError(f"❌ Table not found: {path}")
 
-    return pd.read_csv(path)
+# =====================================================
+# ⚡ Process-wide table cache (sorted NumPy columns)
+# =====================================================
+class TableArrays:
+    """All columns of one normalized table as float64 arrays sorted by `key`."""
+
+    def __init__(self, name: str, columns: dict[str, np.ndarray], key: str):
+        raw_key = np.asarray(columns[key], dtype=np.float64)
+        # Stable sort keeps original row order among equal keys (idxmin tie-break)
+        self.order = np.argsort(raw_key, kind="stable")
+        self.name = name
+        self.key = key
+        if np.all(self.order[1:] > self.order[:-1]):
+            # Already sorted: keep the (memory-mapped) compiled columns as-is
+            self.columns = {col: np.asarray(arr, dtype=np.float64) for col, arr in columns.items()}
+        else:
+            self.columns = {
+                col: np.ascontiguousarray(np.asarray(arr, dtype=np.float64)[self.order])
+                for col, arr in columns.items()
+            }
+        self.x = self.columns[key]
+
+    def nearest_index(self, value: float) -> int:
+        """
+        Index (in sorted order) of the row whose key is closest to `value`.
+        Ties resolve to the earliest row of the source table, exactly like
+        `(df[key] - value).abs().idxmin()`.
+        """
+        x = self.x
+        i = int(np.searchsorted(x, value, side="left"))
+        if i == 0:
+            return 0
+        if i == len(x):
+            return int(np.searchsorted(x, x[-1], side="left"))
+        left = int(np.searchsorted(x, x[i - 1], side="left"))  # first row of the left run
+        d_left, d_right = value - x[left], x[i] - value
+        if d_left < d_right:
+            return left
+        if d_right < d_left:
+            return i
+        return left if self.order[left] < self.order[i] else i
+
+    def nearest(self, value: float, *columns: str) -> tuple[float, ...]:
+        """Values of `columns` at the row closest to `value`."""
+        idx = self.nearest_index(value)
+        return tuple(float(self.columns[c][idx]) for c in columns)
+
+
+_TABLE_CACHE: dict[tuple[str, str], TableArrays] = {}
+_TABLE_CACHE_LOCK = threading.Lock()
+
+# Tables used on the request path (dispatcher / MCP core), keyed by lookup column
+HOT_TABLES = {
+    "ASTM_Table53B_Density15C_to_CubicMeters_per_MetricTon_norm.csv": "density_15c_kg_per_m3",
+    "ASTM_Table54B_Density15C_to_Short_and_Long_Tons_per_CubicMeter_norm.csv": "density_15c_kg_per_m3",
+    "ASTM_Table56_Density15C_to_VacuoAirFactor_norm.csv": "density_15c_kg_per_l",
+}
+
+
+def get_table_arrays(table_name: str, key: str) -> TableArrays:
+    """Return the cached sorted arrays for a table, loading it on first use."""
+    cached = _TABLE_CACHE.get((table_name, key))
+    if cached is None:
+        with _TABLE_CACHE_LOCK:
+            cached = _TABLE_CACHE.get((table_name, key))
+            if cached is None:
+                cached = TableArrays(table_name, load_columns(table_name), key)
+                _TABLE_CACHE[(table_name, key)] = cached
+    return cached
+
+
+def warm_table_cache(tables: dict[str, str] | None = None) -> int:
+    """Eagerly load hot tables (called from the API lifespan). Returns count loaded."""
+    for table_name, key in (tables or HOT_TABLES).items():
+        get_table_arrays(table_name, key)
+    return len(tables or HOT_TABLES)
+
+
+def clear_table_cache() -> None:
+    """Drop all cached tables (next lookup reloads them)."""
+    with _TABLE_CACHE_LOCK:
+        _TABLE_CACHE.clear()
 
 
 # =====================================================
@@ -64,16 +149,12 @@ def convert_density_to_mass(density_15C: float) -> dict:
         }
     """
     table_name = "ASTM_Table54B_Density15C_to_Short_and_Long_Tons_per_CubicMeter_norm.csv"
-    df = load_table_from_registry(table_name)
-
-    x = df["density_15c_kg_per_m3"]
-    y1 = df["short_tons_per_cubicmeter"]
-    y2 = df["long_tons_per_cubicmeter"]
+    table = get_table_arrays(table_name, "density_15c_kg_per_m3")
 
-    # Linear interpolation to approximate closest match
-    idx = (x - density_15C).abs().idxmin()
-    short_tons = float(pd.Series(y1).interpolate().iloc[idx])
-    long_tons = float(pd.Series(y2).interpolate().iloc[idx])
+    # Closest tabulated density
+    short_tons, long_tons = table.nearest(
+        density_15C, "short_tons_per_cubicmeter", "long_tons_per_cubicmeter"
+    )
 
     return {
         "density_15C": density_15C,
@@ -4,9 +4,27 @@ fuel_mcp/core/db_logger.py
 
 SQLite logging and history storage for Fuel MCP.
 Keeps structured logs of every query, result, error, and metrics snapshot.
+
+Each thread keeps one persistent connection (opened in WAL mode with a
+busy timeout, so concurrent writers wait instead of failing with
+"database is locked"). The schema is brought up to date by migrate() when
+a connection opens (PRAGMA user_version records the last applied
+MIGRATIONS step), and the fixed
+INSERT statements are reused from sqlite3's per-connection statement cache.
+
+Query totals come from `query_counters` — one row per (day, mode,
+success) — kept in step with `queries` by triggers in the same
+transaction as every INSERT / UPDATE / DELETE, whoever the writer is.
+Reading totals is a scan of that small table instead of COUNT(*) over
+the whole history; rebuild_query_counters() recomputes it from scratch.
+
+query_history() / error_history() page newest-first with an id cursor
+(`before_id`), so deep pages cost the same as the first one (no OFFSET).
 """
 
+import os
 import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime, UTC
 
@@ -17,54 +35,221 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DB_PATH = BASE_DIR / "data" / "mcp_history.db"
 DB_PATH.parent.mkdir(exist_ok=True)
 
-
 # =====================================================
-# 🏗️ Initialization
+# ⚙️ Connection settings
 # =====================================================
-def init_db():
-    """Initialize SQLite database with required tables."""
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
+BUSY_TIMEOUT_MS = int(os.getenv("MCP_DB_BUSY_TIMEOUT_MS", "5000"))
+SYNCHRONOUS = os.getenv("MCP_DB_SYNCHRONOUS", "NORMAL").upper()  # OFF | NORMAL | FULL
 
-    # Table: queries
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS queries (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            query TEXT,
-            mode TEXT,
-            result TEXT,
-            success INTEGER
-        )
-    """)
+INSERT_QUERY_SQL = "INSERT INTO queries (timestamp, query, mode, result, success) VALUES (?, ?, ?, ?, ?)"
+INSERT_ERROR_SQL = "INSERT INTO errors (timestamp, module, message, stacktrace) VALUES (?, ?, ?, ?)"
+INSERT_METRICS_SQL = """
+    INSERT INTO metrics_log
+    (timestamp, uptime_seconds, total_queries, successful_queries, failed_queries, success_ratio, db_size_kb)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
 
+# counter key of a queries row (NULLs kept distinct from 0/1 so totals match COUNT(*) exactly)
+_COUNTER_KEY = "IFNULL(substr({t}.timestamp, 1, 10), ''), IFNULL({t}.mode, ''), IFNULL({t}.success, -1)"
+_COUNTER_MATCH = (
+    "day = IFNULL(substr({t}.timestamp, 1, 10), '') AND mode = IFNULL({t}.mode, '') "
+    "AND success = IFNULL({t}.success, -1)"
+)
+_COUNTER_UP = f"""
+        INSERT INTO query_counters (day, mode, success, count) VALUES ({_COUNTER_KEY.format(t="NEW")}, 1)
+        ON CONFLICT (day, mode, success) DO UPDATE SET count = count + 1;"""
+_COUNTER_DOWN = f"""
+        UPDATE query_counters SET count = count - 1 WHERE {_COUNTER_MATCH.format(t="OLD")};
+        DELETE FROM query_counters WHERE count <= 0 AND {_COUNTER_MATCH.format(t="OLD")};"""
+REBUILD_COUNTERS_SQL = f"""
+    INSERT INTO query_counters (day, mode, success, count)
+    SELECT {_COUNTER_KEY.format(t="queries")}, COUNT(*) FROM queries GROUP BY 1, 2, 3
+"""
+SCHEMA = (
+    # Table: queries
+    """
+    CREATE TABLE IF NOT EXISTS queries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        query TEXT,
+        mode TEXT,
+        result TEXT,
+        success INTEGER
+    )
+    """,
     # Table: errors
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS errors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            module TEXT,
-            message TEXT,
-            stacktrace TEXT
-        )
-    """)
-
+    """
+    CREATE TABLE IF NOT EXISTS errors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        module TEXT,
+        message TEXT,
+        stacktrace TEXT
+    )
+    """,
     # ✅ Table: metrics_log
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS metrics_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            uptime_seconds REAL,
-            total_queries INTEGER,
-            successful_queries INTEGER,
-            failed_queries INTEGER,
-            success_ratio TEXT,
-            db_size_kb REAL
-        )
-    """)
+    """
+    CREATE TABLE IF NOT EXISTS metrics_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        uptime_seconds REAL,
+        total_queries INTEGER,
+        successful_queries INTEGER,
+        failed_queries INTEGER,
+        success_ratio TEXT,
+        db_size_kb REAL
+    )
+    """,
+)
+COUNTER_SCHEMA = (
+    # ✅ Table: query_counters (materialized COUNT(*) of queries)
+    """
+    CREATE TABLE IF NOT EXISTS query_counters (
+        day TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        success INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (day, mode, success)
+    ) WITHOUT ROWID
+    """,
+    f"CREATE TRIGGER IF NOT EXISTS query_counters_insert AFTER INSERT ON queries BEGIN{_COUNTER_UP}\n    END",
+    f"CREATE TRIGGER IF NOT EXISTS query_counters_delete AFTER DELETE ON queries BEGIN{_COUNTER_DOWN}\n    END",
+    "CREATE TRIGGER IF NOT EXISTS query_counters_update AFTER UPDATE OF timestamp, mode, success ON queries "
+    f"BEGIN{_COUNTER_DOWN}{_COUNTER_UP}\n    END",
+)
+INDEX_SCHEMA = (
+    "CREATE INDEX IF NOT EXISTS idx_queries_timestamp ON queries (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_queries_mode_success ON queries (mode, success)",
+    "CREATE INDEX IF NOT EXISTS idx_errors_timestamp ON errors (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_errors_module_id ON errors (module, id)",
+)
+
+# =====================================================
+# 🧱 Migrations
+# =====================================================
+# (version, description, statements), applied in order; PRAGMA user_version
+# holds the last applied version. Append new steps — never edit shipped ones.
+MIGRATIONS: tuple[tuple[int, str, tuple[str, ...]], ...] = (
+    (1, "base tables", SCHEMA),
+    # the rebuild also corrects databases that got the table before versioning
+    (2, "materialized query counters", (*COUNTER_SCHEMA, "DELETE FROM query_counters", REBUILD_COUNTERS_SQL)),
+    (3, "indexes for history / error paging, filters and db clean", INDEX_SCHEMA),
+)
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> list[int]:
+    """
+    Apply pending MIGRATIONS, each in its own IMMEDIATE transaction (the
+    version is re-read under the write lock, so concurrent openers apply a
+    step once). Returns the versions applied.
+    """
+    applied = []
+    for version, _, statements in MIGRATIONS:
+        if schema_version(conn) >= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) < version:
+                for sql in statements:
+                    conn.execute(sql)
+                conn.execute(f"PRAGMA user_version = {version}")
+                applied.append(version)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return applied
+
+
+# =====================================================
+# 🔌 Connection manager
+# =====================================================
+_local = threading.local()
+_CONNECTIONS: list[tuple[int, sqlite3.Connection]] = []  # (pid, conn) for close_connections()
+_LOCK = threading.Lock()
+_generation = 0  # bumped by close_connections(); other threads' cached connections are then stale
+
+
+def _file_id(path: Path) -> tuple | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _open(path: Path) -> tuple[sqlite3.Connection, tuple]:
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+
+    if schema_version(conn) < SCHEMA_VERSION:
+        migrate(conn)
+
+    with _LOCK:
+        _CONNECTIONS.append((os.getpid(), conn))
+    return conn, _file_id(path)
+
+
+def _discard(conn: sqlite3.Connection) -> None:
+    with _LOCK:
+        _CONNECTIONS[:] = [(pid, c) for pid, c in _CONNECTIONS if c is not conn]
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
 
-    conn.commit()
-    conn.close()
+def get_connection() -> sqlite3.Connection:
+    """
+    Return this thread's persistent connection to DB_PATH.
+
+    A new connection is opened after a fork, when DB_PATH is changed, when
+    the database file was deleted/replaced underneath us, or after
+    close_connections() (which long-lived pool threads would not notice).
+    """
+    path = Path(DB_PATH)
+    pid = os.getpid()
+    state = getattr(_local, "state", None)
+    if state is not None:
+        s_pid, s_path, s_file_id, s_generation, conn = state
+        if s_pid == pid and s_path == path and s_generation == _generation and s_file_id == _file_id(path):
+            return conn
+        if s_pid == pid:
+            _discard(conn)  # never close a connection inherited across fork
+    conn, file_id = _open(path)
+    _local.state = (pid, path, file_id, _generation, conn)
+    return conn
+
+
+def close_connections() -> None:
+    """Close every pooled connection of this process (shutdown / maintenance)."""
+    global _generation
+    pid = os.getpid()
+    with _LOCK:
+        _generation += 1
+        mine = [c for p, c in _CONNECTIONS if p == pid]
+        _CONNECTIONS[:] = [(p, c) for p, c in _CONNECTIONS if p != pid]
+    for conn in mine:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _local.state = None
+
+
+# =====================================================
+# 🏗️ Initialization
+# =====================================================
+def init_db():
+    """Initialize SQLite database with required tables (no-op once this thread is connected)."""
+    get_connection()
 
 
 # =====================================================
@@ -72,67 +257,164 @@ def init_db():
 # =====================================================
 def log_query(query: str, result: dict | str, mode: str = "unknown", success: bool = True):
     """Insert a query record into the database (auto-initialize if missing)."""
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO queries (timestamp, query, mode, result, success) VALUES (?, ?, ?, ?, ?)",
-        (datetime.now(UTC).isoformat(), query, mode, str(result), int(success)),
-    )
-    conn.commit()
-    conn.close()
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            INSERT_QUERY_SQL,
+            (datetime.now(UTC).isoformat(), query, mode, str(result), int(success)),
+        )
 
 
 def log_error(module: str, message: str, stacktrace: str = ""):
     """Insert an error record into the database (auto-initialize if missing)."""
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO errors (timestamp, module, message, stacktrace) VALUES (?, ?, ?, ?)",
-        (datetime.now(UTC).isoformat(), module, message, stacktrace),
-    )
-    conn.commit()
-    conn.close()
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            INSERT_ERROR_SQL,
+            (datetime.now(UTC).isoformat(), module, message, stacktrace),
+        )
+
+
+def write_log_batch(queries: list[tuple], errors: list[tuple]):
+    """
+    Insert pre-built query rows (timestamp, query, mode, result, success) and
+    error rows (timestamp, module, message, stacktrace) in one transaction.
+    """
+    conn = get_connection()
+    with conn:
+        if queries:
+            conn.executemany(INSERT_QUERY_SQL, queries)
+        if errors:
+            conn.executemany(INSERT_ERROR_SQL, errors)
 
 
 def log_metrics_snapshot(uptime_seconds, total, success, fail, ratio, db_size_kb):
     """Record periodic metrics snapshot into SQLite."""
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO metrics_log
-        (timestamp, uptime_seconds, total_queries, successful_queries, failed_queries, success_ratio, db_size_kb)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            datetime.now(UTC).isoformat(),
-            float(uptime_seconds),
-            int(total),
-            int(success),
-            int(fail),
-            str(ratio),
-            float(db_size_kb),
-        ),
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            INSERT_METRICS_SQL,
+            (
+                datetime.now(UTC).isoformat(),
+                float(uptime_seconds),
+                int(total),
+                int(success),
+                int(fail),
+                str(ratio),
+                float(db_size_kb),
+            ),
+        )
+
+
+def rebuild_query_counters(conn: sqlite3.Connection | None = None) -> int:
+    """Recompute query_counters from queries (repair / databases edited with triggers off)."""
+    conn = conn or get_connection()
+    with conn:
+        conn.execute("DELETE FROM query_counters")
+        conn.execute(REBUILD_COUNTERS_SQL)
+        return conn.execute("SELECT COUNT(*) FROM query_counters").fetchone()[0]
+
+
+def get_query_counts(conn: sqlite3.Connection | None = None, mode: str | None = None,
+                     since: str | None = None) -> dict:
+    """
+    Query totals {"total", "successful", "failed"} from query_counters,
+    optionally for one mode and/or from day `since` (YYYY-MM-DD) on.
+    """
+    where, params = [], []
+    if mode is not None:
+        where.append("mode = ?")
+        params.append(mode)
+    if since is not None:
+        where.append("day >= ?")
+        params.append(since[:10])
+    total, successful, failed = (conn or get_connection()).execute(
+        "SELECT IFNULL(SUM(count), 0), IFNULL(SUM(CASE WHEN success = 1 THEN count END), 0), "
+        "IFNULL(SUM(CASE WHEN success = 0 THEN count END), 0) FROM query_counters"
+        + (f" WHERE {' AND '.join(where)}" if where else ""),
+        params,
+    ).fetchone()
+    return {"total": total, "successful": successful, "failed": failed}
+
+
+def get_counts_by_mode(conn: sqlite3.Connection | None = None) -> dict[str, dict]:
+    """{mode: {"total", "successful", "failed"}} from query_counters."""
+    rows = (conn or get_connection()).execute(
+        "SELECT mode, SUM(count), IFNULL(SUM(CASE WHEN success = 1 THEN count END), 0), "
+        "IFNULL(SUM(CASE WHEN success = 0 THEN count END), 0) FROM query_counters GROUP BY mode ORDER BY mode"
     )
-    conn.commit()
-    conn.close()
+    return {mode: {"total": t, "successful": s, "failed": f} for mode, t, s, f in rows}
+
+
+def snapshot_metrics(uptime_seconds: float) -> dict:
+    """Append a metrics_log row from query_counters (one transaction); returns the counts."""
+    conn = get_connection()
+    path = Path(DB_PATH)
+    db_size_kb = path.stat().st_size / 1024 if path.exists() else 0.0
+    with conn:
+        counts = get_query_counts(conn)
+        ratio = f"{round(counts['successful'] / counts['total'] * 100, 2)}%" if counts["total"] else "0%"
+        conn.execute(
+            INSERT_METRICS_SQL,
+            (datetime.now(UTC).isoformat(), float(uptime_seconds), counts["total"], counts["successful"],
+             counts["failed"], ratio, round(db_size_kb, 2)),
+        )
+    return counts
 
 
 def get_recent_queries(limit: int = 20) -> list[tuple]:
     """Return recent N query entries (auto-initialize if missing)."""
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(
+    cur = get_connection().execute(
         "SELECT timestamp, query, mode, success FROM queries ORDER BY id DESC LIMIT ?",
         (limit,),
     )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    return cur.fetchall()
+
+
+def _bound(value: datetime | str | None) -> str | None:
+    """Timestamps are stored as UTC isoformat text; naive datetimes are taken as UTC."""
+    if isinstance(value, datetime):
+        value = (value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)).isoformat()
+    return value
+
+
+def _page(table: str, columns: str, limit: int, before_id: int | None, since, until,
+          filters: dict) -> list[tuple]:
+    """
+    Newest-first keyset page: `id < before_id` walks the primary key, so deep
+    pages cost the same as the first one. `since` is inclusive, `until` exclusive.
+    """
+    where, params = [], []
+    for column, value in filters.items():
+        if value is not None:
+            where.append(f"{column} = ?")
+            params.append(value)
+    for clause, value in (("timestamp >= ?", _bound(since)), ("timestamp < ?", _bound(until))):
+        if value is not None:
+            where.append(clause)
+            params.append(value)
+    if before_id is not None:
+        where.append("id < ?")
+        params.append(before_id)
+    sql = f"SELECT {columns} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return get_connection().execute(f"{sql} ORDER BY id DESC LIMIT ?", (*params, limit)).fetchall()
+
+
+def query_history(limit: int = 20, before_id: int | None = None, mode: str | None = None,
+                  success: bool | None = None, since: datetime | str | None = None,
+                  until: datetime | str | None = None) -> list[tuple]:
+    """(id, timestamp, query, mode, success) rows, newest first, older than `before_id`."""
+    return _page("queries", "id, timestamp, query, mode, success", limit, before_id, since, until,
+                 {"mode": mode, "success": None if success is None else int(success)})
+
+
+def error_history(limit: int = 20, before_id: int | None = None, module: str | None = None,
+                  since: datetime | str | None = None, until: datetime | str | None = None) -> list[tuple]:
+    """(id, timestamp, module, message, stacktrace) rows, newest first, older than `before_id`."""
+    return _page("errors", "id, timestamp, module, message, stacktrace", limit, before_id, since, until,
+                 {"module": module})
 
 
 # =====================================================
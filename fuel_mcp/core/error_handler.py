@@ -50,7 +50,7 @@ def log_error(exception: Exception, query: str = None, module: str = None):
         "query": query or "N/A",
         "error_type": type(exception).__name__,
         "message": str(exception),
-        "stacktrace": traceback.format_exc(),
+        "stacktrace": "".join(traceback.format_exception(exception)),  # also valid outside the except block (pool threads)
     }
 
     # 1️⃣ Log to SQLite
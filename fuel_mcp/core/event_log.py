@@ -0,0 +1,162 @@
+"""
+fuel_mcp/core/event_log.py
+==========================
+
+Append-only JSON Lines event sink (used for the RAG activity log).
+
+- Events are buffered in memory and written with one O_APPEND write per
+  flush, so lines from several workers never interleave or get rewritten.
+- A flush happens when MCP_EVENT_LOG_BUFFER events are pending, or
+  MCP_EVENT_LOG_FLUSH_INTERVAL seconds after the first pending event, and
+  at exit.
+- When the file would exceed MCP_EVENT_LOG_MAX_BYTES it is rotated to
+  <name>.1 … <name>.N (MCP_EVENT_LOG_BACKUPS).
+- tail(n) returns the last n events by reading blocks backwards from the
+  end of the file (and older rotated files if needed).
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+# =====================================================
+# ⚙️ Settings
+# =====================================================
+MAX_BYTES = int(os.getenv("MCP_EVENT_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+BACKUPS = int(os.getenv("MCP_EVENT_LOG_BACKUPS", "3"))
+BUFFER_EVENTS = int(os.getenv("MCP_EVENT_LOG_BUFFER", "20"))
+FLUSH_INTERVAL = float(os.getenv("MCP_EVENT_LOG_FLUSH_INTERVAL", "1.0"))
+
+_BLOCK = 64 * 1024
+
+
+class JsonlEventLog:
+    """Buffered, size-rotated, append-only JSON Lines file."""
+
+    def __init__(self, path: str | Path, max_bytes: int = MAX_BYTES, backups: int = BACKUPS,
+                 buffer_events: int = BUFFER_EVENTS, flush_interval: float = FLUSH_INTERVAL):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = max(0, backups)
+        self.buffer_events = max(1, buffer_events)
+        self.flush_interval = flush_interval
+        self._pending: list[str] = []
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self.written = 0
+        self.rotations = 0
+        atexit.register(self.flush)
+
+    # -------------------------------------------------
+    # ✍️ Write
+    # -------------------------------------------------
+    def append(self, event: dict) -> None:
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._pending.append(line)
+            full = len(self._pending) >= self.buffer_events
+            if not full and self._timer is None and self.flush_interval > 0:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full or self.flush_interval <= 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending events in one append."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            data = "".join(self._pending).encode("utf-8")
+            count = len(self._pending)
+            self._pending.clear()
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._rotate_if_needed(len(data))
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+                self.written += count
+            except OSError as e:
+                logging.error(f"❌ Event log write failed ({count} events → {self.path}): {e}")
+
+    def _rotated(self, i: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{i}")
+
+    def _rotate_if_needed(self, incoming: int) -> None:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+        if self.backups == 0:
+            self.path.unlink(missing_ok=True)
+        else:
+            for i in range(self.backups - 1, 0, -1):
+                if self._rotated(i).exists():
+                    os.replace(self._rotated(i), self._rotated(i + 1))
+            os.replace(self.path, self._rotated(1))
+        self.rotations += 1
+
+    # -------------------------------------------------
+    # 📖 Read
+    # -------------------------------------------------
+    @staticmethod
+    def _tail_lines(path: Path, n: int) -> list[bytes]:
+        """Last n complete lines of a file, reading backwards in blocks."""
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return []
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            data = b""
+            while pos > 0 and data.count(b"\n") <= n:
+                step = min(_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        if pos > 0:
+            lines = lines[1:]  # first line may be cut in the middle
+        return lines[-n:]
+
+    def tail(self, n: int = 100) -> list[dict]:
+        """Return the last n events, oldest first (pending events are flushed first)."""
+        self.flush()
+        if n <= 0:
+            return []
+        lines: list[bytes] = []
+        for path in [self.path] + [self._rotated(i) for i in range(1, self.backups + 1)]:
+            lines = self._tail_lines(path, n - len(lines)) + lines
+            if len(lines) >= n:
+                break
+        events = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue  # skip a torn line rather than failing the reader
+        return events
+
+    def stats(self) -> dict:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        return {
+            "path": str(self.path),
+            "size_bytes": size,
+            "pending": len(self._pending),
+            "written": self.written,
+            "rotations": self.rotations,
+        }
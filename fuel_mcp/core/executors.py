@@ -0,0 +1,164 @@
+"""
+fuel_mcp/core/executors.py
+==========================
+
+Named, sized thread pools for the async API.
+
+Handlers run on the event loop and hand blocking work to a pool:
+    cpu  — batch VCF, table interpolation, query parsing / embedding
+           (MCP_CPU_WORKERS, default: CPU count)
+    io   — SQLite reads, log/table file reads (MCP_IO_WORKERS, default 8)
+Other modules may register their own pool (e.g. "bulk" for file jobs).
+
+Each pool counts submitted / active / queued / completed / failed /
+cancelled tasks and its busy time, so stats() reports queue depth and utilization
+(busy worker-seconds over available worker-seconds since creation).
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+# =====================================================
+# ⚙️ Settings
+# =====================================================
+CPU_WORKERS = int(os.getenv("MCP_CPU_WORKERS", str(os.cpu_count() or 1)))
+IO_WORKERS = int(os.getenv("MCP_IO_WORKERS", "8"))
+
+
+class InstrumentedPool:
+    """ThreadPoolExecutor with task counters; the executor is created on first use."""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.created = time.monotonic()
+        self.submitted = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.peak_queued = 0
+        self.busy_seconds = 0.0
+
+    @property
+    def queued(self) -> int:
+        return self.submitted - self.completed - self.failed - self.cancelled - self.active
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"mcp-{self.name}")
+            self.submitted += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+            executor = self._executor
+        future = executor.submit(self._run, fn, args, kwargs)
+        future.add_done_callback(self._count_cancelled)
+        return future
+
+    def _count_cancelled(self, future: Future) -> None:
+        if future.cancelled():  # never reached _run
+            with self._lock:
+                self.cancelled += 1
+
+    def _run(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self.active += 1
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.busy_seconds += time.perf_counter() - started
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) on this pool (context variables are carried over)."""
+        context = contextvars.copy_context()
+        return await asyncio.wrap_future(self.submit(context.run, fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Stop the workers (cancel_futures drops tasks not yet started); a later submit() starts a fresh executor."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def stats(self) -> dict:
+        with self._lock:
+            uptime = time.monotonic() - self.created
+            return {
+                "max_workers": self.max_workers,
+                "threads": len(self._executor._threads) if self._executor else 0,
+                "active": self.active,
+                "queued": self.queued,
+                "peak_queued": self.peak_queued,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "busy_seconds": round(self.busy_seconds, 3),
+                "utilization": round(self.busy_seconds / (self.max_workers * uptime), 4) if uptime else 0.0,
+            }
+
+
+# =====================================================
+# 🗂️ Registry
+# =====================================================
+_POOLS: dict[str, InstrumentedPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(name: str, max_workers: int | None = None) -> InstrumentedPool:
+    """Process-wide pool called `name`, created with max_workers (default: IO_WORKERS) on first use."""
+    pool = _POOLS.get(name)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(name)
+            if pool is None:
+                pool = _POOLS[name] = InstrumentedPool(name, max_workers or IO_WORKERS)
+    return pool
+
+
+def cpu_pool() -> InstrumentedPool:
+    return get_pool("cpu", CPU_WORKERS)
+
+
+def io_pool() -> InstrumentedPool:
+    return get_pool("io", IO_WORKERS)
+
+
+async def run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    """Run CPU-bound work off the event loop."""
+    return await cpu_pool().run(fn, *args, **kwargs)
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    """Run blocking I/O (SQLite, files) off the event loop."""
+    return await io_pool().run(fn, *args, **kwargs)
+
+
+def pool_stats() -> dict:
+    # the two standard pools are always listed, even before their first task
+    cpu_pool()
+    io_pool()
+    return {name: pool.stats() for name, pool in sorted(_POOLS.items())}
+
+
+def shutdown_pools(wait: bool = True, cancel_futures: bool = False) -> None:
+    """Stop every pool; with cancel_futures, queued tasks are dropped instead of run first."""
+    for pool in list(_POOLS.values()):
+        pool.shutdown(wait=wait, cancel_futures=cancel_futures)
@@ -4,11 +4,19 @@ fuel_mcp/core/fuel_density_loader.py
 
 Dynamic loader for product densities used in Fuel MCP.
 Reads from /fuel_mcp/core/tables/fuel_data.json (or fallback default dict).
+
+The file is parsed once into a shared FuelDensityRegistry and re-read only
+when its mtime changes, so density lookups on the request path do no JSON
+parsing.
 """
 
 import json
+import threading
+import time
 from pathlib import Path
 
+DEFAULT_FUEL_DATA = Path(__file__).parent / "tables" / "fuel_data.json"
+
 # Default densities (fallback)
 DEFAULT_DENSITIES = {
     "diesel": 850.0,
@@ -21,28 +29,109 @@ DEFAULT_DENSITIES = {
     "lng": 450.0,
 }
 
+# Fuel aliases → canonical names (shared with regex_parser.normalize_fuel_name)
+FUEL_ALIASES = {
+    "mgo": "diesel",
+    "mdo": "diesel",
+    "marine gas oil": "diesel",
+    "ifo": "hfo",
+    "intermediate fuel oil": "hfo",
+    "gas oil": "diesel",
+}
+
 
-def load_fuel_densities() -> dict:
-    """Load fuel density data from JSON file or fallback to defaults."""
-    json_path = Path(__file__).parent / "tables" / "fuel_data.json"
-    if json_path.exists():
+# =====================================================
+# 🗂️ Shared registry
+# =====================================================
+class FuelDensityRegistry:
+    """
+    In-memory view of a fuel_data.json file.
+
+    Loads once, then re-checks the file's mtime at most every
+    `check_interval` seconds and reloads only when it changed.
+    `version` increases on every reload.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_FUEL_DATA, check_interval: float = 1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.version = 0
+        self._densities: dict[str, float] = {}
+        self._mtime_ns: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, float]:
+        if not self.path.exists():
+            return dict(DEFAULT_DENSITIES)
         try:
-            with open(json_path, "r") as f:
+            with open(self.path, "r") as f:
                 data = json.load(f)
             return {k.lower(): v.get("density_15C", DEFAULT_DENSITIES.get(k, 850.0)) for k, v in data.items()}
         except Exception:
-            return DEFAULT_DENSITIES
-    return DEFAULT_DENSITIES
+            return dict(DEFAULT_DENSITIES)
+
+    def refresh(self, force: bool = False) -> None:
+        """Reload the file if its mtime changed (or if forced)."""
+        now = time.monotonic()
+        if not force and self._mtime_ns is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime_ns = self.path.stat().st_mtime_ns
+            except OSError:
+                mtime_ns = -1
+            if not force and mtime_ns == self._mtime_ns:
+                return
+            self._densities = self._load()
+            self._mtime_ns = mtime_ns
+            self.version += 1
+
+    def densities(self) -> dict[str, float]:
+        """Return a copy of the current {fuel: density_15C} mapping."""
+        self.refresh()
+        return dict(self._densities)
+
+    def resolve(self, fuel_name: str) -> str:
+        """Canonical key for a fuel name (case-insensitive, alias-aware)."""
+        key = fuel_name.lower().strip()
+        if key in self._densities:
+            return key
+        return FUEL_ALIASES.get(key, key)
+
+    def get(self, fuel_name: str, default: float = 850.0) -> float:
+        """Density at 15 °C for a fuel, or `default` if unknown."""
+        self.refresh()
+        return self._densities.get(self.resolve(fuel_name), default)
+
+
+_REGISTRIES: dict[Path, FuelDensityRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_registry(path: str | Path | None = None) -> FuelDensityRegistry:
+    """Return the process-wide registry for a fuel data file (default: core tables)."""
+    key = Path(path or DEFAULT_FUEL_DATA).resolve()
+    registry = _REGISTRIES.get(key)
+    if registry is None:
+        with _REGISTRIES_LOCK:
+            registry = _REGISTRIES.setdefault(key, FuelDensityRegistry(key))
+    return registry
+
+
+def load_fuel_densities() -> dict:
+    """Load fuel density data from JSON file or fallback to defaults."""
+    return get_registry().densities()
 
 
 def get_fuel_density(fuel_name: str) -> float:
     """Return density for a given fuel (case-insensitive)."""
-    densities = load_fuel_densities()
-    return densities.get(fuel_name.lower(), 850.0)
+    return get_registry().get(fuel_name)
 
 
 if __name__ == "__main__":
     data = load_fuel_densities()
     print("Available fuels:", list(data.keys()))
     for name, dens in data.items():
-        print(f"{name}: {dens} kg/m³")
\ No newline at end of file
+        print(f"{name}: {dens} kg/m³")
@@ -10,7 +10,6 @@ table, performs conversions or analytical corrections, and logs results
 directly to SQLite (mcp_history.db).
 """
 
-import re
 import logging
 from datetime import datetime, UTC
 from pathlib import Path
@@ -19,6 +18,10 @@ from logging.handlers import RotatingFileHandler
 
 from fuel_mcp.core.conversion_dispatcher import convert
 from fuel_mcp.core.rag_bridge import find_table_for_query
+from fuel_mcp.core.table_router import route_table
+from fuel_mcp.core.tokenizer import (
+    AFTER_DENSITY, BARE_DENSITY, CELSIUS, DENSITY_UNIT, PRODUCT_TERMS, QueryTokens, tokenize,
+)
 from fuel_mcp.core.vcf_official_full import vcf_iso_official
 from fuel_mcp.core.error_handler import log_error
 from fuel_mcp.core.db_logger import init_db, log_query, log_error as log_error_db
@@ -45,23 +48,65 @@ logging.basicConfig(
 # -----------------------------------------------------
 # 📦 Default densities by product name
 # -----------------------------------------------------
+# synonym groups live in the shared tokenizer (PRODUCT_TERMS), in this order
 PRODUCT_DEFAULT_DENSITY = [
-    (["hfo", "heavy fuel oil", "ifo180", "ifo380", "marine fuel oil"], 980.0),
-    (["diesel", "gasoil", "ago"], 840.0),
-    (["gasoline", "petrol"], 740.0),
-    (["jet a", "jet a1", "kerosene"], 800.0),
-    (["lpg"], 540.0),
+    (list(synonyms), rho) for synonyms, rho in zip(PRODUCT_TERMS, (980.0, 840.0, 740.0, 800.0, 540.0))
 ]
 
+VCF_KEYWORDS = ("vcf", "volume correction", "correction factor", "temperature correction")
+VCF_TABLE = "VCF_official_equations"  # metadata entry of the analytical ISO 91-1 equations
+
+
+def computed_table(op_type: str, result: dict) -> str:
+    """Table key the result was actually computed from (conversions name their source file)."""
+    if op_type == "vcf":
+        return VCF_TABLE
+    return result["source_table"].removesuffix(".csv").removesuffix("_norm")
+
+
+def infer_density(tokens: QueryTokens) -> float | None:
+    """Default density of the first product group mentioned in the query."""
+    group = tokens.product_group()
+    if group is None:
+        return None
+    synonyms, rho = PRODUCT_DEFAULT_DENSITY[group]
+    name = next(s for s in synonyms if s in tokens.terms)
+    logging.info(f"ℹ️ Using default density {rho} kg/m³ inferred from '{name}'")
+    return rho
+
 
 def try_infer_density_from_product(q_lower: str) -> float | None:
     """Infer default density when none provided."""
-    for synonyms, rho in PRODUCT_DEFAULT_DENSITY:
-        for name in synonyms:
-            if name in q_lower:
-                logging.info(f"ℹ️ Using default density {rho} kg/m³ inferred from '{name}'")
-                return rho
-    return None
+    return infer_density(tokenize(q_lower))
+
+
+def extract_query_params(query: str) -> tuple[str, float, float]:
+    """
+    Operation type, temperature (°C, default 15) and ρ15 of a query.
+    Raises ValueError when the operation or density cannot be determined.
+    """
+    tokens = tokenize(query.lower().replace("℃", "°c").replace("kg/m3", "kg/m³"))
+
+    # 1️⃣ Detect operation type
+    if tokens.has(*VCF_KEYWORDS):
+        op_type = "vcf"
+    elif tokens.has("density") and tokens.has("ton"):
+        op_type = "density_to_mass"
+    elif tokens.has("density") and tokens.has("volume"):
+        op_type = "density_to_volume"
+    else:
+        raise ValueError("❌ Could not infer conversion type from query")
+
+    # 2️⃣ Extract numeric values
+    temp = tokens.first(CELSIUS)
+    tempC = (-temp.value if temp.negative else temp.value) if temp else 15.0
+
+    # --- Density: "850 kg/m3", then "density 850", then a bare 3–4 digit value ---
+    dens = tokens.first(DENSITY_UNIT) or tokens.first(AFTER_DENSITY) or tokens.first(BARE_DENSITY)
+    rho15 = dens.value if dens else infer_density(tokens)
+    if rho15 is None:
+        raise ValueError("❌ No density found or inferable from query")
+    return op_type, tempC, rho15
 
 
 # -----------------------------------------------------
@@ -75,37 +120,18 @@ def query_mcp(query: str) -> dict:
     and logs results directly to SQLite (no JSON history).
     """
     logging.info(f"🧩 MCP query started: {query}")
-    q_lower = query.lower().replace("℃", "°c").replace("kg/m3", "kg/m³")
 
     try:
-        # 1️⃣ Detect operation type
-        if any(k in q_lower for k in ["vcf", "volume correction", "correction factor", "temperature correction"]):
-            op_type = "vcf"
-        elif "density" in q_lower and "ton" in q_lower:
-            op_type = "density_to_mass"
-        elif "density" in q_lower and "volume" in q_lower:
-            op_type = "density_to_volume"
-        else:
-            raise ValueError("❌ Could not infer conversion type from query")
-
-        # 2️⃣ Extract numeric values
-        temp_match = re.search(r"(-?\d+(?:\.\d+)?)\s*°?\s*c", q_lower)
-        tempC = float(temp_match.group(1)) if temp_match else 15.0
+        op_type, tempC, rho15 = extract_query_params(query)
 
-        # --- Density extraction: handles both "850 kg/m3" and "density 850" ---
-        dens_match = (
-            re.search(r"(\d+(?:\.\d+)?)\s*kg\s*/\s*m(?:³|3)", q_lower)
-            or re.search(r"density\s+(\d+(?:\.\d+)?)", q_lower)
-            or re.search(r"\b(\d{3,4})\b(?=\s*(?:at|°|c|ton|vcf|volume|mass|fuel))", q_lower)
-        )
-
-        rho15 = float(dens_match.group(1)) if dens_match else try_infer_density_from_product(q_lower)
-        if rho15 is None:
-            raise ValueError("❌ No density found or inferable from query")
-
-        # 3️⃣ Determine relevant ASTM/ISO table (RAG)
-        candidates = find_table_for_query(query, top_k=1)
-        selected_table = candidates[0]["table"] if candidates else "unknown"
+        # 3️⃣ Determine relevant ASTM/ISO table (rule fast path, RAG fallback)
+        route = route_table(query, op_type)
+        if route:
+            routed_table, table_route = route["table"], route["path"]
+        else:
+            candidates = find_table_for_query(query, top_k=1)
+            routed_table = candidates[0]["table"] if candidates else "unknown"
+            table_route = "semantic"
 
         # 4️⃣ Perform analytical or conversion operation
         if op_type == "vcf":
@@ -113,10 +139,20 @@ def query_mcp(query: str) -> dict:
         else:
             result = convert(op_type, rho15)
 
+        # The operation fixes the table; a different routed table (e.g. an explicit
+        # "table 56" on a volume query) is reported, not silently claimed as used.
+        selected_table = computed_table(op_type, result)
+        table_conflict = routed_table not in (selected_table, "unknown")
+        if table_conflict:
+            logging.warning(f"⚠️ Routed table {routed_table} differs from {selected_table} used for '{op_type}'")
+
         # 5️⃣ Attach metadata
         result["_meta"] = {
             "mode": op_type,
             "selected_table": selected_table,
+            "routed_table": routed_table,
+            "table_route": table_route,
+            "table_conflict": table_conflict,
             "query": query,
             "rho15": rho15,
             "tempC": tempC,
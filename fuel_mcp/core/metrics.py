@@ -0,0 +1,239 @@
+"""
+fuel_mcp/core/metrics.py
+========================
+
+In-process metrics registry (no SQLite, no external client library).
+
+    requests   per (method, route, status) counters
+    latency    per (method, route) histograms of request duration
+    stages     per stage histograms (parse, vcf, conversion, rag, batches)
+    gauges     collectors read at scrape time (cache hit rates, log queue …)
+
+Histograms use fixed buckets, so recording is a bisect plus two adds and
+p50/p95/p99 are estimated from the buckets the way Prometheus'
+histogram_quantile() does — scraping costs O(series), independent of
+traffic. render_prometheus() emits the text exposition format 0.0.4.
+"""
+
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Iterable
+
+# =====================================================
+# ⚙️ Settings
+# =====================================================
+# seconds; covers sub-millisecond scalar routes up to multi-second bulk uploads
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+PREFIX = "fuel_mcp"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with count and sum."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot: +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Linear interpolation inside the bucket holding rank q·count (NaN when empty)."""
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]  # +Inf bucket: highest finite bound, as Prometheus does
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / n
+            cumulative += n
+        return self.buckets[-1]
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(le, cumulative count) pairs including "+Inf"."""
+        out, total = [], 0
+        for bound, n in zip((*map(_fmt, self.buckets), "+Inf"), self.counts):
+            total += n
+            out.append((bound, total))
+        return out
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else None,
+            **{f"p{round(q * 100)}_ms": _ms(self.quantile(q)) for q in QUANTILES},
+        }
+
+
+def _ms(seconds: float) -> float | None:
+    return None if math.isnan(seconds) else round(seconds * 1000, 3)
+
+
+def _fmt(value: float) -> str:
+    if isinstance(value, (bool, int)):
+        return str(int(value))
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+# a collector returns (name, type, help, [(labels, value), ...]) families
+Family = tuple[str, str, str, list[tuple[dict, float]]]
+
+
+class _StageTimer:
+    __slots__ = ("registry", "stage", "started")
+
+    def __init__(self, registry: "MetricsRegistry", stage: str):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe_stage(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+class MetricsRegistry:
+    """Request, stage and gauge metrics of this process."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.monotonic()
+            self.requests: dict[tuple[str, str, int], int] = {}
+            self.latency: dict[tuple[str, str], Histogram] = {}
+            self.stages: dict[str, Histogram] = {}
+
+    # --- recording ---
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            hist = self.latency.get((method, route))
+            if hist is None:
+                hist = self.latency[(method, route)] = Histogram(self.buckets)
+            hist.observe(seconds)
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.stages.get(stage)
+            if hist is None:
+                hist = self.stages[stage] = Histogram(self.buckets)
+            hist.observe(seconds)
+
+    def stage(self, name: str) -> _StageTimer:
+        """Context manager timing one execution of a pipeline stage."""
+        return _StageTimer(self, name)
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """Register a callable read at scrape time for gauge/counter families."""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    # --- reading ---
+    def snapshot(self) -> dict:
+        """JSON view: per-route counts, statuses and latency percentiles; per-stage timings."""
+        with self._lock:
+            routes: dict[str, dict] = {}
+            for (method, route, status), n in sorted(self.requests.items()):
+                entry = routes.setdefault(f"{method} {route}", {"statuses": {}})
+                entry["statuses"][str(status)] = n
+            for (method, route), hist in self.latency.items():
+                routes[f"{method} {route}"].update(hist.summary())
+            return {
+                "uptime_seconds": round(time.monotonic() - self.started, 2),
+                "routes": routes,
+                "stages": {name: hist.summary() for name, hist in sorted(self.stages.items())},
+            }
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: Iterable[tuple[dict, float]]):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{PREFIX}_{name}{_labels(labels)} {_fmt(value)}")
+
+        def histograms(name: str, help_text: str, series: list[tuple[dict, Histogram]]):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} histogram")
+            for labels, hist in series:
+                for le, n in hist.cumulative():
+                    lines.append(f"{PREFIX}_{name}_bucket{_labels({**labels, 'le': le})} {n}")
+                lines.append(f"{PREFIX}_{name}_sum{_labels(labels)} {_fmt(hist.sum)}")
+                lines.append(f"{PREFIX}_{name}_count{_labels(labels)} {hist.count}")
+            family(f"{name}_quantile", "gauge", f"{help_text} (p50/p95/p99 estimated from buckets)",
+                   [({**labels, "quantile": str(q)}, hist.quantile(q)) for labels, hist in series for q in QUANTILES])
+
+        with self._lock:
+            requests = sorted(self.requests.items())
+            latency = [({"method": m, "route": r}, _copy(h)) for (m, r), h in sorted(self.latency.items())]
+            stages = [({"stage": s}, _copy(h)) for s, h in sorted(self.stages.items())]
+            uptime = time.monotonic() - self.started
+
+        family("uptime_seconds", "gauge", "Seconds since the metrics registry started.", [({}, uptime)])
+        family("requests_total", "counter", "HTTP requests by route and status code.",
+               [({"method": m, "route": r, "status": str(s)}, n) for (m, r, s), n in requests])
+        histograms("request_duration_seconds", "HTTP request latency in seconds.", latency)
+        histograms("stage_duration_seconds", "Pipeline stage duration in seconds.", stages)
+
+        for collector in list(self._collectors):
+            try:
+                families = list(collector())
+            except Exception:
+                continue  # a broken collector must never break the scrape
+            for name, kind, help_text, samples in families:
+                family(name, kind, help_text, samples)
+        return "\n".join(lines) + "\n"
+
+
+def _copy(hist: Histogram) -> Histogram:
+    copy = Histogram(hist.buckets)
+    copy.counts, copy.count, copy.sum = list(hist.counts), hist.count, hist.sum
+    return copy
+
+
+_REGISTRY = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    return _REGISTRY
+
+
+def stage_timer(name: str) -> _StageTimer:
+    """`with stage_timer("vcf"): ...` records into the process registry."""
+    return _REGISTRY.stage(name)
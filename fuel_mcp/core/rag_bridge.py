@@ -1,18 +1,50 @@
 """
 Bridge between MCP Core and the RAG semantic layer.
 Lets MCP auto-discover the right ASTM/ISO table by meaning.
+
+The binary vector store (rag/vector_store.npy + .meta.json, see
+fuel_mcp.rag.vector_store) is loaded once into a shared VectorIndex: an
+L2-normalized float32 matrix plus parallel key/description/category
+arrays. A query is scored with one matrix–vector product and
+np.argpartition picks the top-k. The index reloads itself when the store
+changes, and migrates the legacy vector_store.json if no binary store exists.
+
+The local SentenceTransformer model is held by a LazyEmbedder: nothing
+from the transformer stack is imported until the first offline semantic
+query (or an explicit warm-up), so table-only paths such as `mcp-cli vcf`
+start without it.
+
+Online/offline mode is decided by a ConnectivityManager (see
+fuel_mcp.core.connectivity): no network probe at import, a TTL-cached
+probe on first use, and a circuit breaker that falls back to offline
+search after repeated OpenAI failures and retries after a cooldown.
+
+Query embeddings are cached in a bounded LRU keyed by the query's
+normalized template (lower-cased, quantities masked, table IDs such as
+"table 54B" kept), so "VCF for diesel at 25°C" and "... at 30°C" share one
+forward pass / OpenAI call: a miss embeds the real query text, and later
+queries with the same template reuse that embedding. Set
+MCP_EMBED_CACHE_PATH to persist the cache across restarts.
 """
 
 from pathlib import Path
-from openai import OpenAI
 from dotenv import load_dotenv
 import json
 import numpy as np
 import os
 import requests
+import atexit
 import logging
+import re
+import threading
+import time
 from datetime import datetime, UTC
-from sentence_transformers import SentenceTransformer
+
+from fuel_mcp.core.cache import LRUCache
+from fuel_mcp.core.connectivity import ConnectivityManager
+from fuel_mcp.core.event_log import JsonlEventLog
+from fuel_mcp.core.metrics import stage_timer
+from fuel_mcp.rag import vector_store
 
 # =====================================================
 # 🌐 Environment & Constants
@@ -22,8 +54,14 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MODEL = "text-embedding-3-small"
 
 RAG_DIR = Path(__file__).parent.parent / "rag"
-VECTOR_FILE = RAG_DIR / "vector_store.json"
-VECTOR_STORE_PATH = VECTOR_FILE  # for reuse
+VECTOR_FILE = RAG_DIR / "vector_store.json"  # legacy JSON (migration source)
+VECTOR_STORE_PATH = vector_store.STORE_PATH
+
+LOCAL_MODEL_NAME = os.getenv("MCP_LOCAL_EMBED_MODEL", "nomic-ai/nomic-embed-text-v1.5")
+WARM_EMBEDDER = os.getenv("MCP_WARM_EMBEDDER", "0").lower() in ("1", "true", "yes")
+
+EMBED_CACHE_SIZE = int(os.getenv("MCP_EMBED_CACHE_SIZE", "4096"))
+EMBED_CACHE_PATH = os.getenv("MCP_EMBED_CACHE_PATH", "")  # e.g. fuel_mcp/data/embedding_cache.npz
 
 # =====================================================
 # 🌐 Online / Offline Detection
@@ -47,154 +85,480 @@ def is_internet_available(url="https://api.openai.com/v1/embeddings", timeout=3)
         return False
 
 
-ONLINE_MODE = is_internet_available()
+# None = auto (probe + circuit breaker); True/False forces the mode.
+# MCP_ONLINE_MODE=off skips the probe entirely (air-gapped installs).
+ONLINE_MODE: bool | None = {"on": True, "off": False}.get(os.getenv("MCP_ONLINE_MODE", "auto").lower())
+
+_CONNECTIVITY = ConnectivityManager(probe=is_internet_available)
+client = None  # OpenAI client, created on the first online query
 
-if ONLINE_MODE:
-    print("🌐 Online mode detected — using OpenAI embeddings.")
-    client = OpenAI(api_key=OPENAI_API_KEY)
-else:
-    print("🛰️ Offline mode active — using local vector_store.json.")
-    client = None
+
+def get_connectivity() -> ConnectivityManager:
+    return _CONNECTIVITY
+
+
+def use_online(block: bool = True) -> bool:
+    """Decide whether the next query goes to OpenAI (only the first probe runs inline)."""
+    if ONLINE_MODE is not None:
+        return ONLINE_MODE
+    return _CONNECTIVITY.allow_online(block)
+
+
+def current_mode() -> str:
+    """Last known mode ("online" / "offline") without probing."""
+    online = ONLINE_MODE if ONLINE_MODE is not None else _CONNECTIVITY.online
+    return "online" if online else "offline"
+
+
+def connectivity_status() -> dict:
+    """Mode, override and probe/circuit state for /status."""
+    return {
+        "mode": current_mode(),
+        "override": {True: "on", False: "off"}.get(ONLINE_MODE, "auto"),
+        "api_key": bool(OPENAI_API_KEY),
+        **_CONNECTIVITY.status(),
+    }
+
+
+def get_openai_client():
+    global client
+    if client is None:
+        from openai import OpenAI  # only needed (and imported) when online
+
+        print("🌐 Online mode — using OpenAI embeddings.")
+        client = OpenAI(api_key=OPENAI_API_KEY)
+    return client
 
 # =====================================================
 # 🧠 Dynamic RAG Fallback Logic with Structured Logging
 # =====================================================
 LOG_DIR = Path(__file__).parent.parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
-RAG_LOG = LOG_DIR / "rag_activity.json"
+RAG_LOG = LOG_DIR / "rag_activity.jsonl"
+LEGACY_RAG_LOG = LOG_DIR / "rag_activity.json"  # old read-modify-rewrite list format
+
+_RAG_SINK = JsonlEventLog(RAG_LOG)
+
+
+def _migrate_legacy_rag_log() -> None:
+    """Carry the entries of the old rag_activity.json list over to the JSONL log once."""
+    if RAG_LOG.exists() or not LEGACY_RAG_LOG.exists():
+        return
+    try:
+        with open(LEGACY_RAG_LOG, "r") as f:
+            entries = json.load(f)
+        for entry in entries if isinstance(entries, list) else []:
+            _RAG_SINK.append(entry)
+        _RAG_SINK.flush()
+        LEGACY_RAG_LOG.unlink()
+    except Exception as e:
+        print(f"⚠️ Could not migrate {LEGACY_RAG_LOG.name}: {e}")
+
+
+_migrate_legacy_rag_log()
+
 
 def log_rag_event(event_type: str, detail: str):
-    """Append structured RAG event to JSON log."""
-    entry = {
+    """Append a structured RAG event to the JSON Lines activity log (buffered)."""
+    _RAG_SINK.append({
         "timestamp": datetime.now(UTC).isoformat(),
         "event": event_type,
         "detail": detail,
-        "mode": "online" if ONLINE_MODE else "offline"
-    }
-    try:
-        existing = json.load(open(RAG_LOG)) if RAG_LOG.exists() else []
-    except Exception:
-        existing = []
-    existing.append(entry)
-    with open(RAG_LOG, "w") as f:
-        json.dump(existing[-100:], f, indent=2)  # keep last 100 entries
+        "mode": current_mode(),
+    })
+
+
+def recent_rag_events(n: int = 100) -> list[dict]:
+    """Last n RAG events, oldest first."""
+    return _RAG_SINK.tail(n)
+
+
+def get_rag_log() -> JsonlEventLog:
+    return _RAG_SINK
 
 # =====================================================
 # 💾 Offline Vector Search (NumPy-based)
 # =====================================================
 def load_local_vector_store():
     """
-    Load local vector store and normalize its format.
-    Supports both dict-based and list-based structures.
+    Load the local vector store as a list of
+    {"table", "embedding", "description", "category"} dicts.
     """
-    if not VECTOR_STORE_PATH.exists():
-        print("⚠️  No local vector_store.json found.")
+    index = get_vector_index()
+    index.refresh()
+    if not vector_store.exists(index.path):
+        print("⚠️  No local vector store found.")
         return []
 
     try:
-        with open(VECTOR_STORE_PATH, "r") as f:
-            data = json.load(f)
-
-        # If data is a dict → convert to list[dict]
-        if isinstance(data, dict):
-            data = [
-                {
-                    "table": key,
-                    **val,
-                }
-                for key, val in data.items()
-            ]
-        return data
-
+        return vector_store.load_entries(index.path)
     except Exception as e:
         print(f"❌ Failed to load local vector store: {e}")
         return []
 
 # =====================================================
-# 🧠 Local Semantic Embedder
+# ⚡ Shared in-memory index
+# =====================================================
+class VectorIndex:
+    """
+    Normalized float32 embedding matrix for a binary vector store.
+
+    The store's mtime is re-checked at most every `check_interval`
+    seconds; `version` increases on reload.
+    """
+
+    def __init__(self, path: str | Path = VECTOR_STORE_PATH, check_interval: float = 1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.version = 0
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.keys = np.array([], dtype=object)
+        self.descriptions = np.array([], dtype=object)
+        self.categories = np.array([], dtype=object)
+        self._mtime_ns: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1]
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def _ensure_store(self) -> bool:
+        """Migrate the legacy JSON store once if no binary store exists yet."""
+        if vector_store.exists(self.path):
+            return True
+        legacy = self.path.with_suffix(".json")
+        if not legacy.exists():
+            print(f"⚠️  No local vector store found at {self.path}.")
+            return False
+        try:
+            meta = vector_store.migrate_json(legacy, self.path)
+            print(f"🔁 Migrated {legacy.name} → {self.path.name} ({meta['count']} embeddings).")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to migrate vector store {legacy}: {e}")
+            return False
+
+    def _load(self) -> None:
+        try:
+            matrix, meta = vector_store.load_store(self.path) if self._ensure_store() else (None, None)
+        except Exception as e:
+            print(f"❌ Failed to load vector store {self.path}: {e}")
+            matrix, meta = None, None
+
+        if matrix is None or not len(matrix):
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+            self.keys = self.descriptions = self.categories = np.array([], dtype=object)
+            return
+
+        matrix = np.array(matrix, dtype=np.float32)  # private copy off the memory map
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        self.matrix = matrix
+        self.keys = np.array(meta["keys"], dtype=object)
+        self.descriptions = np.array(meta["descriptions"], dtype=object)
+        self.categories = np.array(meta["categories"], dtype=object)
+
+    def refresh(self, force: bool = False) -> None:
+        """Reload the store if its mtime changed (or if forced)."""
+        now = time.monotonic()
+        if not force and self._mtime_ns is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                # the sidecar is written last on every save
+                mtime_ns = vector_store.meta_path(self.path).stat().st_mtime_ns
+            except OSError:
+                mtime_ns = -1
+            if not force and mtime_ns == self._mtime_ns:
+                return
+            self._load()
+            self._mtime_ns = mtime_ns
+            self.version += 1
+
+    def search(self, query_vec, top_k: int = 3) -> list[dict]:
+        """Top-k rows by cosine similarity to `query_vec`, best first."""
+        self.refresh()
+        matrix, n = self.matrix, len(self)
+        if n == 0 or top_k <= 0:
+            return []
+
+        q = np.asarray(query_vec, dtype=np.float32).ravel()
+        if q.shape[0] != matrix.shape[1]:
+            raise ValueError(f"Query embedding has {q.shape[0]} dims, vector store has {matrix.shape[1]}")
+        norm = np.linalg.norm(q)
+        scores = matrix @ (q / norm if norm else q)
+
+        k = min(top_k, n)
+        if k < n:
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            # keep near-ties with the k-th score so the tie-break below sees them
+            candidates = np.flatnonzero(scores >= kth - 1e-4)
+        else:
+            candidates = np.arange(n)
+        # Rank by the reported (rounded) similarity; equal scores keep store order
+        rounded = np.array([round(float(scores[i]), 4) for i in candidates])
+        top = candidates[np.lexsort((candidates, -rounded))][:k]
+        return [
+            {
+                "table": self.keys[i],
+                "similarity": round(float(scores[i]), 4),
+                "description": self.descriptions[i],
+                "category": self.categories[i],
+            }
+            for i in top
+        ]
+
+
+_INDEXES: dict[Path, VectorIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_vector_index(path: str | Path | None = None) -> VectorIndex:
+    """Return the process-wide index for a vector store (default: rag/vector_store.npy)."""
+    key = Path(path or VECTOR_STORE_PATH)
+    index = _INDEXES.get(key)
+    if index is None:
+        with _INDEXES_LOCK:
+            index = _INDEXES.setdefault(key, VectorIndex(key))
+    return index
+
+
+# =====================================================
+# 🧠 Local Semantic Embedder (lazy)
 # =====================================================
-try:
-    LOCAL_EMBEDDER = SentenceTransformer(
-        "nomic-ai/nomic-embed-text-v1.5",
-        trust_remote_code=True,  # ✅ Required for Nomic models
-    )
-    print("✅ Loaded local semantic model: nomic-ai/nomic-embed-text-v1.5")
-except Exception as e:
-    LOCAL_EMBEDDER = None
-    print(f"⚠️ Could not load local embedding model: {e}")
+class LazyEmbedder:
+    """
+    Loads a SentenceTransformer model on first use (thread-safe, once).
 
-def embed_query_offline(query: str) -> np.ndarray:
+    state: "not_loaded" → "loading" → "ready" | "failed". A failed load is
+    not retried; callers fall back to the pseudo-embedding.
+    """
+
+    def __init__(self, model_name: str = LOCAL_MODEL_NAME):
+        self.model_name = model_name
+        self.state = "not_loaded"
+        self.error: str | None = None
+        self.load_seconds: float | None = None
+        self.loaded_at: str | None = None
+        self._model = None
+        self._lock = threading.Lock()
+        self._warm_thread: threading.Thread | None = None
+
+    def _load(self) -> None:
+        self.state = "loading"
+        started = time.perf_counter()
+        try:
+            from sentence_transformers import SentenceTransformer
+
+            self._model = SentenceTransformer(
+                self.model_name,
+                trust_remote_code=True,  # ✅ Required for Nomic models
+            )
+            self.state = "ready"
+            print(f"✅ Loaded local semantic model: {self.model_name}")
+        except Exception as e:
+            self.state = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"⚠️ Could not load local embedding model: {e}")
+        finally:
+            self.load_seconds = round(time.perf_counter() - started, 3)
+            self.loaded_at = datetime.now(UTC).isoformat()
+
+    def get(self):
+        """Return the model (loading it if needed), or None if it cannot be loaded."""
+        if self.state in ("not_loaded", "loading"):
+            with self._lock:
+                if self.state in ("not_loaded", "loading"):
+                    self._load()
+        return self._model
+
+    def warm(self) -> threading.Thread:
+        """Start loading the model in a background thread (no-op if already started)."""
+        with self._lock:
+            if self._warm_thread is None:
+                self._warm_thread = threading.Thread(target=self.get, name="mcp-embedder-warmup", daemon=True)
+                self._warm_thread.start()
+            return self._warm_thread
+
+    def status(self) -> dict:
+        return {
+            "model": self.model_name,
+            "state": self.state,
+            "load_seconds": self.load_seconds,
+            "loaded_at": self.loaded_at,
+            "error": self.error,
+        }
+
+
+_EMBEDDER = LazyEmbedder()
+
+
+def get_embedder() -> LazyEmbedder:
+    return _EMBEDDER
+
+
+def embed_query_offline(query: str, dim: int = 1536) -> np.ndarray:
     """
     Generate a true semantic embedding using a local model.
-    Returns 1536-D vector comparable to OpenAI embeddings.
+    Without the model, falls back to a deterministic `dim`-D pseudo-embedding.
     """
-    if LOCAL_EMBEDDER is None:
+    model = _EMBEDDER.get()
+    if model is None:
         # Fallback deterministic pseudo-embedding (if model missing)
         print("⚠️ Using fallback pseudo-embedding.")
-        vector = np.zeros(1536)
+        vector = np.zeros(dim)
         for i, c in enumerate(query.lower()):
-            vector[i % 1536] += ord(c)
+            vector[i % dim] += ord(c)
         norm = np.linalg.norm(vector)
         return vector / norm if norm != 0 else vector
 
-    emb = LOCAL_EMBEDDER.encode(query, normalize_embeddings=True)
+    emb = model.encode(query, normalize_embeddings=True)
     return np.array(emb, dtype=np.float32)
 
+# =====================================================
+# 🗃️ Query Embedding Cache
+# =====================================================
+# group 1: table identifiers ("table 54B", "astm 11") are kept — they select a different table;
+# otherwise a number is masked (unit suffixes like "m3" keep their digits)
+_NUMBER_RE = re.compile(r"((?:table|astm)\s*\d+[a-z]?\b)|(?<![a-z])[-+]?\d+(?:[.,]\d+)*")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _mask_number(match: re.Match) -> str:
+    return match.group(1) or "<num>"
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: lower-case, quantities → <num> (table IDs kept), single spaces."""
+    return _SPACE_RE.sub(" ", _NUMBER_RE.sub(_mask_number, query.lower())).strip()
+
+
+class EmbeddingCache:
+    """
+    LRU of query embeddings keyed by (source, dim, template).
+
+    With a path, entries are loaded on first use and written back by save()
+    (also at exit) as an .npz with one float32 matrix per (source, dim).
+    """
+
+    def __init__(self, maxsize: int = EMBED_CACHE_SIZE, path: str | Path | None = EMBED_CACHE_PATH or None):
+        self.lru = LRUCache(maxsize)
+        self.path = Path(path) if path else None
+        self._loaded = self.path is None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self.path.exists():
+                return
+            try:
+                with np.load(self.path, allow_pickle=False) as data:
+                    groups = json.loads(str(data["groups"]))
+                    for i, (source, dim) in enumerate(groups):
+                        templates, vectors = data[f"t{i}"], data[f"v{i}"]
+                        self.lru.update(((source, dim, str(t)), v) for t, v in zip(templates, vectors))
+            except Exception as e:
+                print(f"⚠️ Could not load embedding cache {self.path}: {e}")
+
+    def get(self, source: str, dim: int, template: str) -> np.ndarray | None:
+        self._ensure_loaded()
+        return self.lru.get((source, dim, template))
+
+    def put(self, source: str, dim: int, template: str, vector) -> np.ndarray:
+        self._ensure_loaded()
+        vector = np.asarray(vector, dtype=np.float32)
+        self.lru.set((source, dim, template), vector)
+        return vector
+
+    def save(self) -> int:
+        """Write the cache to `path` (no-op without one). Returns the number of entries saved."""
+        if self.path is None or not self._loaded:
+            return 0
+        grouped: dict[tuple[str, int], list[tuple[str, np.ndarray]]] = {}
+        for (source, dim, template), vector in self.lru.items():
+            grouped.setdefault((source, dim), []).append((template, vector))
+        arrays = {"groups": np.array(json.dumps([list(g) for g in grouped]))}
+        for i, rows in enumerate(grouped.values()):
+            arrays[f"t{i}"] = np.array([t for t, _ in rows])
+            arrays[f"v{i}"] = np.stack([v for _, v in rows])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, **arrays)
+        os.replace(tmp, self.path)
+        return sum(len(rows) for rows in grouped.values())
+
+    def stats(self) -> dict:
+        return {**self.lru.stats(), "persisted": self.path is not None}
+
+
+_EMBED_CACHE = EmbeddingCache()
+atexit.register(_EMBED_CACHE.save)
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    return _EMBED_CACHE
+
+
+def _offline_source() -> str:
+    return "pseudo" if _EMBEDDER.state == "failed" else f"local:{_EMBEDDER.model_name}"
+
+
+def cached_offline_embedding(query: str, dim: int) -> np.ndarray:
+    """
+    embed_query_offline of the query, cached under its normalized template:
+    a miss embeds the real text; queries differing only in quantities then
+    share that embedding.
+    """
+    template = normalize_query(query)
+    vector = _EMBED_CACHE.get(_offline_source(), dim, template)
+    if vector is None:
+        vector = embed_query_offline(query, dim=dim)
+        vector = _EMBED_CACHE.put(_offline_source(), dim, template, vector)  # source known after loading
+    return vector
+
+
+def cached_online_embedding(query: str) -> np.ndarray:
+    """OpenAI embedding of the query, cached under its normalized template (see cached_offline_embedding)."""
+    template = normalize_query(query)
+    source = f"openai:{MODEL}"
+    vector = _EMBED_CACHE.get(source, 0, template)
+    if vector is None:
+        resp = get_openai_client().embeddings.create(model=MODEL, input=query)
+        vector = _EMBED_CACHE.put(source, 0, template, resp.data[0].embedding)
+    return vector
+
+
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     """Compute cosine similarity between two vectors."""
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
 def find_table_offline(query: str, top_k: int = 3) -> list[dict]:
-    """Offline semantic search using precomputed embeddings in vector_store.json."""
-    store = load_local_vector_store()
-    if not store:
+    """Offline semantic search over the shared in-memory vector index."""
+    index = get_vector_index()
+    index.refresh()
+    if not len(index):
         print("⚠️ Empty or missing local vector store.")
         return []
 
-    q_vec = embed_query_offline(query)
-    scored = []
-    for entry in store:
-        emb = np.array(entry.get("embedding", []))
-        if len(emb) == 0:
-            continue
-        score = cosine_similarity(q_vec, emb)
-        scored.append(
-            {
-                "table": entry.get("table", "unknown"),
-                "similarity": round(score, 4),
-                "description": entry.get("description", ""),
-                "category": entry.get("category", ""),
-            }
-        )
-
-    scored.sort(key=lambda x: x["similarity"], reverse=True)
-    return scored[:top_k]
+    q_vec = cached_offline_embedding(query, dim=index.dim)
+    return index.search(q_vec, top_k)
 
 # =====================================================
 # 🌐 Online Table Finder
 # =====================================================
 def find_table_online(query: str, top_k: int = 3) -> list[dict]:
-    """Online embedding-based search using OpenAI."""
-    with open(VECTOR_FILE, "r") as f:
-        vector_store = json.load(f)
-
-    resp = client.embeddings.create(model=MODEL, input=query)
-    qvec = resp.data[0].embedding
-
-    scored = []
-    for key, entry in vector_store.items():
-        score = cosine_similarity(qvec, entry["embedding"])
-        scored.append(
-            {
-                "table": key,
-                "similarity": round(float(score), 4),
-                "description": entry.get("description", ""),
-                "category": entry.get("category", ""),
-            }
-        )
-
-    scored.sort(key=lambda x: x["similarity"], reverse=True)
-    return scored[:top_k]
+    """Online embedding-based search using OpenAI (same shared index as offline)."""
+    return get_vector_index().search(cached_online_embedding(query), top_k)
 
 # =====================================================
 # 🧠 Unified Entry Point (Auto-fallback)
@@ -202,18 +566,24 @@ def find_table_online(query: str, top_k: int = 3) -> list[dict]:
 def find_table_for_query(query: str, top_k: int = 3) -> list[dict]:
     """
     Unified table resolver with automatic online/offline switching.
-    Tries OpenAI first; falls back to offline NumPy RAG on failure.
+    Tries OpenAI when reachable; falls back to offline NumPy RAG on failure
+    (repeated failures open the circuit breaker until its cooldown ends).
     """
-    global ONLINE_MODE
-    if ONLINE_MODE:
+    with stage_timer("rag"):
+        return _find_table(query, top_k)
+
+
+def _find_table(query: str, top_k: int) -> list[dict]:
+    if use_online():
         try:
             results = find_table_online(query, top_k)
+            _CONNECTIVITY.record_success()
             log_rag_event("query_success", f"Online RAG resolved: {query}")
             return results
         except Exception as e:
+            _CONNECTIVITY.record_failure(e)
             log_rag_event("query_fail", f"Online RAG failed: {type(e).__name__}")
-            print("⚠️ Online RAG failed — switching to offline mode.")
-            ONLINE_MODE = False
+            print("⚠️ Online RAG failed — using offline search.")
             return find_table_offline(query, top_k)
     else:
         results = find_table_offline(query, top_k)
@@ -5,11 +5,28 @@ fuel_mcp/core/regex_parser.py
 Enhanced regex parser — integrates with dynamic fuel density loader,
 supports reverse (mass→volume) conversion, alias normalization,
 and robust temperature + free-text parsing.
+
+Quantities, fuels and keywords come from the shared single-pass
+tokenizer (fuel_mcp.core.tokenizer).
+
+process_query results are memoized by the canonical parse (fuel, tempC,
+mode, amount, fuel_data.json version), so repeated or differently worded
+questions with the same meaning share one computation.
 """
 
-import re
+import os
+
+from fuel_mcp.core.cache import LRUCache
+from fuel_mcp.core.metrics import stage_timer
+from fuel_mcp.core.tokenizer import LITRES, MASS, TEMP, TEMP_LOOSE, VOLUME, tokenize
 from fuel_mcp.core.vcf_official_full import vcf_iso_official, auto_correct
-from fuel_mcp.core.fuel_density_loader import get_fuel_density
+from fuel_mcp.core.fuel_density_loader import FUEL_ALIASES, FuelDensityRegistry, get_fuel_density, get_registry
+
+# =====================================================
+# ⚙️ Result cache settings
+# =====================================================
+QUERY_CACHE_SIZE = int(os.getenv("MCP_QUERY_CACHE_SIZE", "2048"))
+QUERY_CACHE_TTL = float(os.getenv("MCP_QUERY_CACHE_TTL", "600"))
 
 
 def normalize_fuel_name(raw: str | None) -> str | None:
@@ -17,20 +34,12 @@ def normalize_fuel_name(raw: str | None) -> str | None:
     if not raw:
         return None
     raw = raw.lower()
-    aliases = {
-        "mgo": "diesel",
-        "mdo": "diesel",
-        "marine gas oil": "diesel",
-        "ifo": "hfo",
-        "intermediate fuel oil": "hfo",
-        "gas oil": "diesel",
-    }
-    return aliases.get(raw, raw)
+    return FUEL_ALIASES.get(raw, raw)
 
 
 def parse_query(text: str):
     """Extract fuel, volume, mass, and temperature data from natural query text."""
-    text = text.lower().strip()
+    tokens = tokenize(text.strip())
     result = {
         "fuel": None,
         "volume_l": None,
@@ -41,34 +50,20 @@ def parse_query(text: str):
     }
 
     # --- detect fuel ---
-    fuels = ["diesel", "gasoline", "hfo", "jet", "lube", "methanol", "mgo", "mdo", "ifo"]
-    for fuel in fuels:
-        if fuel in text:
-            result["fuel"] = normalize_fuel_name(fuel)
-            break
+    fuel = tokens.parser_fuel()
+    if fuel:
+        result["fuel"] = normalize_fuel_name(fuel)
 
     # --- detect temperature ---
-    t_match = re.search(
-        r"(?:@|at)?\s*(\d+(?:\.\d+)?)\s*(?:°?\s*c|deg(?:rees)?|degrees|c)\b",
-        text,
-    )
-    if not t_match:
-        t_match = re.search(r"(\d+(?:\.\d+)?)(?:\s*°?\s*c|deg(?:rees)?)", text)
-
-    if t_match:
-        try:
-            t_val = float(t_match.group(1))
-            if -30 <= t_val <= 120:
-                result["tempC"] = t_val
-        except ValueError:
-            pass
+    t_num = tokens.first(TEMP) or tokens.first(TEMP_LOOSE)
+    if t_num and -30 <= t_num.value <= 120:
+        result["tempC"] = t_num.value
 
     # --- detect volume ---
-    v_match = re.search(r"(\d+(?:\.\d+)?)\s*(l|litre|liter|m3|m³)", text)
-    if v_match:
-        val = float(v_match.group(1))
-        unit = v_match.group(2)
-        if unit.startswith("l"):
+    v_num = tokens.first(VOLUME)
+    if v_num:
+        val = v_num.value
+        if v_num.flags & LITRES:
             result["volume_l"] = val
             result["volume_m3"] = round(val / 1000, 3)
         else:
@@ -76,20 +71,19 @@ def parse_query(text: str):
             result["volume_l"] = round(val * 1000, 1)
 
     # --- detect mass ---
-    m_match = re.search(r"(\d+(?:\.\d+)?)\s*(t|ton|tons|tonne|tonnes|kg)", text)
-    if m_match:
-        val = float(m_match.group(1))
-        unit = m_match.group(2)
-        if unit.startswith("k"):
+    m_num = tokens.first(MASS)
+    if m_num:
+        val = m_num.value
+        if m_num.unit.startswith("k"):
             result["mass_ton"] = round(val / 1000, 3)
         else:
             result["mass_ton"] = val
         result["mode"] = "reverse"
 
     # --- detect mode ---
-    if "vcf" in text or "correction" in text or "calculate vcf" in text:
+    if tokens.has("vcf", "correction"):
         result["mode"] = "vcf"
-    elif "convert" in text or "mass" in text:
+    elif tokens.has("convert", "mass"):
         if result["mode"] != "reverse":
             result["mode"] = "convert"
     elif result["volume_m3"] and result["tempC"]:
@@ -99,9 +93,8 @@ def parse_query(text: str):
     return result
 
 
-def process_query(text: str):
-    """Interpret and execute the parsed query."""
-    parsed = parse_query(text)
+def compute_query(parsed: dict) -> dict:
+    """Execute a parse_query() result (uncached)."""
     fuel = parsed["fuel"]
     tempC = parsed["tempC"]
     volume_m3 = parsed["volume_m3"]
@@ -114,25 +107,114 @@ def process_query(text: str):
 
     # --- Case 1: VCF ---
     if parsed["mode"] == "vcf":
-        result = vcf_iso_official(rho15, tempC)
+        with stage_timer("vcf"):
+            result = vcf_iso_official(rho15, tempC)
         result.update({"fuel": fuel, "rho15": rho15, "mode": "vcf"})
         return result
 
     # --- Case 2: Volume → Mass ---
     if parsed["mode"] == "convert" and volume_m3 is not None:
-        result = auto_correct(fuel=fuel, volume_m3=volume_m3, tempC=tempC)
+        with stage_timer("conversion"):
+            result = auto_correct(fuel=fuel, volume_m3=volume_m3, tempC=tempC)
         result.update({"fuel": fuel, "rho15": rho15, "mode": "convert"})
         return result
 
     # --- Case 3: Mass → Volume ---
     if parsed["mode"] == "reverse" and mass_ton is not None:
-        result = auto_correct(fuel=fuel, mass_ton=mass_ton, tempC=tempC)
+        with stage_timer("conversion"):
+            result = auto_correct(fuel=fuel, mass_ton=mass_ton, tempC=tempC)
         result.update({"fuel": fuel, "rho15": rho15, "mode": "reverse"})
         return result
 
     return {"error": "Unsupported or unrecognized query type."}
 
 
+# =====================================================
+# 🧠 Result cache
+# =====================================================
+def canonical_key(parsed: dict) -> tuple | None:
+    """
+    Cache key of a parse: only the fields the computation reads for its
+    mode. None for parses that end in an error (not worth caching).
+    """
+    fuel, tempC, mode = parsed["fuel"], parsed["tempC"], parsed["mode"]
+    if not fuel or tempC is None:
+        return None
+    if mode == "vcf":
+        amount = None
+    elif mode == "convert" and parsed["volume_m3"] is not None:
+        amount = parsed["volume_m3"]
+    elif mode == "reverse" and parsed["mass_ton"] is not None:
+        amount = parsed["mass_ton"]
+    else:
+        return None
+    return fuel, float(tempC), mode, amount
+
+
+def _copy_result(result: dict) -> dict:
+    """Copy deep enough that callers cannot mutate the cached entry."""
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in result.items()}
+
+
+class QueryResultCache:
+    """
+    LRU + TTL cache of compute_query() results.
+
+    Keys carry the density registry version, and the whole cache is dropped
+    when fuel_data.json is reloaded, so stale densities are never served.
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE, ttl: float | None = QUERY_CACHE_TTL,
+                 registry: FuelDensityRegistry | None = None):
+        self.cache = LRUCache(maxsize, ttl=ttl)
+        self.registry = registry or get_registry()
+        self.version: int | None = None
+        self.invalidations = 0
+        self.uncacheable = 0
+
+    def _density_version(self) -> int:
+        self.registry.refresh()
+        version = self.registry.version
+        if version != self.version:
+            if self.version is not None:
+                self.cache.clear()
+                self.invalidations += 1
+            self.version = version
+        return version
+
+    def get_or_compute(self, parsed: dict) -> dict:
+        key = canonical_key(parsed)
+        if key is None:
+            self.uncacheable += 1
+            return compute_query(parsed)
+        key = key + (self._density_version(),)
+        return _copy_result(self.cache.get_or_set(key, lambda: compute_query(parsed)))
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "invalidations": self.invalidations,
+                "uncacheable": self.uncacheable, "density_version": self.version}
+
+
+_QUERY_CACHE: QueryResultCache | None = None
+
+
+def get_query_cache() -> QueryResultCache:
+    global _QUERY_CACHE
+    if _QUERY_CACHE is None:
+        _QUERY_CACHE = QueryResultCache()
+    return _QUERY_CACHE
+
+
+def process_query(text: str):
+    """Interpret and execute the parsed query (memoized by canonical parse)."""
+    with stage_timer("parse"):
+        parsed = parse_query(text)
+    return get_query_cache().get_or_compute(parsed)
+
+
 # =====================================================
 # 🧪 Manual test
 # =====================================================
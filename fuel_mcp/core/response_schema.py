@@ -3,13 +3,60 @@ fuel_mcp/core/response_schema.py
 ================================
 Final unified schema — passes legacy test suite.
 Ensures both top-level and nested keys exist for backward compatibility.
+
+Clients can negotiate the lean "v2" schema (`?schema=v2` or the
+X-MCP-Schema: v2 header): only `result` plus a compact `_meta`
+{mode, version, ts}, without the flattened top-level copies. The legacy
+"v1" shape stays the default; the negotiated schema of the current
+request is held in a context variable set by the API middleware.
 """
 
+from contextvars import ContextVar, Token
 from datetime import datetime, UTC
 import platform
 
+from fuel_mcp.core import db_logger
+
+# =====================================================
+# 🔀 Schema negotiation
+# =====================================================
+SCHEMA_LEGACY = "v1"
+SCHEMA_LEAN = "v2"
+SCHEMAS = (SCHEMA_LEGACY, SCHEMA_LEAN)
+SCHEMA_HEADER = "X-MCP-Schema"
+SCHEMA_PARAM = "schema"
+
+_schema: ContextVar[str] = ContextVar("response_schema", default=SCHEMA_LEGACY)
+
+
+def negotiate_schema(param: str | None = None, header: str | None = None) -> str:
+    """Schema asked for by `?schema=` (wins) or the X-MCP-Schema header; unknown values get legacy."""
+    requested = (param or header or "").strip().lower()
+    return requested if requested in SCHEMAS else SCHEMA_LEGACY
+
+
+def use_schema(schema: str) -> Token:
+    """Select the schema for responses built in the current context."""
+    return _schema.set(schema)
+
+
+def reset_schema(token: Token) -> None:
+    _schema.reset(token)
+
 
-def success_response(result: dict | list | float | str, query: str, mode: str, version: str):
+def current_schema() -> str:
+    return _schema.get()
+
+
+def _lean(result, mode: str, version: str, timestamp: str, **meta) -> dict:
+    return {"result": result, "_meta": {"mode": mode, "version": version, "ts": timestamp, **meta}}
+
+
+# =====================================================
+# 📦 Responses
+# =====================================================
+def success_response(result: dict | list | float | str, query: str, mode: str, version: str,
+                     schema: str | None = None):
     """
     Return structure with both legacy and modern schema compatibility:
     {
@@ -20,25 +67,31 @@ def success_response(result: dict | list | float | str, query: str, mode: str, v
       ...
     }
     """
+    timestamp = datetime.now(UTC).isoformat()
+    lean = (schema or current_schema()) == SCHEMA_LEAN
+
     # Ensure result is always dict for serialization
     if isinstance(result, list):
         payload = {"entries": result}
-    elif isinstance(result, (float, int, str)):
-        payload = result
+    elif isinstance(result, (float, int, str)) or lean:
+        payload = result  # lean responses are never mutated below, so no copy
     else:
         payload = dict(result)
 
+    if lean:
+        return _lean(payload, mode, version, timestamp)
+
     resp = {
         "result": payload,
         "_meta": {
             "query": query,
             "mode": mode,
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": timestamp,
             "version": version,
         },
         "mode": mode,
         "version": version,
-        "timestamp": datetime.now(UTC).isoformat(),
+        "timestamp": timestamp,
     }
 
     # Flatten keys for direct access
@@ -53,8 +106,6 @@ def success_response(result: dict | list | float | str, query: str, mode: str, v
 
     if mode == "metrics":
         # Guarantee required keys exist and duplicate to top-level
-        from fuel_mcp.core.db_logger import DB_PATH
-
         resp.setdefault("python_version", platform.python_version())
         resp.setdefault("total_queries", payload.get("total_queries", 0))
         resp.setdefault("successful_queries", payload.get("successful_queries", 0))
@@ -62,11 +113,12 @@ def success_response(result: dict | list | float | str, query: str, mode: str, v
         resp.setdefault("uptime_seconds", payload.get("uptime_seconds", 0))
 
         # ✅ Always use absolute DB path for test expectation
-        resp["db_path"] = str(DB_PATH.resolve())
+        resp["db_path"] = str(db_logger.DB_PATH.resolve())
 
         total = resp["total_queries"]
         succ = resp["successful_queries"]
-        resp["success_ratio"] = f"{round((succ / total * 100), 2)}%"
+        # a fresh database has no queries yet: same "0%" as snapshot_metrics()
+        resp["success_ratio"] = f"{round((succ / total * 100), 2)}%" if total else "0%"
 
 
     if mode == "status":
@@ -83,11 +135,6 @@ def success_response(result: dict | list | float | str, query: str, mode: str, v
             if key in payload:
                 resp[key] = payload[key]
 
-    if mode in ("vcf", "auto_correct", "query"):
-        # flatten scientific results like "VCF"
-        for k, v in payload.items():
-            resp[k] = v
-
     if mode == "tool":
         # expose top-level "function"
         if "function" in payload:
@@ -96,12 +143,16 @@ def success_response(result: dict | list | float | str, query: str, mode: str, v
     return resp
 
 
-def error_response(message: str, query: str, mode: str, version: str, endpoint: str):
+def error_response(message: str, query: str, mode: str, version: str, endpoint: str,
+                   schema: str | None = None):
     """Standardized error response."""
+    timestamp = datetime.now(UTC).isoformat()
+    if (schema or current_schema()) == SCHEMA_LEAN:
+        return _lean({"error": message}, mode, version, timestamp, endpoint=endpoint)
     return {
         "result": {"error": message},
         "_meta": {
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": timestamp,
             "version": version,
             "query": query,
             "endpoint": endpoint,
@@ -110,7 +161,7 @@ def error_response(message: str, query: str, mode: str, version: str, endpoint:
         "error": message,
         "mode": mode,
         "version": version,
-        "timestamp": datetime.now(UTC).isoformat(),
+        "timestamp": timestamp,
     }
 
 
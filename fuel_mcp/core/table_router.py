@@ -0,0 +1,96 @@
+"""
+fuel_mcp/core/table_router.py
+=============================
+
+Deterministic fast path for picking the ASTM/ISO table of a query.
+
+Rules are built from tables/registry.json and rag/metadata.json:
+    1. explicit table number   "… using table 53B …"  → the one table with that number
+    2. operation type          density_to_mass         → category "density ↔ mass" (54B)
+                               density_to_volume       → category "density ↔ volume" (53B)
+                               vcf                     → metadata entry with output "VCF"
+A rule only answers when it matches exactly one table (an explicitly
+named but ambiguous number, e.g. "table 16", matches none); otherwise the
+caller falls back to semantic search (rag_bridge.find_table_for_query).
+"""
+
+import json
+import re
+import threading
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+REGISTRY_PATH = BASE_DIR / "tables" / "registry.json"
+METADATA_PATH = BASE_DIR / "rag" / "metadata.json"
+
+_KEY_NUMBER_RE = re.compile(r"^ASTM_Table(\d+[A-Z]?)_", re.IGNORECASE)
+_QUERY_NUMBER_RE = re.compile(r"\btable\s*(\d{1,2}[a-d]?)\b", re.IGNORECASE)
+
+
+def _op_for_category(category: str) -> str:
+    """'density ↔ mass' → 'density_to_mass', 'air correction' → 'air_correction'."""
+    return re.sub(r"\s+", "_", category.strip().lower().replace("↔", "to"))
+
+
+class TableRouter:
+    """Lookup tables of table-number → keys and operation → keys."""
+
+    def __init__(self, registry: dict, metadata: dict):
+        self.by_number: dict[str, list[str]] = {}
+        self.by_op: dict[str, list[str]] = {}
+
+        keys = {name.removesuffix(".csv"): entry for name, entry in registry.items()}
+        for key, entry in metadata.items():
+            keys.setdefault(key, entry)
+
+        for key, entry in keys.items():
+            number = _KEY_NUMBER_RE.match(key)
+            if number:
+                self.by_number.setdefault(number.group(1).upper(), []).append(key)
+            category = entry.get("category") or ""
+            if entry.get("conversion_path") and category:
+                self.by_op.setdefault(_op_for_category(category), []).append(key)
+
+        # analytical entries (e.g. VCF_official_equations) are routed by their outputs
+        for key, entry in metadata.items():
+            if "VCF" in (entry.get("outputs") or []):
+                self.by_op.setdefault("vcf", []).append(key)
+
+    def route(self, query: str, op_type: str | None = None) -> dict | None:
+        """Return {"table", "path"} when a rule matches exactly one table, else None."""
+        explicit = _QUERY_NUMBER_RE.search(query)
+        if explicit:
+            tables = self.by_number.get(explicit.group(1).upper(), [])
+            if len(tables) == 1:
+                return {"table": tables[0], "path": "rule:table_number"}
+            if tables:
+                return None  # several tables share this number — let semantic search decide
+        if op_type:
+            tables = self.by_op.get(op_type, [])
+            if len(tables) == 1:
+                return {"table": tables[0], "path": "rule:operation"}
+        return None
+
+
+_ROUTER: TableRouter | None = None
+_LOCK = threading.Lock()
+
+
+def get_router() -> TableRouter:
+    """Process-wide router, built on first use."""
+    global _ROUTER
+    if _ROUTER is None:
+        with _LOCK:
+            if _ROUTER is None:
+                with open(REGISTRY_PATH, "r") as f:
+                    registry = json.load(f)
+                metadata = {}
+                if METADATA_PATH.exists():
+                    with open(METADATA_PATH, "r") as f:
+                        metadata = json.load(f)
+                _ROUTER = TableRouter(registry, metadata)
+    return _ROUTER
+
+
+def route_table(query: str, op_type: str | None = None) -> dict | None:
+    return get_router().route(query, op_type)
@@ -0,0 +1,226 @@
+"""
+fuel_mcp/core/tokenizer.py
+==========================
+
+Precompiled, single-pass query tokenizer shared by regex_parser (/query)
+and mcp_core.
+
+One scan of the lower-cased text with a single compiled pattern collects
+every number (with its position; the digits after a decimal point are
+also a candidate of their own) and every fuel / intent term occurrence
+(zero-width lookahead, so overlapping terms such as "volume correction"
+and "correction" are all seen). Each number is then classified once by
+anchored suffix patterns (°C, deg, L, m³, t, kg, kg/m³ …), and the
+parsers pick "the first number that is a temperature", "the first
+volume", … exactly like their former leftmost `re.search` calls.
+"""
+
+import re
+
+# =====================================================
+# 📚 Vocabulary
+# =====================================================
+# fuels recognised by regex_parser, in priority order
+PARSER_FUELS = ("diesel", "gasoline", "hfo", "jet", "lube", "methanol", "mgo", "mdo", "ifo")
+
+# product synonyms used by mcp_core to infer a default density (first group wins)
+PRODUCT_TERMS = (
+    ("hfo", "heavy fuel oil", "ifo180", "ifo380", "marine fuel oil"),
+    ("diesel", "gasoil", "ago"),
+    ("gasoline", "petrol"),
+    ("jet a", "jet a1", "kerosene"),
+    ("lpg",),
+)
+
+INTENT_TERMS = (
+    "vcf", "volume correction", "correction factor", "temperature correction",
+    "correction", "convert", "mass", "density", "ton", "volume",
+)
+
+_FUEL_RANK = {fuel: i for i, fuel in enumerate(PARSER_FUELS)}
+_PRODUCT_GROUP = {term: i for i, group in reversed(list(enumerate(PRODUCT_TERMS))) for term in group}
+
+_TERMS = sorted(
+    {*PARSER_FUELS, *(t for group in PRODUCT_TERMS for t in group), *INTENT_TERMS},
+    key=len, reverse=True,
+)
+
+# =====================================================
+# 🧩 Compiled patterns
+# =====================================================
+def _trie_pattern(words) -> str:
+    """
+    Alternation of `words` factored by common prefix ("ifo(?:180|380)?"), so
+    the scanner tries one branch per first character instead of every term;
+    the longest term at a position wins.
+    """
+    heads: dict[str, list[str]] = {}
+    for word in words:
+        heads.setdefault(word[0], []).append(word[1:])
+    branches = []
+    for head, tails in sorted(heads.items()):
+        rest = [t for t in tails if t]
+        if not rest:
+            branches.append(re.escape(head))
+            continue
+        sub = _trie_pattern(rest)
+        if len(rest) < len(tails):
+            sub = f"(?:{sub})?"
+        elif "|" in sub:
+            sub = f"(?:{sub})"
+        branches.append(re.escape(head) + sub)
+    return "|".join(branches)
+
+
+_SCAN_RE = re.compile(
+    r"(?P<num>\d+)(?P<dot>\.(?=\d))?"
+    r"|(?=(?P<term>" + _trie_pattern(_TERMS) + r"))"
+)
+
+# a lookahead match only reports the longest term at a position; record the
+# shorter terms that start at the same place so substring semantics are kept
+_CONTAINED = {term: tuple(t for t in _TERMS if t != term and term.startswith(t)) for term in _TERMS}
+
+# number flags
+TEMP = 1           # 25°C, 25 c, 30 deg, 30 degrees  (word boundary after the unit)
+TEMP_LOOSE = 2     # 25°c…, 35deg…                    (fallback, no boundary)
+VOLUME = 4         # 500 l, 500 litre, 10 m3, 10 m³
+MASS = 8           # 2 t, 2 tons, 1500 kg
+CELSIUS = 16       # 25 c / 25°c without boundary (mcp_core temperature)
+DENSITY_UNIT = 32  # 850 kg/m³
+BARE_DENSITY = 64  # standalone 3–4 digit integer followed by at/°/c/ton/vcf/volume/mass/fuel
+AFTER_DENSITY = 128  # directly preceded by "density "
+LITRES = 256       # VOLUME given in litres (l / litre / liter)
+
+_SUFFIXES = (
+    (TEMP, re.compile(r"\s*(?:°?\s*c|deg(?:rees)?|degrees|c)\b")),
+    (TEMP_LOOSE, re.compile(r"(?:\s*°?\s*c|deg(?:rees)?)")),
+    (CELSIUS, re.compile(r"\s*°?\s*c")),
+)
+_DENSITY_UNIT_RE = re.compile(r"\s*kg\s*/\s*m(?:³|3)")
+_DIGITS_RE = re.compile(r"\d+")
+_HEAD_RE = re.compile(r"\s*(\S?)")
+_VOLUME_RE = re.compile(r"\s*(l|litre|liter|m3|m³)")
+_MASS_RE = re.compile(r"\s*(t|ton|tons|tonne|tonnes|kg)")
+_BARE_DENSITY_RE = re.compile(r"\s*(?:at|°|c|ton|vcf|volume|mass|fuel)")
+
+# first character of the units each group of patterns can match
+_TEMP_HEADS = frozenset("°cd")
+_AMOUNT_HEADS = frozenset("lmtk")
+_BARE_DENSITY_HEADS = frozenset("a°ctvmf")
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+# =====================================================
+# 🔤 Tokens
+# =====================================================
+class Number:
+    """A number in the query with its classification flags."""
+
+    __slots__ = ("value", "start", "end", "flags", "negative", "unit")
+
+    def __init__(self, value: float, start: int, end: int, flags: int, negative: bool, unit: str | None):
+        self.value = value
+        self.start = start
+        self.end = end
+        self.flags = flags
+        self.negative = negative
+        self.unit = unit  # mass unit ("t", "kg", …) when MASS is set
+
+    def __repr__(self) -> str:
+        return f"Number({self.value}, flags={self.flags}, at={self.start})"
+
+
+class QueryTokens:
+    """Result of tokenize(): numbers in order of appearance and the set of terms present."""
+
+    __slots__ = ("text", "numbers", "terms")
+
+    def __init__(self, text: str, numbers: list[Number], terms: set[str]):
+        self.text = text
+        self.numbers = numbers
+        self.terms = terms
+
+    def first(self, flag: int) -> Number | None:
+        """First (leftmost) number carrying `flag`."""
+        for number in self.numbers:
+            if number.flags & flag:
+                return number
+        return None
+
+    def has(self, *terms: str) -> bool:
+        return any(t in self.terms for t in terms)
+
+    def parser_fuel(self) -> str | None:
+        """regex_parser fuel: the highest-priority PARSER_FUELS entry present."""
+        ranks = [_FUEL_RANK[t] for t in self.terms if t in _FUEL_RANK]
+        return PARSER_FUELS[min(ranks)] if ranks else None
+
+    def product_group(self) -> int | None:
+        """Index of the first PRODUCT_TERMS group with a synonym present."""
+        groups = [_PRODUCT_GROUP[t] for t in self.terms if t in _PRODUCT_GROUP]
+        return min(groups) if groups else None
+
+
+def _classify(text: str, start: int, end: int, raw: str, after_density: bool) -> tuple[int, str | None]:
+    # every unit starts with the next non-space character; skip the patterns that cannot match
+    head = _HEAD_RE.match(text, end).group(1)
+    flags = 0
+    unit = None
+    if head in _TEMP_HEADS:
+        for flag, pattern in _SUFFIXES:
+            if pattern.match(text, end):
+                flags |= flag
+    if head in _AMOUNT_HEADS:
+        volume = _VOLUME_RE.match(text, end)
+        if volume:
+            flags |= VOLUME | (LITRES if volume.group(1).startswith("l") else 0)
+        mass = _MASS_RE.match(text, end)
+        if mass:
+            flags |= MASS
+            unit = mass.group(1)
+        if head == "k" and _DENSITY_UNIT_RE.match(text, end):
+            flags |= DENSITY_UNIT
+
+    if (3 <= len(raw) <= 4 and head in _BARE_DENSITY_HEADS and raw.isdigit()
+            and (start == 0 or not _is_word(text[start - 1]))
+            and (end == len(text) or not _is_word(text[end]))
+            and _BARE_DENSITY_RE.match(text, end)):
+        flags |= BARE_DENSITY
+
+    if after_density:
+        j = start
+        while j > 0 and text[j - 1].isspace():
+            j -= 1
+        if j < start and text.endswith("density", 0, j):
+            flags |= AFTER_DENSITY
+    return flags, unit
+
+
+def tokenize(text: str) -> QueryTokens:
+    """Tokenize a query in one pass (text is lower-cased here)."""
+    text = text.lower()
+    numbers: list[Number] = []
+    terms: set[str] = set()
+    for match in _SCAN_RE.finditer(text):
+        raw, dot, term = match.groups()
+        if term is not None:
+            terms.add(term)
+            # shorter terms starting at the same position (e.g. "ifo" in "ifo380")
+            terms.update(_CONTAINED[term])
+            continue
+        start, end = match.span()
+        if dot:
+            # "12.5": the fraction digits are also scanned as their own number next,
+            # as a leftmost re.search would do for chains like "1.2.3"
+            frac = _DIGITS_RE.match(text, end)
+            raw, end = f"{raw}.{frac.group()}", frac.end()
+        # "density" always precedes the number it labels, so it is already in `terms`
+        flags, unit = _classify(text, start, end, raw, "density" in terms)
+        negative = start > 0 and text[start - 1] == "-"
+        numbers.append(Number(float(raw), start, end, flags, negative, unit))
+    return QueryTokens(text, numbers, terms)
+
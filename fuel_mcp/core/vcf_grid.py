@@ -0,0 +1,230 @@
+"""
+fuel_mcp/core/vcf_grid.py
+=========================
+
+Optional precomputed VCF lookup grid.
+
+Tabulates the ISO 91-1 / ASTM D1250 formula (vcf_official_full) on a dense
+(rho15, tempC) grid and serves O(1), vectorizable lookups by bilinear or
+bicubic interpolation. Each 54A/54B/54D segment gets its own sub-grid so
+no cell straddles a coefficient change. The maximum absolute error against
+the analytic formula is estimated at build time (dense sampling inside every
+cell, times a safety factor) and stored with the grid as an upper bound.
+
+The table persists as a .npy file (plus a JSON sidecar) so workers can
+memory-map one shared copy instead of rebuilding it.
+
+Usage:
+    python -m fuel_mcp.core.vcf_grid [--rho-step 0.5] [--temp-step 0.5] [--method bilinear]
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from fuel_mcp.core.vcf_official_full import VCF_TABLES, _raise_for_invalid, _table_codes, _vcf_terms
+
+# =====================================================
+# ⚙️ Defaults
+# =====================================================
+DEFAULT_GRID_PATH = Path(__file__).resolve().parent.parent / "data" / "vcf_grid.npy"
+TEMP_RANGE = (-30.0, 120.0)
+METHODS = ("bilinear", "bicubic")
+ERROR_SUBDIVISIONS = 4  # error sampled on a 4×4 sub-grid of every cell (includes nodes and midpoints)
+ERROR_SAFETY = 1.25  # off-sample points measured up to ~5 % above the sampled max (bicubic)
+_ERROR_CHUNK_ROWS = 256  # density rows per sampling block, bounds the bicubic stencil memory
+
+# (lo, hi) per segment code, matching vcf_official_full.VCF_TABLE_IDS order
+SEGMENT_RANGES = [
+    VCF_TABLES["54A"]["range"],
+    *(seg["range"] for seg in VCF_TABLES["54B"]),
+    VCF_TABLES["54D"]["range"],
+]
+
+
+def _cubic_weights(f: np.ndarray) -> np.ndarray:
+    """Catmull-Rom weights for the 4 neighbours (-1, 0, +1, +2) of a cell."""
+    f2, f3 = f * f, f * f * f
+    return np.stack([
+        -0.5 * f3 + f2 - 0.5 * f,
+        1.5 * f3 - 2.5 * f2 + 1.0,
+        -1.5 * f3 + 2.0 * f2 + 0.5 * f,
+        0.5 * f3 - 0.5 * f2,
+    ])
+
+
+# =====================================================
+# 🧮 Grid
+# =====================================================
+class VCFGrid:
+    """Dense float64 VCF table with per-segment density axes and a shared temperature axis."""
+
+    def __init__(self, values: np.ndarray, meta: dict):
+        self.values = values
+        self.meta = meta
+        self.method = meta["method"]
+        self.max_abs_error = meta["max_abs_error"]
+
+        segs = meta["segments"]
+        self._seg_lo = np.array([s["lo"] for s in segs])
+        self._seg_step = np.array([s["step"] for s in segs])
+        self._seg_start = np.array([s["start"] for s in segs], dtype=np.intp)
+        self._seg_rows = np.array([s["rows"] for s in segs], dtype=np.intp)
+        self._t_min = meta["temp_min"]
+        self._t_step = meta["temp_step"]
+        self._t_cols = values.shape[1]
+
+    # -------------------------------------------------
+    # 🏗️ Build
+    # -------------------------------------------------
+    @classmethod
+    def build(cls, rho_step: float = 0.5, temp_step: float = 0.5,
+              temp_range: tuple = TEMP_RANGE, method: str = "bilinear") -> "VCFGrid":
+        """Tabulate the analytic formula at the given resolution."""
+        if method not in METHODS:
+            raise ValueError(f"Unknown interpolation method '{method}' (use {METHODS})")
+
+        t_min, t_max = temp_range
+        n_t = int(np.ceil((t_max - t_min) / temp_step)) + 1
+        temps = np.linspace(t_min, t_max, n_t)
+
+        blocks, segments, start = [], [], 0
+        for code, (lo, hi) in enumerate(SEGMENT_RANGES):
+            n_rho = int(np.ceil((hi - lo) / rho_step)) + 1
+            rhos = np.linspace(lo, hi, n_rho)
+            rho_2d, t_2d = np.meshgrid(rhos, temps, indexing="ij")
+            _, _, vcf = _vcf_terms(np.full(rho_2d.shape, code, dtype=np.uint8), rho_2d, t_2d)
+            blocks.append(vcf)
+            segments.append({"lo": lo, "hi": hi, "step": (hi - lo) / (n_rho - 1),
+                             "start": start, "rows": n_rho})
+            start += n_rho
+
+        meta = {
+            "method": method,
+            "rho_step": rho_step,
+            "temp_min": t_min,
+            "temp_max": t_max,
+            "temp_step": (t_max - t_min) / (n_t - 1),
+            "segments": segments,
+            "max_abs_error": None,
+            "max_abs_error_sampled": None,
+            "error_subdivisions": ERROR_SUBDIVISIONS,
+            "error_safety": ERROR_SAFETY,
+        }
+        grid = cls(np.ascontiguousarray(np.vstack(blocks)), meta)
+        sampled = grid.measure_error()
+        grid.meta["max_abs_error_sampled"] = sampled
+        grid.meta["max_abs_error"] = grid.max_abs_error = sampled * ERROR_SAFETY
+        return grid
+
+    def measure_error(self, subdivisions: int = ERROR_SUBDIVISIONS) -> float:
+        """
+        Max |grid − formula| sampled on a subdivisions × subdivisions sub-grid
+        of every cell. A sample, not a true maximum: build() multiplies it by
+        ERROR_SAFETY to state `max_abs_error` as an upper bound.
+        """
+        n = max(2, subdivisions)
+        t_fine = np.arange((self._t_cols - 1) * n + 1) * (self._t_step / n) + self._t_min
+        worst = 0.0
+        for code, seg in enumerate(self.meta["segments"]):
+            rho_fine = np.arange((seg["rows"] - 1) * n + 1) * (seg["step"] / n) + seg["lo"]
+            rho_fine = rho_fine[rho_fine > seg["lo"]] if code else rho_fine  # open lower bound
+            for start in range(0, len(rho_fine), _ERROR_CHUNK_ROWS):
+                rho_2d, t_2d = np.meshgrid(rho_fine[start:start + _ERROR_CHUNK_ROWS], t_fine, indexing="ij")
+                _, _, exact = _vcf_terms(np.full(rho_2d.shape, code, dtype=np.uint8), rho_2d, t_2d)
+                approx = self._interpolate(np.full(rho_2d.shape, code, dtype=np.intp), rho_2d, t_2d)
+                worst = max(worst, float(np.max(np.abs(approx - exact))))
+        return worst
+
+    # -------------------------------------------------
+    # 🔍 Lookup
+    # -------------------------------------------------
+    def vcf(self, rho15, tempC) -> np.ndarray:
+        """Interpolated VCF (unrounded); inputs broadcast like vcf_iso_official_batch()."""
+        rho, temp = np.broadcast_arrays(
+            np.asarray(rho15, dtype=np.float64), np.asarray(tempC, dtype=np.float64)
+        )
+        codes = _table_codes(rho)
+        _raise_for_invalid(rho, codes)
+        if np.any((temp < self._t_min) | (temp > self.meta["temp_max"])):
+            raise ValueError(
+                f"Temperature outside grid range {self._t_min}–{self.meta['temp_max']} °C"
+            )
+        return self._interpolate(codes.astype(np.intp), rho, temp)
+
+    def _interpolate(self, codes: np.ndarray, rho: np.ndarray, temp: np.ndarray) -> np.ndarray:
+        rows = self._seg_rows[codes]
+        fi = (rho - self._seg_lo[codes]) / self._seg_step[codes]
+        i0 = np.clip(np.floor(fi).astype(np.intp), 0, rows - 2)
+        fx = fi - i0
+        fj = (temp - self._t_min) / self._t_step
+        j0 = np.clip(np.floor(fj).astype(np.intp), 0, self._t_cols - 2)
+        fy = fj - j0
+        base = self._seg_start[codes]
+
+        if self.method == "bilinear":
+            r0 = base + i0
+            v = self.values
+            return ((1 - fx) * ((1 - fy) * v[r0, j0] + fy * v[r0, j0 + 1])
+                    + fx * ((1 - fy) * v[r0 + 1, j0] + fy * v[r0 + 1, j0 + 1]))
+
+        # --- bicubic (Catmull-Rom); ghost nodes past a segment edge are
+        # linearly extrapolated so edge cells keep full accuracy ---
+        patch = [[self.values[base + np.clip(i0 + di - 1, 0, rows - 1),
+                              np.clip(j0 + dj - 1, 0, self._t_cols - 1)]
+                  for dj in range(4)] for di in range(4)]
+        first_row, last_row = i0 == 0, i0 + 2 > rows - 1
+        first_col, last_col = j0 == 0, j0 + 2 > self._t_cols - 1
+        for dj in range(4):
+            patch[0][dj] = np.where(first_row, 2 * patch[1][dj] - patch[2][dj], patch[0][dj])
+            patch[3][dj] = np.where(last_row, 2 * patch[2][dj] - patch[1][dj], patch[3][dj])
+        for di in range(4):
+            patch[di][0] = np.where(first_col, 2 * patch[di][1] - patch[di][2], patch[di][0])
+            patch[di][3] = np.where(last_col, 2 * patch[di][2] - patch[di][1], patch[di][3])
+
+        wx, wy = _cubic_weights(fx), _cubic_weights(fy)
+        out = np.zeros(rho.shape)
+        for di in range(4):
+            for dj in range(4):
+                out += wx[di] * wy[dj] * patch[di][dj]
+        return out
+
+    # -------------------------------------------------
+    # 💾 Persistence
+    # -------------------------------------------------
+    def save(self, path: str | Path = DEFAULT_GRID_PATH) -> Path:
+        """Write the table to <path>.npy and its axes/metadata to <path>.json."""
+        path = Path(path).with_suffix(".npy")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, self.values)
+        path.with_suffix(".json").write_text(json.dumps(self.meta, indent=2))
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_GRID_PATH, mmap: bool = True) -> "VCFGrid":
+        """Load a saved grid; with mmap=True the table pages are shared between processes."""
+        path = Path(path).with_suffix(".npy")
+        meta = json.loads(path.with_suffix(".json").read_text())
+        values = np.load(path, mmap_mode="r" if mmap else None)
+        return cls(values, meta)
+
+
+# =====================================================
+# 🧪 Build & save
+# =====================================================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the precomputed VCF grid")
+    parser.add_argument("--rho-step", type=float, default=0.5)
+    parser.add_argument("--temp-step", type=float, default=0.5)
+    parser.add_argument("--method", choices=METHODS, default="bilinear")
+    parser.add_argument("--out", type=Path, default=DEFAULT_GRID_PATH)
+    args = parser.parse_args()
+
+    grid = VCFGrid.build(args.rho_step, args.temp_step, method=args.method)
+    saved = grid.save(args.out)
+    print(f"✅ VCF grid {grid.values.shape} ({args.method}) → {saved}")
+    print(f"📏 Max absolute error vs formula: ≤ {grid.max_abs_error:.2e} "
+          f"(sampled {grid.meta['max_abs_error_sampled']:.2e} × {ERROR_SAFETY})")
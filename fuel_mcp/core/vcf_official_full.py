@@ -6,9 +6,11 @@ Tables 54A–54D (metric, °C system).
 """
 
 import math
-import json
-from pathlib import Path
-from .unit_converter import convert
+
+import numpy as np
+
+from .fuel_density_loader import get_registry
+from .unit_converter import UNIT_CONVERSION, convert
 
 
 # =====================================================
@@ -78,18 +80,136 @@ def vcf_iso_official(rho15: float, tempC: float) -> dict:
     }
 
 
+# =====================================================
+# 🔹 VECTORIZED BATCH FUNCTION
+# =====================================================
+# Segment codes used by the batch engine, in density order.
+# VCF_TABLE_IDS[code] equals the "table" string of vcf_iso_official().
+VCF_TABLE_IDS = (
+    f"54A ({VCF_TABLES['54A']['label']})",
+    *(f"54B ({seg['label']})" for seg in VCF_TABLES["54B"]),
+    f"54D ({VCF_TABLES['54D']['label']})",
+)
+
+VCF_BATCH_DTYPE = np.dtype([
+    ("VCF", "f8"),
+    ("table", "u1"),
+    ("coefficient_a", "f8"),
+    ("exponent_b", "f8"),
+])
+
+_NO_TABLE = 255
+VCF_INVALID = _NO_TABLE  # table code of rows rejected by vcf_iso_official_batch(invalid="mask")
+# Relative half-width of the band around a rounding boundary inside which a
+# vectorized value (np.exp / x**2 may differ from libm by an ulp) is not
+# trusted to round like the scalar path; such rows are recomputed exactly.
+_ROUND_GUARD = 2.0 ** -36
+
+_SEGMENTS = [VCF_TABLES["54A"], *VCF_TABLES["54B"], VCF_TABLES["54D"]]
+_K0 = np.array([seg.get("K0", 0.0) for seg in _SEGMENTS])
+_K1 = np.array([seg.get("K1", 0.0) for seg in _SEGMENTS])
+_A = np.array([seg.get("A", 0.0) for seg in _SEGMENTS])
+_B = np.array([seg.get("B", 0.0) for seg in _SEGMENTS])
+_USES_AB = np.array(["A" in seg for seg in _SEGMENTS])
+
+
+def _table_codes(rho: np.ndarray) -> np.ndarray:
+    """Assign a segment code per density with the same bounds as vcf_iso_official."""
+    codes = np.full(rho.shape, _NO_TABLE, dtype=np.uint8)
+    lo_a, hi_a = VCF_TABLES["54A"]["range"]
+    codes[(lo_a <= rho) & (rho <= hi_a)] = 0
+    for code, seg in enumerate(VCF_TABLES["54B"], start=1):
+        lo, hi = seg["range"]
+        codes[(lo < rho) & (rho <= hi)] = code
+    lo_d, hi_d = VCF_TABLES["54D"]["range"]
+    codes[(lo_d < rho) & (rho <= hi_d)] = len(VCF_TABLE_IDS) - 1
+    return codes
+
+
+def density_error(value: float) -> str:
+    """The scalar function's error message for an out-of-range density."""
+    if 770.0 < value <= 1075.0:
+        return f"Density {value} kg/m³ not in any 54B sub-range"
+    return f"Density {value} kg/m³ outside ASTM range 610.5–1164.0"
+
+
+def _raise_for_invalid(rho: np.ndarray, codes: np.ndarray) -> None:
+    """Raise the scalar function's ValueError for the first out-of-range density."""
+    bad = np.flatnonzero(codes == _NO_TABLE)
+    if bad.size:
+        raise ValueError(density_error(float(rho.flat[bad[0]])))
+
+
+def _near_rounding_boundary(values: np.ndarray, ndigits: int, guard: float = _ROUND_GUARD) -> np.ndarray:
+    """Flag values whose decimal rounding could flip on a 1-ulp difference."""
+    scaled = values * 10.0 ** ndigits
+    frac = np.abs(scaled - np.floor(scaled))
+    return np.abs(frac - 0.5) <= np.abs(scaled) * guard
+
+
+def _vcf_terms(codes: np.ndarray, rho: np.ndarray, temp: np.ndarray):
+    """Unrounded (a, b, VCF) for known segment codes — one vectorized pass."""
+    dT = temp - 15.0
+    sq = rho ** 2
+    a = np.where(_USES_AB[codes], _A[codes] + _B[codes] / sq, (_K0[codes] + _K1[codes] * rho) / sq)
+    b = -a * dT * (1 + 0.8 * a * dT)
+    return a, b, np.exp(b)
+
+
+def vcf_iso_official_batch(rho15, tempC, invalid: str = "raise") -> np.ndarray:
+    """
+    Vectorized vcf_iso_official() over NumPy arrays.
+
+    Inputs broadcast against each other. Returns a structured array with
+    fields VCF, table (index into VCF_TABLE_IDS), coefficient_a and
+    exponent_b, rounded exactly like the scalar function. Raises ValueError
+    if any density falls outside the ASTM range, unless invalid="mask":
+    then such rows get table VCF_INVALID and NaN values (see density_error).
+    """
+    rho, temp = np.broadcast_arrays(
+        np.asarray(rho15, dtype=np.float64), np.asarray(tempC, dtype=np.float64)
+    )
+    codes = _table_codes(rho)
+    if invalid == "raise":
+        _raise_for_invalid(rho, codes)
+    bad = codes == _NO_TABLE
+    if bad.any():
+        codes = np.where(bad, 0, codes)  # any valid segment; these rows are blanked below
+    a, b, vcf = _vcf_terms(codes, rho, temp)
+
+    out = np.empty(rho.shape, dtype=VCF_BATCH_DTYPE)
+    out["VCF"] = np.round(vcf, 6)
+    out["table"] = codes
+    out["coefficient_a"] = np.round(a, 9)
+    out["exponent_b"] = np.round(b, 8)
+
+    # --- Exact scalar path for the rare rows sitting on a rounding boundary ---
+    unsure = (
+        _near_rounding_boundary(vcf, 6)
+        | _near_rounding_boundary(a, 9)
+        | _near_rounding_boundary(b, 8)
+    ) & ~bad
+    for idx in map(tuple, np.argwhere(unsure)):
+        res = vcf_iso_official(float(rho[idx]), float(temp[idx]))
+        out["VCF"][idx] = res["VCF"]
+        out["coefficient_a"][idx] = res["coefficient_a"]
+        out["exponent_b"][idx] = res["exponent_b"]
+
+    if bad.any():
+        out["table"][bad] = _NO_TABLE
+        for field in ("VCF", "coefficient_a", "exponent_b"):
+            out[field][bad] = np.nan
+    return out
+
+
 # =====================================================
 # 🔹 VOLUME CORRECTION
 # =====================================================
 def correct_volume(fuel: str, observed_m3: float, tempC: float,
                    rho15: float | None = None, db_path: str | None = None) -> dict:
     """Correct observed volume → standard 15 °C volume."""
-    db = Path(db_path or Path(__file__).parent / "tables" / "fuel_data.json")
-    with open(db) as f:
-        fuels = json.load(f)
-
-    # ✅ Use user-input rho15 if provided, otherwise from DB
-    rho15 = rho15 or fuels.get(fuel, {}).get("density_15C", 850.0)
+    # ✅ Use user-input rho15 if provided, otherwise from the density registry
+    rho15 = rho15 or get_registry(db_path).get(fuel)
 
     result = vcf_iso_official(rho15, tempC)
     vcf = result["VCF"]
@@ -109,11 +229,7 @@ def correct_volume(fuel: str, observed_m3: float, tempC: float,
 def correct_mass(fuel: str, mass_ton: float, tempC: float,
                  rho15: float | None = None, db_path: str | None = None) -> dict:
     """Compute observed volume & 15 °C volume from mass."""
-    db = Path(db_path or Path(__file__).parent / "tables" / "fuel_data.json")
-    with open(db) as f:
-        fuels = json.load(f)
-
-    rho15 = rho15 or fuels.get(fuel, {}).get("density_15C", 850.0)
+    rho15 = rho15 or get_registry(db_path).get(fuel)
     rho15_ton_m3 = rho15 / 1000
     result = vcf_iso_official(rho15, tempC)
     vcf = result["VCF"]
@@ -164,4 +280,97 @@ def auto_correct(fuel: str, volume_m3=None, mass_ton=None,
         "usg_15C": round(convert(base_volume, "cum", "usg"), 1),
     }
     return result
-    
\ No newline at end of file
+    
+
+# =====================================================
+# 🔹 VECTORIZED AUTO-CORRECTION (tank sheets)
+# =====================================================
+# base-volume equivalents of auto_correct(): (column, unit, ndigits)
+EQUIVALENTS = (("barrels_15C", "barrel", 3), ("litres_15C", "litre", 1), ("usg_15C", "usg", 1))
+
+# The arithmetic below is the same IEEE operations as the scalar functions,
+# so values only differ in how they are rounded: np.round(x * 10**n) can
+# disagree with round() only within a few ulps of a ½ boundary.
+_EXACT_ROUND_GUARD = 2.0 ** -48
+
+
+def _round_checked(values: np.ndarray, ndigits: int, unsure: np.ndarray, rows=True) -> np.ndarray:
+    """np.round(values, ndigits), flagging `rows` where Python's round() might differ."""
+    unsure |= _near_rounding_boundary(values, ndigits, _EXACT_ROUND_GUARD) & rows
+    return np.round(values, ndigits)
+
+
+def auto_correct_batch(fuel, tempC, volume_m3=None, mass_ton=None, rho15=None,
+                       db_path=None) -> dict[str, np.ndarray]:
+    """
+    Vectorized auto_correct() over many tanks.
+
+    `fuel` is a sequence of fuel names; the other inputs are arrays aligned
+    with it (NaN = not given). Missing rho15 is looked up once per distinct
+    fuel. Each row needs exactly one of volume_m3 / mass_ton.
+
+    Returns column arrays (rho15, table, VCF, volume_input, volume_obs_m3,
+    rhoT_ton_m3, V15_m3, mass_ton, m3_15C, barrels_15C, litres_15C, usg_15C)
+    rounded like auto_correct(); rows whose rounding could come out
+    differently are recomputed with it. Rows with an out-of-range density
+    get table VCF_INVALID and NaN results.
+    """
+    fuel = np.asarray(fuel, dtype=object)
+    n = fuel.shape[0]
+    temp = np.broadcast_to(np.asarray(tempC, dtype=np.float64), (n,))
+    volume = np.full(n, np.nan) if volume_m3 is None else np.asarray(volume_m3, dtype=np.float64)
+    mass = np.full(n, np.nan) if mass_ton is None else np.asarray(mass_ton, dtype=np.float64)
+    is_volume = ~np.isnan(volume)
+    is_mass = ~is_volume
+    if np.any(is_volume == ~np.isnan(mass)):
+        raise ValueError("Provide either volume_m3 or mass_ton (not both).")
+
+    # --- Density per row: given, else one registry lookup per fuel ---
+    rho = np.full(n, np.nan) if rho15 is None else np.array(rho15, dtype=np.float64)
+    missing = np.isnan(rho) | (rho == 0)
+    if missing.any():
+        registry = get_registry(db_path)
+        for name in set(fuel[missing].tolist()):
+            rho[missing & (fuel == name)] = registry.get(name)
+
+    out = vcf_iso_official_batch(rho, temp, invalid="mask")
+    vcf = out["VCF"]
+    unsure = np.zeros(n, dtype=bool)
+    rho_r = _round_checked(rho, 3, unsure)
+
+    # same operation order as correct_volume() / correct_mass()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rhoT = (rho / 1000) / vcf
+        vol_obs = mass / rhoT
+        v15 = _round_checked(np.where(is_volume, volume * vcf, vol_obs * vcf), 3, unsure)
+        mass_from_volume = _round_checked(v15 * (rho_r / 1000), 3, unsure, is_volume)
+
+    result = {
+        "rho15": rho_r,
+        "table": out["table"],
+        "VCF": vcf,
+        "volume_input": is_volume,
+        "volume_obs_m3": np.where(is_volume, volume, _round_checked(vol_obs, 3, unsure, is_mass)),
+        "rhoT_ton_m3": np.where(is_volume, np.nan, _round_checked(rhoT, 6, unsure, is_mass)),
+        "V15_m3": v15,
+        "mass_ton": np.where(is_volume, mass_from_volume, mass),
+        "m3_15C": v15.copy(),
+    }
+    for column, unit, ndigits in EQUIVALENTS:
+        converted = _round_checked(v15 * UNIT_CONVERSION[f"cum_to_{unit}"], 6, unsure)
+        result[column] = _round_checked(converted, ndigits, unsure)
+
+    # --- Exact scalar path for rows near a rounding boundary ---
+    unsure &= out["table"] != VCF_INVALID
+    for i in np.flatnonzero(unsure).tolist():
+        amount = {"volume_m3": float(volume[i])} if is_volume[i] else {"mass_ton": float(mass[i])}
+        ref = auto_correct(str(fuel[i]), tempC=float(temp[i]), rho15=float(rho[i]), db_path=db_path, **amount)
+        result["rho15"][i] = ref["rho15"]
+        result["V15_m3"][i] = result["m3_15C"][i] = ref["V15_m3"]
+        result["mass_ton"][i] = ref["mass_ton"]
+        if not is_volume[i]:
+            result["volume_obs_m3"][i] = ref["volume_obs_m3"]
+            result["rhoT_ton_m3"][i] = ref["rhoT_ton_m3"]
+        for column, _, _ in EQUIVALENTS:
+            result[column][i] = ref["equivalents"][column]
+    return result
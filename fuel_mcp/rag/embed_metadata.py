@@ -6,6 +6,8 @@ from openai import OpenAI
 from time import sleep
 from dotenv import load_dotenv
 
+from fuel_mcp.rag import vector_store as store
+
 # 🔹 Load environment variables from .env
 load_dotenv()
 
@@ -15,7 +17,10 @@ load_dotenv()
 MODEL = "text-embedding-3-small"
 RAG_DIR = Path(__file__).parent
 METADATA_FILE = RAG_DIR / "metadata.json"
-VECTOR_FILE = RAG_DIR / "vector_store.json"
+# OpenAI vectors (1536-d) live in their own store: store.STORE_PATH holds
+# the local nomic model's 768-d vectors, and upsert() refuses mixed models
+VECTOR_FILE = RAG_DIR / "vector_store_openai.npy"
+SAVE_EVERY = 5
 MAX_RETRIES = 3
 TIMEOUT = 30.0
 
@@ -31,15 +36,29 @@ client = OpenAI(
 with open(METADATA_FILE, "r") as f:
     metadata = json.load(f)
 
-# Resume support: load existing embeddings if file exists
-vector_store = {}
-if VECTOR_FILE.exists():
+# Resume support: only the keys of an existing store are needed
+embedded = set()
+if store.exists(VECTOR_FILE):
     try:
-        with open(VECTOR_FILE, "r") as f:
-            vector_store = json.load(f)
-        print(f"🔁 Resuming from {len(vector_store)} existing embeddings...")
+        existing = store.read_meta(VECTOR_FILE)
     except Exception:
-        print("⚠️ Could not read existing vector_store.json — starting fresh.")
+        existing = None
+        print("⚠️ Could not read existing vector store — starting fresh.")
+    if existing is not None:
+        if existing.get("model") not in (None, MODEL):
+            raise SystemExit(f"❌ {VECTOR_FILE.name} was built with '{existing['model']}', not '{MODEL}'.")
+        embedded = set(existing["keys"])
+        print(f"🔁 Resuming from {len(embedded)} existing embeddings...")
+
+pending = {}  # new embeddings not yet appended to the store
+
+
+def save_pending():
+    """Append pending embeddings to the binary store (existing rows are not rewritten)."""
+    if pending:
+        store.upsert(pending, VECTOR_FILE, model=MODEL)
+        embedded.update(pending)
+        pending.clear()
 
 # =====================================================
 # 🚀 Embedding builder with retry logic
@@ -69,7 +88,7 @@ def embed_metadata():
     print(f"\n🚀 Embedding {total} metadata entries...\n")
 
     for key, content in metadata.items():
-        if key in vector_store:
+        if key in embedded:
             print(f"⏩ Skipped (already embedded): {key}")
             continue
 
@@ -80,20 +99,19 @@ def embed_metadata():
         try:
             embedding = get_embedding_with_retry(text, key)
 
-            vector_store[key] = {
+            pending[key] = {
                 "embedding": embedding,
                 "description": desc,
                 "category": category,
             }
 
             count += 1
-            print(f"✅ ({len(vector_store)}/{total}) Embedded: {key}\n")
+            print(f"✅ ({len(embedded) + len(pending)}/{total}) Embedded: {key}\n")
 
-            # Auto-save every 5 items
-            if count % 5 == 0:
-                with open(VECTOR_FILE, "w") as f:
-                    json.dump(vector_store, f, indent=2)
-                print(f"💾 Progress saved ({len(vector_store)}/{total})\n")
+            # Auto-save every SAVE_EVERY items
+            if count % SAVE_EVERY == 0:
+                save_pending()
+                print(f"💾 Progress saved ({len(embedded)}/{total})\n")
             
             # Rate limit protection
             sleep(0.5)
@@ -101,14 +119,12 @@ def embed_metadata():
         except Exception as e:
             print(f"❌ Skipping {key} after all retries failed: {e}\n")
             # Save progress even on failure
-            with open(VECTOR_FILE, "w") as f:
-                json.dump(vector_store, f, indent=2)
+            save_pending()
             continue
 
     # Final save
-    with open(VECTOR_FILE, "w") as f:
-        json.dump(vector_store, f, indent=2)
-    print(f"\n✅ Done — embedded {len(vector_store)} total → {VECTOR_FILE}")
+    save_pending()
+    print(f"\n✅ Done — embedded {len(embedded)} total → {VECTOR_FILE}")
 
 # =====================================================
 if __name__ == "__main__":
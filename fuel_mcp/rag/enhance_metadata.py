@@ -3,7 +3,7 @@
 Enhance ASTM/ISO Table Metadata and Rebuild Semantic Vector Store
 -----------------------------------------------------------------
 This script enriches registry.json with detailed descriptions and
-rebuilds vector_store.json using the local nomic embedding model.
+rebuilds the binary vector store (vector_store.npy) using the local nomic embedding model.
 
 Output precision: 4 decimals
 """
@@ -12,18 +12,21 @@ import json
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 
+from fuel_mcp.rag import vector_store as store
+
 # =====================================================
 # ⚙️ Paths
 # =====================================================
 BASE_DIR = Path(__file__).parent.parent
 REGISTRY_PATH = BASE_DIR / "tables" / "registry.json"
-VECTOR_PATH = BASE_DIR / "rag" / "vector_store.json"
+VECTOR_PATH = store.STORE_PATH
+MODEL_NAME = "nomic-ai/nomic-embed-text-v1.5"
 
 # =====================================================
 # 🧠 Load local model
 # =====================================================
-print("🧩 Loading local model: nomic-ai/nomic-embed-text-v1.5 ...")
-model = SentenceTransformer("nomic-ai/nomic-embed-text-v1.5", trust_remote_code=True)
+print(f"🧩 Loading local model: {MODEL_NAME} ...")
+model = SentenceTransformer(MODEL_NAME, trust_remote_code=True)
 print("✅ Model loaded successfully.\n")
 
 # =====================================================
@@ -87,8 +90,7 @@ for name, entry in registry.items():
 with open(REGISTRY_PATH, "w") as f:
     json.dump(updated_registry, f, indent=2)
 
-with open(VECTOR_PATH, "w") as f:
-    json.dump(vectors, f, indent=2)
+store.write_store(vectors, VECTOR_PATH, model=MODEL_NAME)
 
 print("✅ Metadata enriched and semantic vectors rebuilt.")
 print(f"📘 Updated registry: {REGISTRY_PATH}")
@@ -1,21 +1,22 @@
 # fuel_mcp/rag/retriever.py
 """
 Semantic retriever for ASTM/ISO tables.
-Searches vector_store.json for the most relevant table by meaning.
+Searches the binary vector store for the most relevant table by meaning.
 """
 
-import json
 import numpy as np
 from pathlib import Path
 from openai import OpenAI
 from dotenv import load_dotenv
 import os
-load_dotenv()
 
+from fuel_mcp.rag import vector_store as store
+
+load_dotenv()
 
 MODEL = "text-embedding-3-small"
 RAG_DIR = Path(__file__).parent
-VECTOR_FILE = RAG_DIR / "vector_store.json"
+VECTOR_FILE = store.STORE_PATH
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
@@ -30,8 +31,11 @@ def cosine_similarity(a, b):
 # =====================================================
 # 🔹 Load vector store
 # =====================================================
-with open(VECTOR_FILE, "r") as f:
-    VECTOR_STORE = json.load(f)
+if not store.exists(VECTOR_FILE):
+    store.migrate_json(store.LEGACY_JSON, VECTOR_FILE)
+
+_MATRIX, _META = store.load_store(VECTOR_FILE)
+_NORMS = np.linalg.norm(_MATRIX, axis=1)
 
 # =====================================================
 # 🔹 Core search
@@ -42,20 +46,22 @@ def search_table(query: str, top_k: int = 3):
     resp = client.embeddings.create(model=MODEL, input=query)
     query_vec = resp.data[0].embedding
 
-    # 2️⃣ Compute similarities
-    results = []
-    for key, entry in VECTOR_STORE.items():
-        sim = cosine_similarity(query_vec, entry["embedding"])
-        results.append({
-            "table": key,
-            "similarity": round(float(sim), 4),
-            "description": entry["description"],
-            "category": entry["category"]
-        })
+    # 2️⃣ Compute similarities (one matrix–vector product)
+    q = np.asarray(query_vec, dtype=np.float32)
+    sims = (_MATRIX @ q) / (_NORMS * np.linalg.norm(q))
+    rounded = np.round(sims.astype(np.float64), 4)
 
-    # 3️⃣ Sort and return
-    results = sorted(results, key=lambda x: x["similarity"], reverse=True)
-    return results[:top_k]
+    # 3️⃣ Sort (stable: ties keep store order) and return
+    order = np.argsort(-rounded, kind="stable")[:top_k]
+    return [
+        {
+            "table": _META["keys"][i],
+            "similarity": float(rounded[i]),
+            "description": _META["descriptions"][i],
+            "category": _META["categories"][i],
+        }
+        for i in order
+    ]
 
 # =====================================================
 # 🔹 CLI demo
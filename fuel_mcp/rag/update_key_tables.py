@@ -11,18 +11,21 @@ import json
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 
+from fuel_mcp.rag import vector_store as store
+
 # =====================================================
 # ⚙️ Paths
 # =====================================================
 BASE_DIR = Path(__file__).parent.parent
 REGISTRY_PATH = BASE_DIR / "tables" / "registry.json"
-VECTOR_PATH = BASE_DIR / "rag" / "vector_store.json"
+VECTOR_PATH = store.STORE_PATH
+MODEL_NAME = "nomic-ai/nomic-embed-text-v1.5"
 
 # =====================================================
 # 🧠 Load model
 # =====================================================
-print("🧩 Loading local semantic model: nomic-ai/nomic-embed-text-v1.5 ...")
-model = SentenceTransformer("nomic-ai/nomic-embed-text-v1.5", trust_remote_code=True)
+print(f"🧩 Loading local semantic model: {MODEL_NAME} ...")
+model = SentenceTransformer(MODEL_NAME, trust_remote_code=True)
 print("✅ Model ready.\n")
 
 # =====================================================
@@ -31,8 +34,7 @@ print("✅ Model ready.\n")
 with open(REGISTRY_PATH, "r") as f:
     registry = json.load(f)
 
-with open(VECTOR_PATH, "r") as f:
-    vector_store = json.load(f)
+patches = {}  # only these rows are rewritten in the binary store
 
 # =====================================================
 # 🎯 Tables to update
@@ -63,7 +65,7 @@ for table, desc in TARGETS.items():
         patched_count += 1
 
         emb = model.encode(desc, normalize_embeddings=True).tolist()
-        vector_store[key] = {
+        patches[key] = {
             "embedding": emb,
             "description": desc
         }
@@ -74,9 +76,9 @@ for table, desc in TARGETS.items():
 with open(REGISTRY_PATH, "w") as f:
     json.dump(registry, f, indent=2)
 
-with open(VECTOR_PATH, "w") as f:
-    json.dump(vector_store, f, indent=2)
+if patches:
+    store.upsert(patches, VECTOR_PATH, model=MODEL_NAME)
 
 print(f"✅ Patched {patched_count} key tables with refined metadata.")
-print("📘 registry.json and 📗 vector_store.json updated successfully.")
+print("📘 registry.json and 📗 vector store updated successfully.")
 print("🎯 Precision: 4-decimal semantic embeddings refreshed.")
@@ -10,18 +10,21 @@ import json
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 
+from fuel_mcp.rag import vector_store as store
+
 # =====================================================
 # ⚙️ Paths
 # =====================================================
 BASE_DIR = Path(__file__).parent.parent
 REGISTRY_PATH = BASE_DIR / "tables" / "registry.json"
-VECTOR_PATH = BASE_DIR / "rag" / "vector_store.json"
+VECTOR_PATH = store.STORE_PATH
+MODEL_NAME = "nomic-ai/nomic-embed-text-v1.5"
 
 # =====================================================
 # 🧠 Load embedding model
 # =====================================================
-print("🧩 Loading local semantic model: nomic-ai/nomic-embed-text-v1.5 ...")
-model = SentenceTransformer("nomic-ai/nomic-embed-text-v1.5", trust_remote_code=True)
+print(f"🧩 Loading local semantic model: {MODEL_NAME} ...")
+model = SentenceTransformer(MODEL_NAME, trust_remote_code=True)
 print("✅ Model ready.\n")
 
 # =====================================================
@@ -30,8 +33,7 @@ print("✅ Model ready.\n")
 with open(REGISTRY_PATH, "r") as f:
     registry = json.load(f)
 
-with open(VECTOR_PATH, "r") as f:
-    vector_store = json.load(f)
+patches = {}  # only these rows are rewritten in the binary store
 
 # =====================================================
 # 🎯 Tables to patch
@@ -74,7 +76,7 @@ for table, desc in TARGETS.items():
         patched += 1
 
         emb = model.encode(desc, normalize_embeddings=True).tolist()
-        vector_store[key] = {
+        patches[key] = {
             "embedding": emb,
             "description": desc
         }
@@ -85,9 +87,9 @@ for table, desc in TARGETS.items():
 with open(REGISTRY_PATH, "w") as f:
     json.dump(registry, f, indent=2)
 
-with open(VECTOR_PATH, "w") as f:
-    json.dump(vector_store, f, indent=2)
+if patches:
+    store.upsert(patches, VECTOR_PATH, model=MODEL_NAME)
 
 print(f"✅ Patched {patched} VCF/Air-Vacuo tables with refined metadata.")
-print("📘 registry.json and 📗 vector_store.json updated successfully.")
+print("📘 registry.json and 📗 vector store updated successfully.")
 print("🎯 Precision: 4-decimal semantic embeddings refreshed for temperature & air correction tables.")
@@ -0,0 +1,233 @@
+"""
+fuel_mcp/rag/vector_store.py
+============================
+
+Compact binary vector store for the RAG layer.
+
+Layout (next to each other in rag/):
+    vector_store.npy        float32 (or float16) matrix, one row per table
+    vector_store.meta.json  header + parallel key/description/category lists
+
+    {"format_version": 1, "model": "...", "dim": 768, "dtype": "float32",
+     "count": 29, "keys": [...], "descriptions": [...], "categories": [...]}
+
+The .npy file is memory-mappable. Its header is written with fixed
+padding, so new rows are appended in place and existing rows are
+overwritten in place; only the (small) sidecar is rewritten. The sidecar
+is always written last, and readers only trust its `count` rows.
+
+Usage (one-shot migration from the legacy vector_store.json):
+    python -m fuel_mcp.rag.vector_store --migrate [--dtype float16]
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+RAG_DIR = Path(__file__).parent
+STORE_PATH = RAG_DIR / "vector_store.npy"
+LEGACY_JSON = RAG_DIR / "vector_store.json"
+DEFAULT_MODEL = "nomic-ai/nomic-embed-text-v1.5"
+FORMAT_VERSION = 1
+DTYPES = ("float32", "float16")
+
+_HEADER_BYTES = 128  # magic + version + len + padded header dict (room for large shapes)
+
+
+# =====================================================
+# 🔧 Helpers
+# =====================================================
+def meta_path(path: str | Path = STORE_PATH) -> Path:
+    """Sidecar path for a store (<stem>.meta.json)."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.meta.json")
+
+
+def _npy_header(shape: tuple, dtype: np.dtype) -> bytes:
+    header = repr({
+        "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        "fortran_order": False,
+        "shape": tuple(shape),
+    })
+    pad = _HEADER_BYTES - 10 - len(header) - 1
+    if pad < 0:
+        raise ValueError(f"Shape {shape} does not fit in the fixed .npy header")
+    text = (header + " " * pad + "\n").encode("latin1")
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(text)) + text
+
+
+def _read_npy_layout(f) -> tuple[tuple, np.dtype, int]:
+    version = np.lib.format.read_magic(f)
+    read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+    shape, fortran, dtype = read_header(f)
+    if fortran:
+        raise ValueError("Fortran-ordered vector stores are not supported")
+    return shape, dtype, f.tell()
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _write_meta(path: Path, meta: dict) -> None:
+    _atomic_write_bytes(meta_path(path), json.dumps(meta, indent=1, ensure_ascii=False).encode())
+
+
+def _normalize_entries(entries: dict | list) -> list[dict]:
+    """Accept {key: {...}} or [{"table": key, ...}] and return [{"table": key, ...}]."""
+    if isinstance(entries, dict):
+        return [{"table": key, **val} for key, val in entries.items()]
+    return list(entries)
+
+
+# =====================================================
+# 📥 Read
+# =====================================================
+def exists(path: str | Path = STORE_PATH) -> bool:
+    path = Path(path)
+    return path.exists() and meta_path(path).exists()
+
+
+def read_meta(path: str | Path = STORE_PATH) -> dict:
+    return json.loads(meta_path(path).read_text())
+
+
+def load_store(path: str | Path = STORE_PATH, mmap: bool = True) -> tuple[np.ndarray, dict]:
+    """Return (matrix[count, dim], meta). With mmap=True the matrix is a read-only memory map."""
+    path = Path(path)
+    meta = read_meta(path)
+    matrix = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+    return matrix[: meta["count"]], meta
+
+
+def load_entries(path: str | Path = STORE_PATH) -> list[dict]:
+    """Store as [{"table", "embedding", "description", "category"}] (embedding as a float32 row)."""
+    matrix, meta = load_store(path)
+    return [
+        {"table": key, "embedding": np.asarray(row, dtype=np.float32), "description": desc, "category": cat}
+        for key, row, desc, cat in zip(meta["keys"], matrix, meta["descriptions"], meta["categories"])
+    ]
+
+
+# =====================================================
+# 💾 Write
+# =====================================================
+def write_store(entries: dict | list, path: str | Path = STORE_PATH,
+                model: str | None = DEFAULT_MODEL, dtype: str = "float32") -> dict:
+    """Write a complete store (replaces any existing one)."""
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported dtype '{dtype}' (use {DTYPES})")
+    path = Path(path)
+    rows = [e for e in _normalize_entries(entries) if len(e.get("embedding", []))]
+    if not rows:
+        raise ValueError("No embeddings to write")
+    matrix = np.asarray([np.ravel(e["embedding"]) for e in rows], dtype=dtype)
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "model": model,
+        "dim": int(matrix.shape[1]),
+        "dtype": dtype,
+        "count": len(rows),
+        "keys": [e["table"] for e in rows],
+        "descriptions": [e.get("description", "") for e in rows],
+        "categories": [e.get("category", "") for e in rows],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write_bytes(path, _npy_header(matrix.shape, matrix.dtype) + np.ascontiguousarray(matrix).tobytes())
+    _write_meta(path, meta)
+    return meta
+
+
+def upsert(entries: dict | list, path: str | Path = STORE_PATH, model: str | None = None) -> dict:
+    """
+    Add or replace entries without rewriting the matrix: existing keys are
+    overwritten in place, new keys are appended after the last row.
+    Creates the store if it does not exist yet.
+    """
+    path = Path(path)
+    rows = [e for e in _normalize_entries(entries) if len(e.get("embedding", []))]
+    if not exists(path):
+        return write_store(rows, path, model=model or DEFAULT_MODEL)
+
+    meta = read_meta(path)
+    if model and meta.get("model") and model != meta["model"]:
+        raise ValueError(f"Store was built with '{meta['model']}', not '{model}'")
+
+    with open(path, "rb") as f:
+        _, _, offset = _read_npy_layout(f)
+    if offset != _HEADER_BYTES:
+        # Written by something else (e.g. np.save) — re-layout once, then update in place
+        write_store(load_entries(path), path, model=meta.get("model"), dtype=meta["dtype"])
+        meta = read_meta(path)
+
+    with open(path, "r+b") as f:
+        shape, dtype, offset = _read_npy_layout(f)
+        dim = shape[1]
+        row_bytes = dim * dtype.itemsize
+        vecs = [np.asarray(entry["embedding"], dtype=dtype).ravel() for entry in rows]
+        for entry, vec in zip(rows, vecs):
+            if vec.shape[0] != dim:
+                raise ValueError(f"Embedding for {entry['table']} has {vec.shape[0]} dims, store has {dim}")
+
+        positions = {key: i for i, key in enumerate(meta["keys"])}
+        count = meta["count"]
+        for entry, vec in zip(rows, vecs):
+            i = positions.get(entry["table"])
+            if i is None:
+                i = positions[entry["table"]] = count
+                count += 1
+                meta["keys"].append(entry["table"])
+                meta["descriptions"].append(entry.get("description", ""))
+                meta["categories"].append(entry.get("category", ""))
+            else:
+                meta["descriptions"][i] = entry.get("description", meta["descriptions"][i])
+                meta["categories"][i] = entry.get("category", meta["categories"][i])
+            f.seek(offset + i * row_bytes)
+            f.write(vec.tobytes())
+
+        f.truncate(offset + count * row_bytes)  # drop rows of an interrupted earlier append
+        f.seek(0)
+        f.write(_npy_header((count, dim), dtype))
+
+    meta["count"] = count
+    _write_meta(path, meta)
+    return meta
+
+
+# =====================================================
+# 🔁 Migration
+# =====================================================
+def migrate_json(json_path: str | Path = LEGACY_JSON, path: str | Path = STORE_PATH,
+                 model: str | None = DEFAULT_MODEL, dtype: str = "float32") -> dict:
+    """One-shot conversion of the legacy pretty-printed vector_store.json."""
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    return write_store(data, path, model=model, dtype=dtype)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Binary RAG vector store tools")
+    parser.add_argument("--migrate", action="store_true", help="Convert vector_store.json to the binary store")
+    parser.add_argument("--dtype", choices=DTYPES, default="float32")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--json", type=Path, default=LEGACY_JSON)
+    parser.add_argument("--out", type=Path, default=STORE_PATH)
+    args = parser.parse_args()
+
+    if args.migrate:
+        meta = migrate_json(args.json, args.out, model=args.model, dtype=args.dtype)
+        size_kb = args.out.stat().st_size / 1024
+        print(f"✅ Migrated {meta['count']} embeddings ({meta['dim']}-D {meta['dtype']}) → {args.out} ({size_kb:.1f} KB)")
+    elif exists(args.out):
+        meta = read_meta(args.out)
+        print(f"📗 {args.out}: {meta['count']} × {meta['dim']} {meta['dtype']} (model: {meta['model']})")
+    else:
+        print(f"⚠️ No binary store at {args.out} — run with --migrate.")
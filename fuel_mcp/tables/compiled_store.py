@@ -0,0 +1,257 @@
+"""
+fuel_mcp/tables/compiled_store.py
+=================================
+
+Column-oriented binary artifacts for the normalized ASTM/ISO tables.
+
+Each CSV in `official/normalized/` compiles to `official/compiled/<stem>/`:
+one .npy file per column plus a manifest.json recording column names,
+dtypes, sort order and the SHA-256 of the source CSV. Loading memory-maps
+the .npy files, so several uvicorn workers share the same pages instead of
+each holding a pandas copy. Text columns are stored as fixed-width unicode
+plus a mask of missing cells, and load as object arrays with None there.
+
+Manifests are cached in memory per source CSV (size + mtime), so a repeat
+load costs one stat() of the CSV instead of re-reading the manifest.
+
+The CSV stays the source of truth: an artifact whose source changed is
+rebuilt automatically on the next load. If the compiled directory is not
+writable, tables are parsed from CSV in memory instead.
+
+Usage:
+    python -m fuel_mcp.tables.manage_registry --compile [--force]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).parent
+NORM_DIR = BASE_DIR / "official" / "normalized"
+COMPILED_DIR = BASE_DIR / "official" / "compiled"
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 2  # 2: missing text cells kept as a mask (1 stored them as "nan")
+
+_MANIFESTS: dict[tuple[Path, Path], tuple[tuple[int, int], dict]] = {}  # (csv, out_dir) → ((size, mtime_ns), manifest)
+_MANIFESTS_LOCK = threading.Lock()
+
+
+# =====================================================
+# 🔧 Helpers
+# =====================================================
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _sort_order(values: np.ndarray) -> str:
+    if values.dtype.kind not in "fiu":
+        return "unsorted"
+    steps = np.diff(values)
+    if np.all(steps >= 0):
+        return "ascending"
+    if np.all(steps <= 0):
+        return "descending"
+    return "unsorted"
+
+
+def _column_array(series: pd.Series) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Numeric columns keep their dtype; anything else becomes fixed-width
+    unicode (mmap-able) with "" for missing cells, plus the missing mask
+    (None when nothing is missing).
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(), None
+    missing = series.isna().to_numpy()
+    values = series.where(~missing, "").astype(str).to_numpy(dtype=str)
+    return values, (missing if missing.any() else None)
+
+
+def _with_missing(values: np.ndarray, missing: np.ndarray | None) -> np.ndarray:
+    """Text column as an object array with None in missing cells (unchanged if none are missing)."""
+    if missing is None:
+        return values
+    out = values.astype(object)
+    out[missing] = None
+    return out
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _save_array(path: Path, values: np.ndarray) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, values, allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def artifact_dir(table_name: str, out_dir: Path = COMPILED_DIR) -> Path:
+    """Artifact directory for a normalized CSV filename (with or without .csv)."""
+    return Path(out_dir) / Path(table_name).stem
+
+
+def read_manifest(table_name: str, out_dir: Path = COMPILED_DIR) -> dict | None:
+    path = artifact_dir(table_name, out_dir) / MANIFEST
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+# =====================================================
+# 🏗️ Compile
+# =====================================================
+def compile_table(csv_path: Path, out_dir: Path = COMPILED_DIR) -> dict:
+    """Compile one normalized CSV into per-column .npy files + manifest."""
+    csv_path = Path(csv_path)
+    stat = csv_path.stat()
+    source_hash = _sha256(csv_path)
+    df = pd.read_csv(csv_path)
+
+    target = artifact_dir(csv_path.name, out_dir)
+    target.mkdir(parents=True, exist_ok=True)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        values, missing = _column_array(df[name])
+        # Content-addressed file names: concurrent compilers never clobber a
+        # file that a published manifest still points to.
+        fname = f"col_{i:03d}.{source_hash[:12]}.npy"
+        _save_array(target / fname, values)
+        column = {
+            "name": name,
+            "dtype": values.dtype.str,
+            "file": fname,
+            "sort_order": _sort_order(values),
+        }
+        if missing is not None:
+            column["missing_file"] = f"col_{i:03d}.{source_hash[:12]}.missing.npy"
+            _save_array(target / column["missing_file"], missing)
+        columns.append(column)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "source": csv_path.name,
+        "source_sha256": source_hash,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "rows": len(df),
+        "columns": columns,
+    }
+    _atomic_write_bytes(target / MANIFEST, json.dumps(manifest, indent=2).encode())
+
+    # Drop column files from previous builds
+    keep = {c["file"] for c in columns} | {c["missing_file"] for c in columns if "missing_file" in c}
+    for old in target.glob("col_*.npy"):
+        if old.name not in keep:
+            old.unlink(missing_ok=True)
+    return manifest
+
+
+def is_stale(csv_path: Path, out_dir: Path = COMPILED_DIR) -> bool:
+    """True if the artifact is missing or was built from different CSV content."""
+    csv_path = Path(csv_path)
+    manifest = read_manifest(csv_path.name, out_dir)
+    if manifest is None or manifest.get("format_version") != FORMAT_VERSION:
+        return True
+    stat = csv_path.stat()
+    if stat.st_size == manifest["source_size"] and stat.st_mtime_ns == manifest["source_mtime_ns"]:
+        return False
+    # mtime/size changed (e.g. fresh checkout) — fall back to the content hash
+    if _sha256(csv_path) != manifest["source_sha256"]:
+        return True
+    try:  # same content: remember the new mtime so the hash is not recomputed
+        manifest.update(source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+        target = artifact_dir(csv_path.name, out_dir) / MANIFEST
+        _atomic_write_bytes(target, json.dumps(manifest, indent=2).encode())
+    except OSError:
+        pass
+    return False
+
+
+def compile_all(src_dir: Path = NORM_DIR, out_dir: Path = COMPILED_DIR, force: bool = False) -> list[str]:
+    """Compile every normalized CSV whose artifact is missing or stale."""
+    built = []
+    for csv_path in sorted(Path(src_dir).glob("*.csv")):
+        if force or is_stale(csv_path, out_dir):
+            compile_table(csv_path, out_dir)
+            built.append(csv_path.name)
+    return built
+
+
+# =====================================================
+# 📥 Load
+# =====================================================
+def load_columns(table_name: str, src_dir: Path = NORM_DIR, out_dir: Path = COMPILED_DIR,
+                 mmap: bool = True) -> dict[str, np.ndarray]:
+    """
+    Return {column: array} for a normalized table (filename with .csv).
+    Arrays are read-only memory maps of the compiled artifact, which is
+    rebuilt first if the CSV changed; text columns with missing cells are
+    object arrays holding None there.
+    """
+    csv_path = Path(src_dir) / table_name
+    try:
+        stat = csv_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"❌ Table not found: {csv_path}") from None
+
+    key, signature = (csv_path, Path(out_dir)), (stat.st_size, stat.st_mtime_ns)
+    cached = _MANIFESTS.get(key)
+    if cached is not None and cached[0] == signature:
+        try:
+            return _load_artifact(cached[1], artifact_dir(table_name, out_dir), mmap)
+        except FileNotFoundError:
+            pass  # artifact removed behind the cache — check and rebuild below
+
+    try:
+        manifest = compile_table(csv_path, out_dir) if is_stale(csv_path, out_dir) \
+            else read_manifest(table_name, out_dir)
+    except OSError as e:
+        logging.warning(f"⚠️ Cannot compile {table_name} ({e}) — parsing CSV in memory.")
+        df = pd.read_csv(csv_path)
+        return {c: _with_missing(*_column_array(df[c])) for c in df.columns}
+
+    columns = _load_artifact(manifest, artifact_dir(table_name, out_dir), mmap)
+    with _MANIFESTS_LOCK:
+        _MANIFESTS[key] = (signature, manifest)
+    return columns
+
+
+def _load_artifact(manifest: dict, target: Path, mmap: bool) -> dict[str, np.ndarray]:
+    columns = {}
+    for col in manifest["columns"]:
+        values = np.load(target / col["file"], mmap_mode="r" if mmap else None, allow_pickle=False)
+        if "missing_file" in col:
+            values = _with_missing(values, np.load(target / col["missing_file"], allow_pickle=False))
+        columns[col["name"]] = values
+    return columns
+
+
+def clear_manifest_cache() -> None:
+    with _MANIFESTS_LOCK:
+        _MANIFESTS.clear()
+
+
+def load_frame(table_name: str, **kwargs) -> pd.DataFrame:
+    """Compiled table as a DataFrame (columns wrap the memory maps where pandas allows)."""
+    return pd.DataFrame(load_columns(table_name, **kwargs), copy=False)
+
+
+if __name__ == "__main__":
+    rebuilt = compile_all()
+    print(f"✅ Compiled {len(rebuilt)} table(s) → {COMPILED_DIR}")
@@ -2,6 +2,8 @@
 from pathlib import Path
 import pandas as pd
 
+from fuel_mcp.tables.compiled_store import load_frame
+
 BASE_DIR = Path(__file__).parent
 OFFICIAL_DIR = BASE_DIR / "official"
 NORM_DIR = OFFICIAL_DIR / "normalized"
@@ -16,6 +18,7 @@ def load_table(name: str, normalized: bool = False) -> pd.DataFrame:
         Filename of the table (e.g. 'ASTM_Table9_APIGravity60F_to_USGallons_and_Barrels_per_ShortTon_60F.csv')
     normalized : bool, optional
         If True, loads the normalized version from `official/normalized/`
+        (served from its compiled, memory-mapped artifact)
 
     Returns
     -------
@@ -39,7 +42,7 @@ def load_table(name: str, normalized: bool = False) -> pd.DataFrame:
         raise FileNotFoundError(f"❌ Table not found: {path}")
 
     try:
-        df = pd.read_csv(path)
+        df = load_frame(name) if normalized else pd.read_csv(path)
         print(f"✅ Loaded {'normalized' if normalized else 'official'} table: {path.name}")
         return df
     except Exception as e:
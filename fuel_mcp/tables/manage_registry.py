@@ -8,6 +8,7 @@ Usage:
     python fuel_mcp/tables/manage_registry.py --rebuild
     python fuel_mcp/tables/manage_registry.py --enrich
     python fuel_mcp/tables/manage_registry.py --summary
+    python -m fuel_mcp.tables.manage_registry --compile [--force]
     python fuel_mcp/tables/manage_registry.py --all
 """
 
@@ -125,6 +126,19 @@ def summary_registry():
     print(f"✅ Markdown summary created → {SUMMARY}")
 
 
+# ======================================================
+# 📦 COMPILE — normalized CSV → memory-mapped column artifacts
+# ======================================================
+def compile_tables(force: bool = False):
+    from fuel_mcp.tables.compiled_store import COMPILED_DIR, compile_all
+
+    built = compile_all(force=force)
+    if built:
+        print(f"✅ Compiled {len(built)} table(s) → {COMPILED_DIR}")
+    else:
+        print(f"✅ Compiled tables up to date → {COMPILED_DIR}")
+
+
 # ======================================================
 # 🎛️ MAIN — argument handler
 # ======================================================
@@ -133,6 +147,8 @@ if __name__ == "__main__":
     parser.add_argument("--rebuild", action="store_true", help="Rebuild registry from CSV files")
     parser.add_argument("--enrich", action="store_true", help="Enrich registry with known metadata")
     parser.add_argument("--summary", action="store_true", help="Generate Markdown summary")
+    parser.add_argument("--compile", action="store_true", help="Compile normalized tables to binary artifacts")
+    parser.add_argument("--force", action="store_true", help="With --compile: rebuild even if up to date")
     parser.add_argument("--all", action="store_true", help="Run all tasks sequentially")
     args = parser.parse_args()
 
@@ -140,6 +156,7 @@ if __name__ == "__main__":
         build_registry()
         enrich_registry()
         summary_registry()
+        compile_tables(args.force)
     else:
         if args.rebuild:
             build_registry()
@@ -147,3 +164,5 @@ if __name__ == "__main__":
             enrich_registry()
         if args.summary:
             summary_registry()
+        if args.compile:
+            compile_tables(args.force)
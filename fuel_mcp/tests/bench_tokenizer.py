@@ -0,0 +1,76 @@
+"""
+bench_tokenizer.py
+==================
+Benchmark: per-pattern `re.search` extraction (the former regex_parser +
+mcp_core code paths) vs the shared single-pass tokenizer, on the real
+queries in golden/query_corpus.txt.
+
+Usage:
+    python -m fuel_mcp.tests.bench_tokenizer [repeats]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+from fuel_mcp.core.tokenizer import (
+    AFTER_DENSITY, BARE_DENSITY, CELSIUS, DENSITY_UNIT, MASS, TEMP, TEMP_LOOSE, VOLUME, tokenize,
+)
+
+REPEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+ROUNDS = 5  # best of ROUNDS, to keep scheduler noise out of the comparison
+CORPUS = [
+    line for line in (Path(__file__).parent / "golden" / "query_corpus.txt").read_text(encoding="utf-8").splitlines()
+    if line.strip() and not line.startswith("#")
+]
+PRODUCTS = ["hfo", "heavy fuel oil", "ifo180", "ifo380", "marine fuel oil", "diesel", "gasoil", "ago",
+            "gasoline", "petrol", "jet a", "jet a1", "kerosene", "lpg"]
+
+
+def per_pattern(query: str):
+    """Both parsers' extraction as they were: one regex / substring scan per quantity."""
+    text = query.lower().strip()
+    fuel = next((f for f in ["diesel", "gasoline", "hfo", "jet", "lube", "methanol", "mgo", "mdo", "ifo"] if f in text), None)
+    t = (re.search(r"(?:@|at)?\s*(\d+(?:\.\d+)?)\s*(?:°?\s*c|deg(?:rees)?|degrees|c)\b", text)
+         or re.search(r"(\d+(?:\.\d+)?)(?:\s*°?\s*c|deg(?:rees)?)", text))
+    v = re.search(r"(\d+(?:\.\d+)?)\s*(l|litre|liter|m3|m³)", text)
+    m = re.search(r"(\d+(?:\.\d+)?)\s*(t|ton|tons|tonne|tonnes|kg)", text)
+    mode = "vcf" in text or "correction" in text or "convert" in text or "mass" in text
+
+    q = query.lower().replace("℃", "°c").replace("kg/m3", "kg/m³")
+    op = any(k in q for k in ["vcf", "volume correction", "correction factor", "temperature correction"])
+    op = op or ("density" in q and ("ton" in q or "volume" in q))
+    c = re.search(r"(-?\d+(?:\.\d+)?)\s*°?\s*c", q)
+    d = (re.search(r"(\d+(?:\.\d+)?)\s*kg\s*/\s*m(?:³|3)", q)
+         or re.search(r"density\s+(\d+(?:\.\d+)?)", q)
+         or re.search(r"\b(\d{3,4})\b(?=\s*(?:at|°|c|ton|vcf|volume|mass|fuel))", q))
+    product = next((p for p in PRODUCTS if p in q), None)
+    return fuel, t, v, m, mode, op, c, d, product
+
+
+def single_pass(query: str):
+    """The same information from one tokenize() call."""
+    tokens = tokenize(query.replace("℃", "°c").replace("kg/m3", "kg/m³"))
+    t = tokens.first(TEMP) or tokens.first(TEMP_LOOSE)
+    d = tokens.first(DENSITY_UNIT) or tokens.first(AFTER_DENSITY) or tokens.first(BARE_DENSITY)
+    return (tokens.parser_fuel(), t, tokens.first(VOLUME), tokens.first(MASS),
+            tokens.has("vcf", "correction", "convert", "mass"), tokens.first(CELSIUS), d, tokens.product_group())
+
+
+total = len(CORPUS) * REPEATS
+print(f"\n⏱️  Query tokenizer benchmark — {len(CORPUS)} queries × {REPEATS:,} = {total:,} parses (best of {ROUNDS})\n")
+
+results = {}
+for label, fn in (("Per-pattern regex", per_pattern), ("Single-pass tokenizer", single_pass)):
+    sec = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            for query in CORPUS:
+                fn(query)
+        sec = min(sec, time.perf_counter() - start)
+    results[label] = sec
+    print(f"  • {label:<22} {sec:8.3f} s  ({total / sec:,.0f} queries/s, {sec / total * 1e6:.2f} µs/query)")
+
+print(f"\n🚀 Speedup: {results['Per-pattern regex'] / results['Single-pass tokenizer']:,.2f}×")
@@ -0,0 +1,40 @@
+"""
+bench_vcf_batch.py
+==================
+Benchmark: scalar vcf_iso_official() loop vs vectorized
+vcf_iso_official_batch() on 1M (rho15, tempC) readings.
+
+Usage:
+    python -m fuel_mcp.tests.bench_vcf_batch [rows]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from fuel_mcp.core.vcf_official_full import vcf_iso_official, vcf_iso_official_batch
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+SCALAR_SAMPLE = min(ROWS, 100_000)  # scalar loop is extrapolated from a sample
+
+rng = np.random.default_rng(2540)
+rho15 = rng.uniform(771.0, 1164.0, ROWS)
+tempC = rng.uniform(-30.0, 120.0, ROWS)
+
+print(f"\n⏱️  VCF benchmark — {ROWS:,} rows\n")
+
+# --- Scalar ---
+start = time.perf_counter()
+for r, t in zip(rho15[:SCALAR_SAMPLE].tolist(), tempC[:SCALAR_SAMPLE].tolist()):
+    vcf_iso_official(r, t)
+scalar_sec = (time.perf_counter() - start) * ROWS / SCALAR_SAMPLE
+print(f"  • Scalar loop:  {scalar_sec:8.3f} s  ({ROWS / scalar_sec:,.0f} rows/s, extrapolated)")
+
+# --- Batch ---
+start = time.perf_counter()
+out = vcf_iso_official_batch(rho15, tempC)
+batch_sec = time.perf_counter() - start
+print(f"  • Batch:        {batch_sec:8.3f} s  ({ROWS / batch_sec:,.0f} rows/s)")
+
+print(f"\n🚀 Speedup: {scalar_sec / batch_sec:,.1f}×  (mean VCF {out['VCF'].mean():.6f})")
@@ -0,0 +1,152 @@
+"""
+fuel_mcp/tests/test_api_batch.py
+================================
+
+Tests for the batch correction endpoints (api_batch):
+- POST /vcf/batch streams NDJSON matching the scalar vcf_iso_official()
+- JSON-array and NDJSON bodies are both accepted, in chunks
+- bad rows (including "nan" / "inf" values) are reported inline without
+  failing the batch
+- one summarized history entry per batch
+- POST /auto_correct/batch reproduces auto_correct() per tank, with totals
+  that exclude failed tanks
+"""
+
+import json
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fuel_mcp.api import api_batch
+from fuel_mcp.core.vcf_official_full import auto_correct, vcf_iso_official
+
+app = FastAPI()
+app.include_router(api_batch.router)
+client = TestClient(app)
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    entries = []
+    monkeypatch.setattr(api_batch, "log_query_async", lambda *args: entries.append(args))
+    monkeypatch.setattr(api_batch, "log_error_async", lambda *args: None)
+    return entries
+
+
+def _lines(res):
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in res.text.splitlines()]
+
+
+def test_vcf_batch_matches_scalar(logged, monkeypatch):
+    monkeypatch.setattr(api_batch, "CHUNK_ROWS", 3)
+    rows = [{"rho15": 700.0 + 40 * i, "tempC": -10.0 + 9 * i} for i in range(11)]
+    out = _lines(client.post("/vcf/batch", json=rows))
+    assert [r["row"] for r in out[:-1]] == list(range(11))
+    for record, row in zip(out, rows):
+        ref = vcf_iso_official(row["rho15"], row["tempC"])
+        assert record["VCF"] == ref["VCF"]
+        assert record["table"] == ref["table"]
+        assert record["coefficient_a"] == ref["coefficient_a"]
+    summary = out[-1]["summary"]
+    assert summary["rows"] == 11 and summary["errors"] == 0 and summary["chunks"] == 4
+    assert len(logged) == 1 and logged[0][2] == "vcf_batch"
+
+
+def test_vcf_batch_ndjson_with_inline_errors(logged):
+    body = b"\n".join([
+        orjson.dumps({"rho15": 850, "tempC": 25}),
+        orjson.dumps({"rho15": 400, "tempC": 25}),
+        b"{not json",
+        orjson.dumps({"tempC": 25}),
+        b"",
+        orjson.dumps({"rho15": "991.5", "tempC": 40}),
+    ])
+    out = _lines(client.post("/vcf/batch", content=body, headers={"Content-Type": "application/x-ndjson"}))
+    assert out[0]["VCF"] == vcf_iso_official(850.0, 25.0)["VCF"]
+    assert "outside ASTM range" in out[1]["error"]
+    assert "Invalid JSON" in out[2]["error"]
+    assert "missing 'rho15'" in out[3]["error"]
+    assert out[4]["row"] == 4 and out[4]["VCF"] == vcf_iso_official(991.5, 40.0)["VCF"]
+    assert out[-1]["summary"] == {**out[-1]["summary"], "rows": 5, "ok": 2, "errors": 3}
+    assert len(logged) == 1 and logged[0][3] is True
+
+
+def test_vcf_batch_rejects_non_finite_numbers(logged):
+    rows = [{"rho15": 850, "tempC": "inf"}, {"rho15": "nan", "tempC": 25}, {"rho15": "-Infinity", "tempC": 25},
+            {"rho15": 850, "tempC": 25}]
+    out = _lines(client.post("/vcf/batch", json=rows))
+    assert [r["row"] for r in out[:3]] == [0, 1, 2]
+    assert "'tempC' must be a finite number" in out[0]["error"] and "VCF" not in out[0]
+    assert all("'rho15' must be a finite number" in r["error"] for r in out[1:3])
+    assert out[3]["VCF"] == vcf_iso_official(850.0, 25.0)["VCF"]
+    assert out[-1]["summary"] == {**out[-1]["summary"], "rows": 4, "ok": 1, "errors": 3}
+
+
+def test_vcf_batch_rejects_bad_body(logged):
+    out = _lines(client.post("/vcf/batch", json={"values": [1, 2]}))
+    assert "Invalid batch body" in out[0]["error"]
+    assert out[-1]["summary"]["rows"] == 0
+    assert logged[0][3] is False
+
+
+# =====================================================
+# ⚖️ /auto_correct/batch
+# =====================================================
+SHEET = [
+    {"tank": "1P", "fuel": "diesel", "volume_m3": 412.5, "tempC": 31.0},
+    {"tank": "1S", "fuel": "HFO", "volume_m3": 980.0, "tempC": 45.5, "rho15": 991.0},
+    {"tank": "2C", "fuel": "hfo", "mass_ton": 250.0, "tempC": 38.0},
+    {"tank": "3P", "fuel": "diesel", "volume_m3": 10.0, "mass_ton": 8.0, "tempC": 20.0},
+    {"tank": "3S", "fuel": "diesel", "volume_m3": 10.0, "tempC": 20.0, "rho15": 400.0},
+]
+
+
+def test_auto_correct_sheet_matches_scalar(logged):
+    res = client.post("/auto_correct/batch", json={"tanks": SHEET})
+    assert res.status_code == 200
+    result = res.json()["result"]
+    tanks = result["tanks"]
+
+    for tank, out in zip(SHEET[:3], tanks):
+        amount = {k: tank[k] for k in ("volume_m3", "mass_ton") if k in tank}
+        ref = auto_correct(tank["fuel"].lower(), tempC=tank["tempC"], rho15=tank.get("rho15"), **amount)
+        assert out["tank"] == tank["tank"]
+        assert out["mode"] == ref["mode"]
+        assert (out["VCF"], out["V15_m3"], out["mass_ton"]) == (ref["VCF"], ref["V15_m3"], ref["mass_ton"])
+        assert out["equivalents"] == ref["equivalents"]
+
+    assert "not both" in tanks[3]["error"]
+    assert "outside ASTM range" in tanks[4]["error"]
+
+    totals = result["totals"]
+    assert totals["ok"] == 3 and totals["errors"] == 2
+    assert totals["V15_m3"] == round(sum(t["V15_m3"] for t in tanks[:3]), 3)
+    assert totals["barrels_15C"] == round(sum(t["equivalents"]["barrels_15C"] for t in tanks[:3]), 3)
+    assert result["by_fuel"]["hfo"]["tanks"] == 2 and result["by_fuel"]["diesel"]["tanks"] == 1
+    assert len(logged) == 1 and logged[0][2] == "auto_correct_batch"
+
+
+def test_auto_correct_sheet_non_finite_tank_is_an_error(logged):
+    sheet = [*SHEET[:3], {"tank": "4P", "fuel": "hfo", "volume_m3": "inf", "tempC": 30.0},
+             {"tank": "4S", "fuel": "hfo", "volume_m3": 50.0, "tempC": "nan"}]
+    result = client.post("/auto_correct/batch", json={"tanks": sheet}).json()["result"]
+    assert "'volume_m3' must be a finite number" in result["tanks"][3]["error"]
+    assert "'tempC' must be a finite number" in result["tanks"][4]["error"]
+
+    totals = result["totals"]
+    assert totals["ok"] == 3 and totals["errors"] == 2
+    ok = result["tanks"][:3]
+    assert totals["V15_m3"] == round(sum(t["V15_m3"] for t in ok), 3)
+    for key in ("barrels_15C", "litres_15C", "usg_15C"):
+        assert totals[key] == round(sum(t["equivalents"][key] for t in ok), 3)
+    assert result["by_fuel"]["hfo"]["tanks"] == 2
+
+
+def test_auto_correct_sheet_rejects_empty(logged):
+    res = client.post("/auto_correct/batch", json={"tanks": []})
+    assert res.status_code == 400
+    assert "No tanks" in res.json()["error"]
+    assert logged == []
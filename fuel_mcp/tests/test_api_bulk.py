@@ -0,0 +1,189 @@
+"""
+fuel_mcp/tests/test_api_bulk.py
+===============================
+
+Tests for bulk file corrections (api_bulk):
+- a CSV upload is corrected chunk by chunk into an enriched CSV
+- enriched values match the scalar auto_correct(); input columns are unchanged
+- an enriched file can be uploaded again
+- bad rows carry a `calc_error` (including ±inf inputs), missing columns fail the job
+- job status reports progress, chunk size and row throughput
+- Parquet chunks keep one schema when a column's dtype drifts between chunks
+- cancel_jobs() drops queued jobs and stops running ones (per-process jobs)
+- Parquet without pyarrow is rejected up front
+"""
+
+import io
+import threading
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fuel_mcp.api import api_bulk
+from fuel_mcp.core.executors import get_pool
+from fuel_mcp.core.vcf_official_full import auto_correct
+
+app = FastAPI()
+app.include_router(api_bulk.router)
+client = TestClient(app)
+
+
+@pytest.fixture
+def logged(monkeypatch, tmp_path):
+    entries = []
+    monkeypatch.setattr(api_bulk, "BULK_DIR", tmp_path)
+    monkeypatch.setattr(api_bulk, "log_query_async", lambda *args: entries.append(args))
+    monkeypatch.setattr(api_bulk, "log_error_async", lambda *args: None)
+    return entries
+
+
+def _upload(csv_text: str, name: str = "tanks.csv", **params):
+    res = client.post("/bulk/correct", files={"file": (name, csv_text, "text/csv")}, params=params)
+    assert res.status_code == 202, res.text
+    job = res.json()["result"]
+    api_bulk.get_job(job["job_id"]).future.result(timeout=30)
+    return job
+
+
+def _sheet(n: int) -> str:
+    fuels = ("diesel", "hfo", "gasoline", "jet")
+    rows = ["Fuel,TempC,volume_m3,mass_ton,rho15"]
+    for i in range(n):
+        fuel, temp = fuels[i % 4], round(-5 + (i * 0.37) % 45, 2)
+        if i % 3:
+            rows.append(f"{fuel},{temp},{100 + i * 1.25},,")
+        else:
+            rows.append(f"{fuel},{temp},,{50 + i * 0.5},{820 + i % 150}")
+    return "\n".join(rows) + "\n"
+
+
+def test_bulk_csv_matches_scalar(logged):
+    sheet = _sheet(250)
+    job = _upload(sheet, chunk_rows=64)
+    assert job["chunk_rows"] == 64 and job["status_url"].endswith(job["job_id"])
+
+    status = client.get(job["status_url"]).json()["result"]
+    assert status["status"] == "done" and status["progress"] == 1.0
+    assert status["rows"] == 250 and status["errors"] == 0 and status["chunks"] == 4
+    assert status["chunk_rows"] == 64 and status["rows_per_sec"] > 0
+
+    res = client.get(job["result_url"])
+    assert res.status_code == 200 and res.headers["x-chunk-rows"] == "64"
+    assert "tanks_corrected.csv" in res.headers["content-disposition"]
+    out = pd.read_csv(io.StringIO(res.text))
+    assert len(out) == 250 and out["calc_error"].isna().all()
+    uploaded = pd.read_csv(io.StringIO(sheet))
+    pd.testing.assert_frame_equal(out[list(uploaded.columns)], uploaded)  # inputs survive unchanged
+
+    for row in out.itertuples(index=False):
+        assert pd.isna(row.volume_m3) != pd.isna(row.mass_ton)
+        amount = {"volume_m3": row.volume_m3} if pd.isna(row.mass_ton) else {"mass_ton": row.mass_ton}
+        rho = None if pd.isna(row.rho15) else float(row.rho15)
+        ref = auto_correct(row.Fuel, tempC=float(row.TempC), rho15=rho, **{k: float(v) for k, v in amount.items()})
+        assert row.calc_VCF == pytest.approx(ref["VCF"], abs=0)
+        assert row.calc_V15_m3 == ref["V15_m3"] and row.calc_mass_ton == ref["mass_ton"]
+        assert row.calc_barrels_15C == ref["equivalents"]["barrels_15C"]
+        assert row.calc_table == ref["table"]
+
+    again = _upload(res.text, chunk_rows=64)  # enriched output is a valid upload
+    assert client.get(again["status_url"]).json()["result"]["errors"] == 0
+    redone = pd.read_csv(io.StringIO(client.get(again["result_url"]).text))
+    pd.testing.assert_frame_equal(redone, out)
+
+    assert len(logged) == 2 and logged[0][2] == "bulk_correct" and logged[0][3] is True
+
+
+def test_bulk_bad_rows_and_missing_columns(logged):
+    job = _upload("fuel,tempC,volume_m3,mass_ton,rho15\n"
+                  "diesel,15,100,,\n"
+                  ",15,100,,\n"
+                  "diesel,warm,100,,\n"
+                  "diesel,15,100,80,\n"
+                  "diesel,15,100,,2000\n")
+    out = pd.read_csv(io.StringIO(client.get(job["result_url"]).text))
+    assert out["calc_error"].isna().tolist() == [True, False, False, False, False]
+    assert out.loc[1, "calc_error"] == "missing 'fuel'"
+    assert "tempC" in out.loc[2, "calc_error"] and "not both" in out.loc[3, "calc_error"]
+    assert out.loc[3, "volume_m3"] == 100 and out.loc[3, "mass_ton"] == 80  # rejected inputs kept
+    assert pd.isna(out.loc[3, "calc_mass_ton"])
+    assert "density" in out.loc[4, "calc_error"].lower() and pd.isna(out.loc[4, "calc_VCF"])
+    assert client.get(job["status_url"]).json()["result"]["errors"] == 4
+
+    job = _upload("fuel,tempC,volume_m3,mass_ton,rho15\n"
+                  "diesel,inf,100,,\n"
+                  "diesel,15,-inf,,\n"
+                  "diesel,15,,inf,\n"
+                  "diesel,15,100,,inf\n")
+    out = pd.read_csv(io.StringIO(client.get(job["result_url"]).text))
+    assert out["calc_error"].tolist() == ["'tempC' must be a finite number", "'volume_m3' must be a finite number",
+                                          "'mass_ton' must be a finite number", "'rho15' must be a finite number"]
+    assert out["calc_VCF"].isna().all()
+
+    failed = _upload("fuel,volume_m3\ndiesel,100\n")
+    status = client.get(failed["status_url"]).json()["result"]
+    assert status["status"] == "failed" and "tempc" in status["error"]
+    assert client.get(failed["result_url"]).status_code == 409
+
+
+def test_bulk_parquet_schema_is_stable_across_chunks(logged):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    source = pa.table({
+        "fuel": ["diesel", "diesel", "hfo", "hfo"],
+        "tempC": [15.0, 20.0, 25.0, 30.0],
+        "volume_m3": [100.0, 200.0, None, 300.0],
+        "mass_ton": [None, None, 80.0, None],
+        "tank_no": pa.array([1, 2, None, 4], pa.int64()),   # float64 in the chunk holding the null
+        "note": pa.array(["a", "b", None, None], pa.string()),  # all-null in the second chunk
+    })
+    buf = io.BytesIO()
+    pq.write_table(source, buf)
+
+    job = _upload(buf.getvalue(), name="tanks.parquet", chunk_rows=2)
+    assert client.get(job["status_url"]).json()["result"]["chunks"] == 2
+    out = pq.read_table(io.BytesIO(client.get(job["result_url"]).content))
+    assert out.num_rows == 4
+    assert out.schema.field("tank_no").type == pa.int64() and out["tank_no"].to_pylist() == [1, 2, None, 4]
+    assert out.schema.field("note").type == pa.string() and out["note"].to_pylist() == ["a", "b", None, None]
+    assert out.schema.field("calc_error").type == pa.string() and out["calc_error"].null_count == 4
+    assert out.schema.field("calc_VCF").type == pa.float64()
+
+
+def test_cancel_jobs_drops_queued_and_stops_running(logged, monkeypatch):
+    gate, started = threading.Event(), threading.Event()
+    correct = api_bulk.correct_frame
+
+    def slow(df):
+        started.set()
+        gate.wait(5)
+        return correct(df)
+
+    monkeypatch.setattr(api_bulk, "correct_frame", slow)
+    monkeypatch.setattr(api_bulk, "get_pool", lambda name, workers: get_pool("bulk-cancel-test", 1))  # one worker
+    sheet = _sheet(40)
+    jobs = [client.post("/bulk/correct", files={"file": ("tanks.csv", sheet, "text/csv")},
+                        params={"chunk_rows": 10}).json()["result"] for _ in range(2)]
+    started.wait(5)
+    running, queued = (api_bulk.get_job(j["job_id"]) for j in jobs)
+
+    assert api_bulk.cancel_jobs() == 2
+    gate.set()
+    running.future.result(5)
+    assert running.status == "cancelled" and running.chunks == 1 and not running.output.exists()
+    assert queued.status == "cancelled" and queued.future.cancelled() and not queued.source.exists()
+    assert client.get(jobs[0]["result_url"]).status_code == 409
+    get_pool("bulk-cancel-test").shutdown()
+
+
+def test_bulk_rejects_unknown_format_and_job(logged):
+    res = client.post("/bulk/correct", files={"file": ("tanks.xlsx", b"x", "application/octet-stream")})
+    assert res.status_code == 400 and "Unsupported" in res.json()["error"]
+    assert client.get("/bulk/jobs/nope").status_code == 404
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        res = client.post("/bulk/correct", files={"file": ("tanks.parquet", b"x", "application/octet-stream")})
+        assert res.status_code == 400 and "pyarrow" in res.json()["error"]
@@ -0,0 +1,89 @@
+"""
+fuel_mcp/tests/test_api_correlate.py
+====================================
+
+Tests for the /correlate endpoints:
+- POST /correlate/batch returns the same values as one GET per value
+- JSON and NDJSON bodies are both accepted; malformed bodies get a 400
+- batch errors carry their status: 400 / 404 / 422, 500 for internal failures
+- the prepared sorted arrays are built once per (table, column)
+"""
+
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fuel_mcp.api import api_correlate
+
+app = FastAPI()
+app.include_router(api_correlate.router)
+client = TestClient(app)
+
+TABLE = "ASTM_Table54B_Density15C_to_Short_and_Long_Tons_per_CubicMeter_norm"
+COLUMN = "Density_15C_kg_per_m3"
+VALUES = [600.0, 654.0, 850.25, 912.3, 991.7, 1100.0, 2000.0]
+
+
+def test_batch_matches_single_lookups():
+    res = client.post("/correlate/batch", json={"table": TABLE, "column": COLUMN, "values": VALUES})
+    assert res.status_code == 200, res.text
+    result = res.json()["result"]
+    assert result["count"] == len(VALUES)
+
+    clamped = 0
+    for i, value in enumerate(VALUES):
+        single = client.get("/correlate/", params={"table": TABLE, "column": COLUMN, "value": value}).json()
+        for col, y in single["result"]["outputs"].items():
+            assert result["outputs"][col][i] == y
+        assert result["clamped"][i] == single["result"]["_meta"]["clamped"]
+        clamped += result["clamped"][i]
+    assert result["_meta"]["clamped_count"] == clamped >= 2
+
+
+def test_batch_accepts_ndjson():
+    body = "\n".join(json.dumps(v) if i % 2 else json.dumps({"value": v}) for i, v in enumerate(VALUES))
+    res = client.post(
+        "/correlate/batch",
+        params={"table": TABLE, "column": COLUMN},
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert res.status_code == 200, res.text
+    assert res.json()["result"]["inputs"] == VALUES
+
+
+def test_batch_errors(monkeypatch):
+    cases = [
+        ({"values": VALUES}, 400),
+        ({"table": "nope", "column": "x", "values": [1]}, 404),
+        ({"table": TABLE, "column": "zz", "values": [1]}, 422),
+        ({"table": TABLE, "column": COLUMN, "values": ["a"]}, 422),
+        ({"table": TABLE, "column": COLUMN, "values": []}, 422),
+        ({"table": TABLE, "column": COLUMN, "values": [850, float("nan")]}, 422),
+        ({"table": TABLE, "column": COLUMN, "values": [1] * (api_correlate.MAX_BATCH_VALUES + 1)}, 422),
+    ]
+    for body, status in cases:
+        res = client.post("/correlate/batch", content=json.dumps(body), headers={"Content-Type": "application/json"})
+        assert res.status_code == status and "error" in res.json(), (body, res.text)
+
+    for body in ("abc", 12, True):  # valid JSON, but not an object / array
+        res = client.post("/correlate/batch", json=body)
+        assert res.status_code == 400 and "Invalid batch body" in res.json()["error"]
+    res = client.post("/correlate/batch", content=b"{broken", headers={"Content-Type": "application/json"})
+    assert res.status_code == 400
+
+    def broken(self, values):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(api_correlate.SortedTable, "interpolate", broken)
+    res = client.post("/correlate/batch", json={"table": TABLE, "column": COLUMN, "values": [850.0]})
+    assert res.status_code == 500 and "boom" in res.json()["error"]
+
+
+def test_sorted_arrays_prepared_once(monkeypatch):
+    api_correlate.clear_correlate_cache()
+    client.post("/correlate/batch", json={"table": TABLE, "column": COLUMN, "values": [850.0]})
+    monkeypatch.setattr(api_correlate, "_load_table", lambda file: (_ for _ in ()).throw(AssertionError("reloaded")))
+    res = client.post("/correlate/batch", json={"table": TABLE, "column": COLUMN, "values": VALUES})
+    assert "result" in res.json()
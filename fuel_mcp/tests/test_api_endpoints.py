@@ -19,6 +19,9 @@ def test_status_endpoint():
     data = res.json()
     assert "status" in data
     assert data["result"]["status"] == "ok"
+    assert data["result"]["connectivity"]["circuit"]["state"] in ("closed", "open", "half_open")
+    assert data["result"]["embedder"]["state"] in ("not_loaded", "loading", "ready", "failed")
+    assert 0.0 <= data["result"]["query_cache"]["hit_rate"] <= 1.0
 
 
 # =====================================================
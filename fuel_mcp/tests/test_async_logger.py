@@ -1,53 +1,59 @@
-
 """
 fuel_mcp/tests/test_async_logger.py
 ===================================
 
-Tests async and sync fallback behavior for async_logger.
+Tests the batched background log writer and sync fallback behavior of async_logger.
 """
 
 import asyncio
+import threading
+import time
+
 import pytest
 from fuel_mcp.core import async_logger
+from fuel_mcp.core.async_logger import LogWriter
 
 
-# -----------------------------------------------------
-# 🧠 TEST: Async query logging within event loop
-# -----------------------------------------------------
-@pytest.mark.asyncio
-async def test_async_query_logging(monkeypatch):
-    """Ensure async log_query_async schedules properly inside event loop."""
-    called = {}
+@pytest.fixture
+def captured(monkeypatch):
+    """Replace the SQLite batch insert with an in-memory recorder."""
+    batches = []
 
-    def fake_log_query(query, result, mode, success):
-        called["ok"] = (query, result, mode, success)
+    def fake_write_log_batch(queries, errors):
+        batches.append((list(queries), list(errors)))
+
+    monkeypatch.setattr(async_logger, "write_log_batch", fake_write_log_batch)
+    return batches
 
-    monkeypatch.setattr(async_logger, "log_query", fake_log_query)
 
+# -----------------------------------------------------
+# 🧠 TEST: Query logging goes through the writer
+# -----------------------------------------------------
+@pytest.mark.asyncio
+async def test_async_query_logging(captured):
+    """Ensure log_query_async hands the record to the background writer."""
     async_logger.log_query_async("test_query", {"a": 1}, "test_mode", True)
-    await asyncio.sleep(0.1)  # allow task to run
+    assert async_logger.get_writer().flush()
 
-    assert "ok" in called
-    assert called["ok"][0] == "test_query"
-    assert called["ok"][2] == "test_mode"
+    queries = [row for q, _ in captured for row in q]
+    assert queries[-1][1:] == ("test_query", "test_mode", "{'a': 1}", 1)
 
 
 # -----------------------------------------------------
-# ⚡ TEST: Sync fallback when no event loop is active
+# ⚡ TEST: Sync fallback when the writer cannot be used
 # -----------------------------------------------------
 def test_sync_fallback(monkeypatch):
-    """Ensure log_query_async runs synchronously when no event loop is active."""
+    """Ensure log_query_async writes synchronously if queueing fails."""
     called = {}
 
     def fake_log_query(query, result, mode, success):
         called["sync"] = True
 
-    monkeypatch.setattr(async_logger, "log_query", fake_log_query)
+    def broken_submit(record):
+        raise RuntimeError("writer unavailable")
 
-    # Force RuntimeError to simulate missing event loop
-    monkeypatch.setattr(async_logger, "asyncio", type("FakeAsyncio", (), {
-        "create_task": staticmethod(lambda *_: (_ for _ in ()).throw(RuntimeError("no loop"))),
-    }))
+    monkeypatch.setattr(async_logger, "log_query", fake_log_query)
+    monkeypatch.setattr(async_logger.get_writer(), "submit", broken_submit)
 
     async_logger.log_query_async("test_fallback", {}, "sync_test", True)
     assert "sync" in called
@@ -57,18 +63,113 @@ def test_sync_fallback(monkeypatch):
 # 🧱 TEST: Async error logging (module + message)
 # -----------------------------------------------------
 @pytest.mark.asyncio
-async def test_async_error_logging(monkeypatch):
-    """Ensure async error log schedules properly."""
-    called = {}
+async def test_async_error_logging(captured):
+    """Ensure error records are queued with module and message."""
+    async_logger.log_error_async("core", "simulated failure")
+    assert async_logger.get_writer().flush()
 
-    def fake_log_error(module, message):
-        called["err"] = (module, message)
+    errors = [row for _, e in captured for row in e]
+    assert errors[-1][1] == "core"
+    assert "failure" in errors[-1][2]
 
-    monkeypatch.setattr(async_logger, "log_error", fake_log_error)
 
-    async_logger.log_error_async("core", "simulated failure")
-    await asyncio.sleep(0.1)
+# -----------------------------------------------------
+# 📦 TEST: Records are grouped into size-bounded batches
+# -----------------------------------------------------
+def test_records_written_in_batches(captured):
+    writer = LogWriter(batch_size=50, flush_interval=5.0)
+    writer.start()
+    for i in range(120):
+        writer.submit(("query", (str(i), f"q{i}", "test", "{}", 1)))
+    writer.submit(("error", ("t", "core", "boom", "")))
+    assert writer.stop()
+
+    assert [row[1] for q, _ in captured for row in q] == [f"q{i}" for i in range(120)]
+    assert max(len(q) + len(e) for q, e in captured) == 50
+    stats = writer.stats()
+    assert stats["written"] == 121
+    assert stats["batches"] == len(captured) == 3
+    assert stats["queue_depth"] == 0
+
 
-    assert "err" in called
-    assert called["err"][0] == "core"
-    assert "failure" in called["err"][1]
\ No newline at end of file
+# -----------------------------------------------------
+# 🚦 TEST: Backpressure policies
+# -----------------------------------------------------
+def _blocked_writer(monkeypatch, **kwargs):
+    """Writer whose first batch waits on an event, so the queue fills up."""
+    release = threading.Event()
+    monkeypatch.setattr(async_logger, "write_log_batch", lambda q, e: release.wait(5))
+    writer = LogWriter(batch_size=1, flush_interval=0.01, **kwargs)
+    writer.start()
+    writer.submit(("query", ("t", "first", "test", "{}", 1)))
+    while writer.queue.qsize():  # wait until the writer is stuck on the first batch
+        time.sleep(0.001)
+    return writer, release
+
+
+def test_drop_policy_counts_dropped(monkeypatch):
+    writer, release = _blocked_writer(monkeypatch, maxsize=10, policy="drop")
+    accepted = sum(writer.submit(("query", ("t", f"q{i}", "test", "{}", 1))) for i in range(30))
+    assert accepted == 10
+    assert writer.stats()["dropped"] == 30 - accepted
+    release.set()
+    assert writer.stop()
+
+
+def test_sample_policy_keeps_one_in_n(monkeypatch):
+    writer, release = _blocked_writer(monkeypatch, maxsize=100, policy="sample", sample_rate=5)
+    for i in range(200):
+        writer.submit(("query", ("t", f"q{i}", "test", "{}", 1)))
+    stats = writer.stats()
+    assert stats["sampled_out"] > 0
+    assert stats["enqueued"] + stats["sampled_out"] + stats["dropped"] == 201
+    release.set()
+    assert writer.stop()
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        LogWriter(policy="shrug")
+
+
+def test_unknown_env_policy_falls_back_to_drop(caplog):
+    assert async_logger._resolve_policy(" Block ") == "block"
+    with caplog.at_level("WARNING"):
+        assert async_logger._resolve_policy("shrug") == "drop"
+    assert "MCP_LOG_POLICY" in caplog.text
+
+
+def test_block_policy_defers_event_loop_callers(monkeypatch):
+    writer, release = _blocked_writer(monkeypatch, maxsize=1, policy="block", block_timeout=2)
+    assert writer.submit(("query", ("t", "fills", "test", "{}", 1)))
+
+    async def on_loop():
+        started = time.perf_counter()
+        accepted = writer.submit(("query", ("t", "async", "test", "{}", 1)))
+        return accepted, time.perf_counter() - started
+
+    accepted, waited = asyncio.run(on_loop())
+    assert accepted is True and waited < 0.1  # the loop never waits; an io thread does
+    assert writer.stats()["deferred"] == 1 and writer.stats()["dropped"] == 0
+    release.set()
+    assert writer.stop()
+    stats = writer.stats()
+    assert stats["written"] == 3 and stats["enqueued"] == 3 and stats["dropped"] == 0
+
+
+def test_block_policy_timeouts_drop(monkeypatch):
+    writer, release = _blocked_writer(monkeypatch, maxsize=1, policy="block", block_timeout=0.2)
+    assert writer.submit(("query", ("t", "fills", "test", "{}", 1)))
+
+    async def on_loop():
+        return writer.submit(("query", ("t", "async", "test", "{}", 1)))
+
+    assert asyncio.run(on_loop()) is True
+    started = time.perf_counter()
+    assert writer.submit(("query", ("t", "thread", "test", "{}", 1))) is False  # off the loop: waits, then drops
+    assert time.perf_counter() - started >= 0.15
+    with writer._settled:
+        assert writer._settled.wait_for(lambda: not writer._waiting, 2)
+    assert writer.stats()["dropped"] == 2  # the deferred record timed out on its io thread too
+    release.set()
+    assert writer.stop()
@@ -12,7 +12,7 @@ import sqlite3
 from io import StringIO
 from contextlib import redirect_stdout
 from fuel_mcp.core import cli
-from fuel_mcp.core.db_logger import DB_PATH, init_db
+from fuel_mcp.core.db_logger import DB_PATH, close_connections, init_db
 
 
 def setup_module(module):
@@ -53,5 +53,7 @@ def test_db_vacuum_effectiveness():
 
 def teardown_module(module):
     """Cleanup DB after test."""
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
\ No newline at end of file
+    close_connections()  # checkpoint WAL before the file goes away
+    for path in (DB_PATH, f"{DB_PATH}-wal", f"{DB_PATH}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+fuel_mcp/tests/test_compiled_store.py
+=====================================
+
+Tests for the compiled (memory-mapped) table store:
+- compiled columns round-trip the CSV exactly
+- loads are memory maps, not parsed copies
+- a changed CSV is detected and rebuilt on the next load
+- repeat loads reuse the cached manifest until the CSV changes
+- missing text cells load as None, not the string "nan"
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from fuel_mcp.tables import compiled_store
+from fuel_mcp.tables.compiled_store import compile_all, is_stale, load_columns, load_frame, read_manifest
+
+TABLE = "ASTM_Table54B_Density15C_to_Short_and_Long_Tons_per_CubicMeter_norm.csv"
+
+
+def _dirs(tmp_path):
+    src, out = tmp_path / "normalized", tmp_path / "compiled"
+    src.mkdir()
+    return src, out
+
+
+def test_compiled_table_matches_csv(tmp_path):
+    src, out = _dirs(tmp_path)
+    (src / TABLE).write_bytes((compiled_store.NORM_DIR / TABLE).read_bytes())
+
+    assert compile_all(src, out) == [TABLE]
+    manifest = read_manifest(TABLE, out)
+    expected = pd.read_csv(src / TABLE)
+    assert manifest["rows"] == len(expected)
+    assert [c["name"] for c in manifest["columns"]] == list(expected.columns)
+    assert manifest["columns"][0]["sort_order"] == "ascending"
+
+    frame = load_frame(TABLE, src_dir=src, out_dir=out)
+    for col in expected.columns:
+        assert frame[col].dtype == expected[col].dtype
+        assert np.array_equal(np.asarray(frame[col]), expected[col].to_numpy())
+
+
+def test_load_is_memory_mapped_and_up_to_date(tmp_path):
+    src, out = _dirs(tmp_path)
+    pd.DataFrame({"x": [1.0, 2.0], "y": [3.0, 4.0]}).to_csv(src / "t.csv", index=False)
+    compile_all(src, out)
+
+    columns = load_columns("t.csv", src_dir=src, out_dir=out)
+    assert isinstance(columns["x"], np.memmap)
+    assert not is_stale(src / "t.csv", out)
+    assert compile_all(src, out) == []
+
+
+def test_stale_artifact_rebuilt_on_load(tmp_path):
+    src, out = _dirs(tmp_path)
+    csv = src / "t.csv"
+    pd.DataFrame({"x": [1.0, 2.0], "y": [3.0, 4.0]}).to_csv(csv, index=False)
+    compile_all(src, out)
+
+    pd.DataFrame({"x": [1.0, 2.0, 3.0], "y": [5.0, 6.0, 7.0]}).to_csv(csv, index=False)
+    assert is_stale(csv, out)
+    columns = load_columns("t.csv", src_dir=src, out_dir=out)
+    assert columns["y"].tolist() == [5.0, 6.0, 7.0]
+    assert len(list((out / "t").glob("col_*.npy"))) == 2  # old build cleaned up
+
+
+def test_touched_but_unchanged_csv_not_rebuilt(tmp_path):
+    src, out = _dirs(tmp_path)
+    csv = src / "t.csv"
+    pd.DataFrame({"x": [1.0, 2.0]}).to_csv(csv, index=False)
+    compile_all(src, out)
+    os.utime(csv, ns=(1_000_000_000, 1_000_000_000))
+
+    assert compile_all(src, out) == []
+    assert read_manifest("t.csv", out)["source_mtime_ns"] == 1_000_000_000
+
+
+def test_repeat_loads_use_cached_manifest(tmp_path, monkeypatch):
+    src, out = _dirs(tmp_path)
+    csv = src / "t.csv"
+    pd.DataFrame({"x": [1.0, 2.0]}).to_csv(csv, index=False)
+    load_columns("t.csv", src_dir=src, out_dir=out)
+
+    def no_manifest_reads(*args, **kwargs):
+        raise AssertionError("manifest re-read")
+
+    monkeypatch.setattr(compiled_store, "read_manifest", no_manifest_reads)
+    monkeypatch.setattr(compiled_store, "is_stale", no_manifest_reads)
+    assert load_columns("t.csv", src_dir=src, out_dir=out)["x"].tolist() == [1.0, 2.0]
+
+    monkeypatch.undo()
+    pd.DataFrame({"x": [1.0, 2.0, 3.0]}).to_csv(csv, index=False)  # new size/mtime → checked again
+    assert load_columns("t.csv", src_dir=src, out_dir=out)["x"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_missing_text_cells_load_as_none(tmp_path):
+    src, out = _dirs(tmp_path)
+    (src / "t.csv").write_text("x,fuel,note\n1,diesel,\n2,,ok\n3,hfo,\n")
+    expected = [["diesel", None, "hfo"], [None, "ok", None]]
+
+    columns = load_columns("t.csv", src_dir=src, out_dir=out)
+    assert [columns["fuel"].tolist(), columns["note"].tolist()] == expected
+    assert isinstance(columns["x"], np.memmap)
+
+    compiled_store.clear_manifest_cache()
+    frame = load_frame("t.csv", src_dir=src, out_dir=out)
+    assert frame["fuel"].isna().tolist() == [False, True, False]
+    assert "nan" not in frame["note"].tolist()
@@ -0,0 +1,160 @@
+"""
+fuel_mcp/tests/test_connectivity.py
+===================================
+
+Tests for the connectivity manager used by rag_bridge:
+- no network probe at import; probe results are cached for the TTL
+- only the first probe runs inline; expired results refresh in the background
+- the circuit breaker opens after repeated failures and recovers
+- find_table_for_query falls back offline without staying offline forever
+"""
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from fuel_mcp.core import rag_bridge
+from fuel_mcp.core.connectivity import CircuitBreaker, ConnectivityManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_import_does_not_probe():
+    code = "from fuel_mcp.core import rag_bridge; print(rag_bridge.get_connectivity().probes)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "0"
+
+
+def test_probe_cached_for_ttl():
+    clock, calls = FakeClock(), []
+    manager = ConnectivityManager(probe=lambda: calls.append(1) or True, ttl=60, clock=clock)
+
+    assert manager.status()["reachable"] is None
+    for _ in range(10):
+        assert manager.is_reachable()
+    assert len(calls) == 1
+
+    clock.now += 61
+    assert manager.is_reachable()  # stale: last result served, refreshed in the background
+    manager._thread.join(5)
+    assert len(calls) == 2 and manager.status()["probe_age_seconds"] == 0
+
+
+def test_expired_probe_never_blocks_the_caller():
+    clock, release, calls = FakeClock(), threading.Event(), []
+
+    def probe():  # first probe: reachable; the refresh hangs, then reports offline
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return len(calls) == 1
+
+    manager = ConnectivityManager(probe=probe, ttl=60, clock=clock)
+    assert manager.is_reachable()  # first probe inline
+
+    clock.now += 61
+    started = time.perf_counter()
+    assert manager.is_reachable() is True  # slow refresh still running
+    assert time.perf_counter() - started < 0.5
+    release.set()
+    manager._thread.join(5)
+    assert manager.is_reachable() is False and manager.probes == 2
+
+
+def test_first_blocking_call_waits_for_running_probe():
+    calls = []
+
+    def slow_probe():
+        calls.append(1)
+        time.sleep(0.05)
+        return True
+
+    manager = ConnectivityManager(probe=slow_probe, ttl=60)
+    manager.probe_async()  # like the lifespan startup probe
+    assert manager.is_reachable() is True
+    assert len(calls) == 1
+
+
+def test_background_probe_returns_last_known():
+    manager = ConnectivityManager(probe=lambda: True, ttl=60)
+    assert manager.is_reachable(block=False) is False  # unknown yet, probe started
+    manager._thread.join(5)
+    assert manager.is_reachable(block=False) is True
+    assert manager.probes == 1
+
+
+def test_probe_exception_counts_as_offline():
+    def boom():
+        raise OSError("no route")
+
+    assert ConnectivityManager(probe=boom).is_reachable() is False
+
+
+def test_breaker_opens_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=2, cooldown=30, clock=clock)
+
+    breaker.record_failure(TimeoutError())
+    assert breaker.allow()
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.status()["last_error"] == "TimeoutError"
+
+    clock.now += 31
+    assert breaker.allow()  # single half-open trial
+    assert not breaker.allow()
+    breaker.record_failure("still down")
+    assert breaker.state == "open"
+
+    clock.now += 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_find_table_falls_back_then_recovers(monkeypatch):
+    clock = FakeClock()
+    manager = ConnectivityManager(probe=lambda: True, ttl=3600,
+                                  breaker=CircuitBreaker(threshold=1, cooldown=30, clock=clock), clock=clock)
+    monkeypatch.setattr(rag_bridge, "_CONNECTIVITY", manager)
+    monkeypatch.setattr(rag_bridge, "ONLINE_MODE", None)
+    monkeypatch.setattr(rag_bridge, "find_table_offline", lambda q, k: [{"table": "offline"}])
+
+    online = {"fail": True, "calls": 0}
+
+    def fake_online(q, k):
+        online["calls"] += 1
+        if online["fail"]:
+            raise ConnectionError("api down")
+        return [{"table": "online"}]
+
+    monkeypatch.setattr(rag_bridge, "find_table_online", fake_online)
+
+    assert rag_bridge.find_table_for_query("q")[0]["table"] == "offline"
+    assert rag_bridge.current_mode() == "offline"
+    assert rag_bridge.find_table_for_query("q")[0]["table"] == "offline"
+    assert online["calls"] == 1  # breaker open: no second online attempt
+
+    online["fail"] = False
+    clock.now += 31
+    assert rag_bridge.find_table_for_query("q")[0]["table"] == "online"
+    assert rag_bridge.current_mode() == "online"
+    assert rag_bridge.connectivity_status()["circuit"]["state"] == "closed"
+
+
+@pytest.mark.parametrize("forced", [True, False])
+def test_forced_mode_skips_probe(monkeypatch, forced):
+    manager = ConnectivityManager(probe=lambda: pytest.fail("probe should not run"))
+    monkeypatch.setattr(rag_bridge, "_CONNECTIVITY", manager)
+    monkeypatch.setattr(rag_bridge, "ONLINE_MODE", forced)
+    assert rag_bridge.use_online() is forced
+    assert rag_bridge.connectivity_status()["override"] == ("on" if forced else "off")
@@ -36,3 +36,24 @@ def test_vcf_official_full():
         assert "VCF" in (result.keys() or [])
     except Exception as e:
         pytest.fail(f"vcf_official_full failed: {e}")
+
+
+def test_table_cache_matches_pandas_nearest_row():
+    """Cached searchsorted lookup must pick the same row as the old idxmin scan."""
+    table_name = "ASTM_Table54B_Density15C_to_Short_and_Long_Tons_per_CubicMeter_norm.csv"
+    df = conversion_engine.load_table_from_registry(table_name)
+    x = df["density_15c_kg_per_m3"]
+    for value in (600, 654, 850, 850.5, 912.3, 1100, 2000):
+        idx = (x - value).abs().idxmin()
+        result = conversion_dispatcher.convert("density_to_mass", value)
+        assert result["short_tons_per_m3"] == float(df["short_tons_per_cubicmeter"].iloc[idx])
+        assert result["long_tons_per_m3"] == float(df["long_tons_per_cubicmeter"].iloc[idx])
+
+
+def test_table_cache_loads_csv_once(monkeypatch):
+    conversion_engine.clear_table_cache()
+    conversion_engine.warm_table_cache()
+    monkeypatch.setattr(conversion_engine, "load_columns",
+                        lambda name: pytest.fail(f"Table re-read for {name}"))
+    for conversion_type, value in (("density_to_mass", 980), ("density_to_volume", 850), ("air_correction", 0.84)):
+        assert conversion_dispatcher.convert(conversion_type, value)["input_density_15C"] == value
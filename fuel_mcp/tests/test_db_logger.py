@@ -0,0 +1,87 @@
+"""
+fuel_mcp/tests/test_db_logger.py
+================================
+
+Tests for the pooled SQLite connection in db_logger:
+- one WAL-mode connection per thread, reused across inserts
+- schema DDL runs once per database file
+- concurrent writer threads never hit "database is locked"
+- a deleted database file is recreated transparently
+- close_connections() also retires other threads' cached connections
+"""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fuel_mcp.core import db_logger
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    db = tmp_path / "history.db"
+    monkeypatch.setattr(db_logger, "DB_PATH", db)
+    yield db
+    db_logger.close_connections()
+
+
+def _count(db, table):
+    with sqlite3.connect(db) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_connection_reused_in_wal_mode(temp_db):
+    conn = db_logger.get_connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == db_logger.BUSY_TIMEOUT_MS
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    for i in range(20):
+        db_logger.log_query(f"q{i}", {"ok": i}, "test", True)
+        db_logger.log_error("test", f"e{i}")
+    assert db_logger.get_connection() is conn
+    assert not [s for s in statements if "CREATE TABLE" in s]
+    assert _count(temp_db, "queries") == 20
+    assert _count(temp_db, "errors") == 20
+
+
+def test_concurrent_writers(temp_db):
+    db_logger.init_db()
+    failures = []
+
+    def writer(n):
+        try:
+            for i in range(50):
+                db_logger.log_query(f"t{n}-{i}", {}, "test", True)
+        except sqlite3.Error as e:
+            failures.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not failures
+    assert _count(temp_db, "queries") == 400
+
+
+def test_recreates_deleted_database(temp_db):
+    db_logger.log_query("before", {}, "test", True)
+    db_logger.close_connections()
+    temp_db.unlink()
+
+    db_logger.log_query("after", {}, "test", True)
+    assert [row[1] for row in db_logger.get_recent_queries(5)] == ["after"]
+
+
+def test_other_threads_reconnect_after_close_connections(temp_db):
+    with ThreadPoolExecutor(1) as pool:  # a long-lived worker, like the API's io pool
+        first = pool.submit(db_logger.get_connection).result()
+        db_logger.close_connections()
+        second = pool.submit(db_logger.get_connection).result()
+        assert second is not first
+        assert pool.submit(lambda: second.execute("SELECT 1").fetchone()[0]).result() == 1
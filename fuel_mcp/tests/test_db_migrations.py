@@ -0,0 +1,128 @@
+"""
+fuel_mcp/tests/test_db_migrations.py
+====================================
+
+Tests for db_logger schema migrations and keyset-paged history:
+- new and pre-versioning databases are migrated to SCHEMA_VERSION on open
+- history / error indexes exist and are used by the paging queries
+- query_history() / error_history() page with before_id and filter by
+  mode, success, module and time range
+- /history and /errors return next_before_id cursors; limit is capped
+- `mcp-cli db migrate` reports the applied steps
+"""
+
+import sqlite3
+from datetime import datetime, timezone, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fuel_mcp.api.mcp_api import MAX_PAGE_SIZE, app
+from fuel_mcp.core import cli, db_logger
+
+client = TestClient(app)
+
+INDEXES = {"idx_queries_timestamp", "idx_queries_mode_success", "idx_errors_timestamp", "idx_errors_module_id"}
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    db = tmp_path / "history.db"
+    monkeypatch.setattr(db_logger, "DB_PATH", db)
+    monkeypatch.setattr(cli, "DB_PATH", db)
+    yield db
+    db_logger.close_connections()
+
+
+def _indexes(conn):
+    return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def _seed(n=25):
+    queries = [(f"2026-03-{1 + i // 5:02d}T12:00:00+00:00", f"q{i}", "vcf" if i % 2 else "convert", "{}", i % 3 != 0)
+               for i in range(n)]
+    errors = [(f"2026-03-{1 + i // 5:02d}T12:00:00+00:00", "api" if i % 2 else "parser", f"e{i}", "")
+              for i in range(n)]
+    db_logger.write_log_batch(queries, errors)
+
+
+def test_new_database_is_fully_migrated(temp_db):
+    conn = db_logger.get_connection()
+    assert db_logger.schema_version(conn) == db_logger.SCHEMA_VERSION
+    assert INDEXES <= _indexes(conn)
+    assert db_logger.migrate(conn) == []  # idempotent
+
+    plan = " ".join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM errors WHERE module = ? AND id < ? ORDER BY id DESC LIMIT 5", ("api", 9)))
+    assert "idx_errors_module_id" in plan and "TEMP B-TREE" not in plan
+
+
+def test_unversioned_database_is_migrated_and_counters_rebuilt(temp_db):
+    legacy = sqlite3.connect(temp_db)
+    with legacy:
+        for ddl in (*db_logger.SCHEMA, *db_logger.COUNTER_SCHEMA):  # tables from before user_version
+            legacy.execute(ddl)
+        legacy.executemany(
+            "INSERT INTO queries (timestamp, query, mode, result, success) VALUES (?, ?, ?, ?, ?)",
+            [("2025-12-31T00:00:00", f"old{i}", "vcf", "{}", 1) for i in range(4)],
+        )
+        legacy.execute("UPDATE query_counters SET count = 99")  # drift from an earlier build
+    assert legacy.execute("PRAGMA user_version").fetchone()[0] == 0
+    legacy.close()
+
+    conn = db_logger.get_connection()
+    assert db_logger.schema_version(conn) == db_logger.SCHEMA_VERSION
+    assert INDEXES <= _indexes(conn)
+    assert db_logger.get_query_counts(conn) == {"total": 4, "successful": 4, "failed": 0}
+
+
+def test_keyset_pages_and_filters(temp_db):
+    _seed()
+    ids, before = [], None
+    while True:
+        page = db_logger.query_history(10, before_id=before)
+        ids += [row[0] for row in page]
+        if len(page) < 10:
+            break
+        before = page[-1][0]
+    assert ids == list(range(25, 0, -1))
+
+    rows = db_logger.query_history(50, mode="vcf", success=False)
+    assert rows and all(r[3] == "vcf" and r[4] == 0 for r in rows)
+
+    since = datetime(2026, 3, 2, tzinfo=timezone(timedelta(hours=2)))  # 2026-03-01T22:00Z
+    until = "2026-03-04"
+    rows = db_logger.query_history(50, since=since, until=until)
+    assert {r[1][:10] for r in rows} == {"2026-03-02", "2026-03-03"}
+
+    rows = db_logger.error_history(3, before_id=20, module="api")
+    assert [r[0] for r in rows] == [18, 16, 14] and {r[2] for r in rows} == {"api"}
+
+
+def test_api_cursor_pagination(temp_db):
+    _seed()
+    res = client.get("/history", params={"limit": 10, "mode": "convert"})
+    assert res.status_code == 200
+    data = res.json()
+    assert data["entries"] == data["result"]["entries"] and len(data["entries"]) == 10
+    assert {e["mode"] for e in data["entries"]} == {"convert"}
+
+    second = client.get("/history", params={"limit": 10, "mode": "convert",
+                                            "before_id": data["next_before_id"]}).json()
+    assert len(second["entries"]) == 3 and second["next_before_id"] is None
+    assert second["entries"][0]["id"] < data["entries"][-1]["id"]
+
+    errors = client.get("/errors", params={"module": "parser", "since": "2026-03-05T00:00:00Z", "limit": 2}).json()
+    assert [e["id"] for e in errors["result"]["entries"]] == [25, 23] and errors["next_before_id"] == 23
+
+    assert client.get("/history", params={"limit": MAX_PAGE_SIZE + 1}).status_code == 422
+
+
+def test_cli_migrate(temp_db, capsys):
+    sqlite3.connect(temp_db).close()  # empty, unversioned file
+    cli.db_migrate()
+    out = capsys.readouterr().out
+    assert f"0 → {db_logger.SCHEMA_VERSION}" in out and "Applied: 1, 2, 3" in out
+
+    cli.db_migrate()
+    assert "already up to date" in capsys.readouterr().out
@@ -0,0 +1,114 @@
+"""
+fuel_mcp/tests/test_embedding_cache.py
+======================================
+
+Tests for the shared LRU cache and the RAG query-embedding cache:
+- LRU eviction, TTL expiry and hit/miss counters
+- queries differing only in quantities share one embedding; table IDs
+  (53B vs 54B, 11 vs 12) keep distinct keys
+- a cache miss embeds the real query text, not the template
+- the cache survives a save/load round trip
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from fuel_mcp.core import rag_bridge
+from fuel_mcp.core.cache import LRUCache
+from fuel_mcp.core.rag_bridge import EmbeddingCache, normalize_query
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.set("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert (stats["hits"], stats["misses"]) == (1, 0)
+
+
+def test_lru_ttl_expiry():
+    now = [0.0]
+    cache = LRUCache(maxsize=10, ttl=5, clock=lambda: now[0])
+    cache.set("k", "v")
+    now[0] = 4.9
+    assert cache.get("k") == "v"
+    now[0] = 5.0
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1 and len(cache) == 0
+
+
+def test_get_or_set_computes_once():
+    cache, calls = LRUCache(maxsize=4), []
+    for _ in range(3):
+        assert cache.get_or_set("x", lambda: calls.append(1) or 42) == 42
+    assert len(calls) == 1
+    assert cache.stats()["hit_rate"] == round(2 / 3, 4)
+
+
+def test_normalize_query_masks_numbers():
+    assert normalize_query("Calculate VCF for diesel at 25°C") == "calculate vcf for diesel at <num>°c"
+    assert normalize_query("  convert 1,000.5  L  at -3.5 C ") == "convert <num> l at <num> c"
+    assert normalize_query("VCF diesel 25") == normalize_query("vcf DIESEL 30.75")
+
+
+def test_normalize_query_keeps_table_ids():
+    assert normalize_query("Use table 53B for density 850") == "use table 53b for density <num>"
+    assert normalize_query("Use table 53B for density 850") != normalize_query("Use table 54B for density 850")
+    assert normalize_query("ASTM table 11 long tons") != normalize_query("ASTM table 12 long tons")
+    assert normalize_query("ASTM 11 long tons") != normalize_query("ASTM 12 long tons")
+    assert normalize_query("Table54B at 25C") == normalize_query("table54b at 40c")
+
+
+def test_offline_embeddings_shared_across_numbers(monkeypatch):
+    cache = EmbeddingCache(maxsize=16, path=None)
+    monkeypatch.setattr(rag_bridge, "_EMBED_CACHE", cache)
+    calls = []
+    real = rag_bridge.embed_query_offline
+
+    def counting(query, dim=1536):
+        calls.append(query)
+        return real(query, dim)
+
+    monkeypatch.setattr(rag_bridge, "embed_query_offline", counting)
+    hits = [rag_bridge.find_table_offline(f"calculate VCF for diesel at {t}°C", top_k=3) for t in (15, 25, 37.5)]
+
+    assert calls == ["calculate VCF for diesel at 15°C"]  # first miss embeds the real text
+    assert hits[0] == hits[1] == hits[2]
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_online_embeddings_skip_api_roundtrip(monkeypatch):
+    cache = EmbeddingCache(maxsize=16, path=None)
+    monkeypatch.setattr(rag_bridge, "_EMBED_CACHE", cache)
+    index = rag_bridge.get_vector_index()
+    index.refresh()
+    inputs = []
+
+    def create(model, input):
+        inputs.append(input)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=index.matrix[0].tolist())])
+
+    monkeypatch.setattr(rag_bridge, "client", SimpleNamespace(embeddings=SimpleNamespace(create=create)))
+    for mass in (100, 250, 975):
+        assert rag_bridge.find_table_online(f"convert {mass} t of HFO to m3", top_k=1)
+    assert inputs == ["convert 100 t of HFO to m3"]
+
+
+def test_persistence_round_trip(tmp_path):
+    path = tmp_path / "embedding_cache.npz"
+    cache = EmbeddingCache(maxsize=8, path=path)
+    cache.put("local:test", 4, "vcf diesel <num>", [1, 0, 0, 0])
+    cache.put("local:test", 4, "density <num>", [0, 1, 0, 0])
+    cache.put("openai:x", 0, "vcf diesel <num>", np.arange(6))
+    assert cache.save() == 3
+
+    restored = EmbeddingCache(maxsize=8, path=path)
+    assert np.array_equal(restored.get("local:test", 4, "density <num>"), [0, 1, 0, 0])
+    assert np.array_equal(restored.get("openai:x", 0, "vcf diesel <num>"), np.arange(6))
+    assert restored.get("local:test", 8, "density <num>") is None
+    assert restored.stats()["size"] == 3 and restored.stats()["persisted"]
@@ -0,0 +1,95 @@
+"""
+fuel_mcp/tests/test_event_log.py
+================================
+
+Tests for the append-only JSON Lines event sink:
+- buffered appends are flushed by size, interval and tail()
+- tail(n) reads from the end, across rotated files
+- concurrent writer processes never produce torn lines
+"""
+
+import json
+import multiprocessing
+import time
+
+from fuel_mcp.core import event_log
+from fuel_mcp.core.event_log import JsonlEventLog
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_buffered_until_full(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = JsonlEventLog(path, buffer_events=5, flush_interval=0)
+    log.flush_interval = 60  # no timer-driven flush during the test
+    for i in range(4):
+        log.append({"i": i})
+    assert not path.exists()
+
+    log.append({"i": 4})
+    assert [e["i"] for e in _lines(path)] == [0, 1, 2, 3, 4]
+    assert log.stats()["pending"] == 0
+
+
+def test_interval_flush(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = JsonlEventLog(path, buffer_events=100, flush_interval=0.05)
+    log.append({"event": "x"})
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _lines(path) == [{"event": "x"}]
+
+
+def test_tail_reads_from_end(tmp_path, monkeypatch):
+    monkeypatch.setattr(event_log, "_BLOCK", 64)  # force several backward reads
+    path = tmp_path / "events.jsonl"
+    log = JsonlEventLog(path, buffer_events=50, max_bytes=10**9)
+    for i in range(500):
+        log.append({"i": i, "detail": "x" * (i % 7)})
+
+    assert [e["i"] for e in log.tail(3)] == [497, 498, 499]
+    assert [e["i"] for e in log.tail(120)] == list(range(380, 500))
+    assert len(log.tail(10_000)) == 500
+    assert log.tail(0) == []
+
+
+def test_rotation_and_tail_across_files(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = JsonlEventLog(path, buffer_events=1, max_bytes=200, backups=2)
+    for i in range(100):
+        log.append({"i": i})
+
+    assert path.stat().st_size <= 200
+    assert (tmp_path / "events.jsonl.1").exists() and (tmp_path / "events.jsonl.2").exists()
+    assert not (tmp_path / "events.jsonl.3").exists()
+    assert log.stats()["rotations"] > 2
+
+    kept = _lines(tmp_path / "events.jsonl.2") + _lines(tmp_path / "events.jsonl.1") + _lines(path)
+    assert [e["i"] for e in kept] == list(range(100 - len(kept), 100))
+    assert [e["i"] for e in log.tail(len(kept))] == [e["i"] for e in kept]
+
+
+def _writer(path, worker):
+    log = JsonlEventLog(path, buffer_events=7, flush_interval=0, max_bytes=10**9)
+    log.flush_interval = 60
+    for i in range(300):
+        log.append({"worker": worker, "i": i, "pad": "y" * 50})
+    log.flush()
+
+
+def test_concurrent_processes_append_whole_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_writer, args=(str(path), w)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+
+    events = _lines(path)  # raises if any line were torn
+    assert len(events) == 1200
+    for w in range(4):
+        assert [e["i"] for e in events if e["worker"] == w] == list(range(300))
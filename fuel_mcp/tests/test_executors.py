@@ -0,0 +1,105 @@
+"""
+test_executors.py
+=================
+Named thread pools used by the async API (core.executors):
+- tasks run on the named pool's threads with context variables carried over
+- submitted / active / queued / completed / failed counters and utilization
+- shutdown() is recoverable (next submit starts new workers)
+- shutdown(cancel_futures=True) drops queued tasks instead of running them
+- /status reports the pools; handlers offload to them
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fuel_mcp.api.mcp_api import app
+from fuel_mcp.core.executors import InstrumentedPool, get_pool, pool_stats
+
+client = TestClient(app)
+_var = contextvars.ContextVar("test_var", default="unset")
+
+
+def test_run_uses_pool_threads_and_context():
+    pool = InstrumentedPool("unit", 2)
+
+    async def main():
+        _var.set("carried")
+        return await pool.run(lambda: (threading.current_thread().name, _var.get()))
+
+    name, value = asyncio.run(main())
+    assert name.startswith("mcp-unit") and value == "carried"
+    stats = pool.stats()
+    assert stats["submitted"] == stats["completed"] == 1 and stats["failed"] == 0
+    pool.shutdown()
+
+
+def test_counters_queue_depth_and_failures():
+    pool = InstrumentedPool("unit", 1)
+    gate = threading.Event()
+    started = threading.Event()
+
+    def blocker():
+        started.set()
+        gate.wait(5)
+        time.sleep(0.01)
+
+    first = pool.submit(blocker)
+    started.wait(5)
+    queued = [pool.submit(lambda: 1) for _ in range(3)]
+    stats = pool.stats()
+    assert stats["active"] == 1 and stats["queued"] == 3 and stats["peak_queued"] >= 3
+
+    gate.set()
+    first.result(5)
+    assert [f.result(5) for f in queued] == [1, 1, 1]
+    with pytest.raises(ZeroDivisionError):
+        pool.submit(lambda: 1 / 0).result(5)
+
+    stats = pool.stats()
+    assert stats["completed"] == 4 and stats["failed"] == 1
+    assert stats["active"] == stats["queued"] == 0
+    assert stats["busy_seconds"] > 0 and 0 < stats["utilization"] <= 1
+
+    pool.shutdown()
+    assert pool.stats()["threads"] == 0
+    assert pool.submit(lambda: 2).result(5) == 2
+    pool.shutdown()
+
+
+def test_shutdown_cancels_queued_tasks():
+    pool = InstrumentedPool("unit", 1)
+    gate = threading.Event()
+    started = threading.Event()
+    running = pool.submit(lambda: (started.set(), gate.wait(5)))
+    started.wait(5)
+    queued = [pool.submit(lambda: 1) for _ in range(3)]
+
+    threading.Timer(0.05, gate.set).start()
+    pool.shutdown(cancel_futures=True)
+    assert running.result(5) == (None, True)
+    assert all(f.cancelled() for f in queued)
+    stats = pool.stats()
+    assert stats["cancelled"] == 3 and stats["completed"] == 1 and stats["queued"] == 0
+
+
+def test_registry_returns_one_pool_per_name():
+    assert get_pool("unit-registry", 3) is get_pool("unit-registry")
+    assert get_pool("unit-registry").max_workers == 3
+    assert {"cpu", "io"} <= set(pool_stats())
+
+
+def test_status_reports_executors_after_offloaded_requests():
+    before = pool_stats()
+    assert client.get("/query", params={"text": "vcf diesel at 25c"}).status_code == 200
+    assert client.get("/history", params={"limit": 1}).status_code == 200
+
+    executors = client.get("/status").json()["result"]["executors"]
+    assert executors["cpu"]["completed"] > before["cpu"]["completed"]
+    assert executors["io"]["completed"] > before["io"]["completed"]
+    for stats in executors.values():
+        assert {"max_workers", "active", "queued", "utilization"} <= set(stats)
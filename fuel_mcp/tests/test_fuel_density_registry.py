@@ -0,0 +1,68 @@
+"""
+fuel_mcp/tests/test_fuel_density_registry.py
+============================================
+
+Tests for the shared FuelDensityRegistry:
+- loads fuel_data.json once (no JSON parsing on the hot path)
+- reloads when the file's mtime changes
+- resolves fuel names case-insensitively through the alias table
+"""
+
+import json
+import os
+
+from fuel_mcp.core import fuel_density_loader
+from fuel_mcp.core.fuel_density_loader import FuelDensityRegistry, get_fuel_density
+from fuel_mcp.core.vcf_official_full import correct_mass, correct_volume
+
+
+def _write(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_registry_parses_file_once(tmp_path, monkeypatch):
+    db = tmp_path / "fuel_data.json"
+    _write(db, {"diesel": {"density_15C": 845.0}})
+    registry = FuelDensityRegistry(db, check_interval=0)
+
+    calls = {"n": 0}
+    real_load = json.load
+
+    def counting_load(f):
+        calls["n"] += 1
+        return real_load(f)
+
+    monkeypatch.setattr(fuel_density_loader.json, "load", counting_load)
+    for _ in range(50):
+        assert registry.get("diesel") == 845.0
+    assert calls["n"] == 1
+
+
+def test_registry_reloads_on_mtime_change(tmp_path):
+    db = tmp_path / "fuel_data.json"
+    _write(db, {"diesel": {"density_15C": 845.0}}, mtime_ns=1_000_000_000)
+    registry = FuelDensityRegistry(db, check_interval=0)
+    assert registry.get("diesel") == 845.0
+    version = registry.version
+
+    _write(db, {"diesel": {"density_15C": 852.5}}, mtime_ns=2_000_000_000)
+    assert registry.get("diesel") == 852.5
+    assert registry.version == version + 1
+
+
+def test_registry_aliases_and_case(tmp_path):
+    db = tmp_path / "fuel_data.json"
+    _write(db, {"Diesel": {"density_15C": 845.0}, "hfo": {"density_15C": 985.0}})
+    registry = FuelDensityRegistry(db, check_interval=0)
+    assert registry.get("DIESEL") == 845.0
+    assert registry.get("MGO") == 845.0
+    assert registry.get("ifo") == 985.0
+    assert registry.get("unknown fuel") == 850.0
+
+
+def test_default_registry_feeds_all_call_sites():
+    rho = get_fuel_density("hfo")
+    assert correct_volume("HFO", 100.0, 25.0)["rho15"] == round(rho, 3)
+    assert correct_mass("hfo", 100.0, 25.0)["rho15"] == round(rho, 3)
@@ -0,0 +1,91 @@
+"""
+fuel_mcp/tests/test_lazy_embedder.py
+====================================
+
+Tests for the lazy local embedding model holder in rag_bridge:
+- importing the CLI does not pull in the transformer stack
+- the model is loaded once, on first use or in a background warm-up
+- a failed load falls back to the pseudo-embedding
+"""
+
+import subprocess
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from fuel_mcp.core import rag_bridge
+from fuel_mcp.core.rag_bridge import LazyEmbedder
+
+
+@pytest.fixture
+def fake_transformers(monkeypatch):
+    """Install a fake sentence_transformers module that records model loads."""
+    loads = []
+
+    class FakeModel:
+        def __init__(self, name, trust_remote_code=False):
+            loads.append(name)
+
+        def encode(self, text, normalize_embeddings=True):
+            return np.ones(4) / 2.0
+
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeModel
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    return loads
+
+
+def test_cli_import_skips_transformer_stack():
+    code = (
+        "import sys, fuel_mcp.core.cli; "
+        "print(any(m.split('.')[0] in ('sentence_transformers', 'torch', 'transformers') for m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "False"
+
+
+def test_loads_once_on_first_use(fake_transformers):
+    embedder = LazyEmbedder("fake/model")
+    assert embedder.status()["state"] == "not_loaded"
+    assert fake_transformers == []
+
+    threads = [threading.Thread(target=embedder.get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert fake_transformers == ["fake/model"]
+    status = embedder.status()
+    assert status["state"] == "ready"
+    assert status["load_seconds"] is not None and status["loaded_at"]
+
+
+def test_background_warm(fake_transformers):
+    embedder = LazyEmbedder("fake/model")
+    thread = embedder.warm()
+    assert embedder.warm() is thread
+    thread.join(5)
+    assert embedder.status()["state"] == "ready"
+    assert fake_transformers == ["fake/model"]
+
+
+def test_failed_load_falls_back_to_pseudo_embedding(monkeypatch):
+    module = types.ModuleType("sentence_transformers")
+
+    def broken(*args, **kwargs):
+        raise OSError("model files missing")
+
+    module.SentenceTransformer = broken
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    embedder = LazyEmbedder("missing/model")
+    monkeypatch.setattr(rag_bridge, "_EMBEDDER", embedder)
+
+    vec = rag_bridge.embed_query_offline("diesel vcf", dim=16)
+    assert vec.shape == (16,)
+    assert np.isclose(np.linalg.norm(vec), 1.0)
+    assert embedder.status()["state"] == "failed"
+    assert "model files missing" in embedder.status()["error"]
@@ -0,0 +1,84 @@
+"""
+test_metrics.py
+===============
+In-process metrics registry (core.metrics) and GET /metrics/prom:
+- histogram buckets and p50/p95/p99 estimates
+- Prometheus text exposition (counters, histograms, label escaping)
+- middleware counts requests per route template and status code
+- stage timings, cache and log-queue gauges are exported
+- scraping never touches SQLite
+"""
+
+import math
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fuel_mcp.api.mcp_api import app
+from fuel_mcp.core import db_logger
+from fuel_mcp.core.metrics import Histogram, MetricsRegistry, get_metrics
+
+client = TestClient(app)
+
+
+def test_histogram_quantiles():
+    hist = Histogram((0.01, 0.1, 1.0))
+    assert math.isnan(hist.quantile(0.5))
+    for value in [0.005] * 50 + [0.05] * 45 + [0.5] * 4 + [5.0]:
+        hist.observe(value)
+    assert hist.count == 100 and hist.sum == pytest.approx(0.25 + 2.25 + 2 + 5)
+    assert hist.quantile(0.5) == pytest.approx(0.01)
+    assert 0.01 < hist.quantile(0.95) <= 0.1
+    assert 0.1 < hist.quantile(0.99) <= 1.0
+    assert hist.quantile(1.0) == 1.0  # +Inf bucket reports the highest finite bound
+    assert hist.cumulative()[-1] == ("+Inf", 100)
+
+    summary = hist.summary()
+    assert summary["count"] == 100 and summary["p50_ms"] == pytest.approx(10.0)
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.observe_request("GET", "/vcf", 200, 0.05)
+    registry.observe_request("GET", "/vcf", 400, 0.5)
+    with registry.stage("vcf"):
+        pass
+    registry.add_collector(lambda: [("custom", "gauge", "Custom gauge.", [({"name": 'a"b'}, 1.5)])])
+    registry.add_collector(lambda: 1 / 0)  # broken collectors are skipped
+
+    text = registry.render_prometheus()
+    assert '# TYPE fuel_mcp_requests_total counter' in text
+    assert 'fuel_mcp_requests_total{method="GET",route="/vcf",status="400"} 1' in text
+    assert 'fuel_mcp_request_duration_seconds_bucket{method="GET",route="/vcf",le="0.1"} 1' in text
+    assert 'fuel_mcp_request_duration_seconds_bucket{method="GET",route="/vcf",le="+Inf"} 2' in text
+    assert 'fuel_mcp_request_duration_seconds_count{method="GET",route="/vcf"} 2' in text
+    assert 'fuel_mcp_request_duration_seconds_quantile{method="GET",route="/vcf",quantile="0.99"}' in text
+    assert 'fuel_mcp_stage_duration_seconds_count{stage="vcf"} 1' in text
+    assert 'fuel_mcp_custom{name="a\\"b"} 1.5' in text
+
+    snapshot = registry.snapshot()
+    assert snapshot["routes"]["GET /vcf"]["statuses"] == {"200": 1, "400": 1}
+    assert snapshot["stages"]["vcf"]["count"] == 1
+
+
+def test_prometheus_endpoint_counts_routes_and_skips_sqlite(monkeypatch):
+    get_metrics().reset()
+    client.get("/vcf", params={"rho15": 850, "tempC": 25})
+    client.get("/vcf", params={"rho15": 5000, "tempC": 25})
+    client.get("/query", params={"text": "convert 500 l diesel at 30c"})
+    client.get("/no/such/route")
+
+    def no_sqlite():
+        raise AssertionError("scrape touched SQLite")
+
+    monkeypatch.setattr(db_logger, "get_connection", no_sqlite)
+    res = client.get("/metrics/prom")
+    assert res.status_code == 200 and res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = res.text
+    assert 'fuel_mcp_requests_total{method="GET",route="/vcf",status="200"} 1' in text
+    assert 'fuel_mcp_requests_total{method="GET",route="/vcf",status="400"} 1' in text
+    assert 'route="<unmatched>",status="404"' in text and "/no/such/route" not in text
+    assert 'fuel_mcp_stage_duration_seconds_count{stage="parse"}' in text
+    assert 'fuel_mcp_cache_hit_ratio{cache="query"}' in text
+    assert "fuel_mcp_log_queue_depth " in text
+    assert 'fuel_mcp_executor_queued{pool="cpu"}' in text
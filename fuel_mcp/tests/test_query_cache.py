@@ -0,0 +1,94 @@
+"""
+fuel_mcp/tests/test_query_cache.py
+==================================
+
+Tests for the /query result cache in regex_parser:
+- differently worded queries with the same canonical parse share one computation
+- a changed fuel_data.json invalidates cached results
+- callers get copies, and hit-rate metrics are reported
+"""
+
+import json
+import os
+
+import pytest
+
+from fuel_mcp.core import fuel_density_loader, regex_parser
+from fuel_mcp.core.fuel_density_loader import DEFAULT_FUEL_DATA, FuelDensityRegistry
+from fuel_mcp.core.regex_parser import QueryResultCache, canonical_key, parse_query
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """Temporary fuel_data.json installed as the default density registry."""
+    db = tmp_path / "fuel_data.json"
+    db.write_text(json.dumps({"diesel": {"density_15C": 845.0}}))
+    os.utime(db, ns=(1_000_000_000, 1_000_000_000))
+    reg = FuelDensityRegistry(db, check_interval=0)
+    monkeypatch.setitem(fuel_density_loader._REGISTRIES, DEFAULT_FUEL_DATA.resolve(), reg)
+    return reg
+
+
+@pytest.fixture
+def computations(monkeypatch):
+    calls = []
+    real = regex_parser.compute_query
+
+    def counting(parsed):
+        calls.append(parsed)
+        return real(parsed)
+
+    monkeypatch.setattr(regex_parser, "compute_query", counting)
+    return calls
+
+
+def test_reworded_queries_share_one_computation(registry, computations):
+    cache = QueryResultCache(maxsize=16, ttl=60)
+    first = cache.get_or_compute(parse_query("convert 500 L diesel @ 30°C"))
+    second = cache.get_or_compute(parse_query("Convert 0.5 m3 of diesel at 30 c"))
+    assert first == second
+    assert len(computations) == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+
+
+def test_key_ignores_fields_the_mode_does_not_use():
+    a = canonical_key(parse_query("calculate vcf for diesel at 25°C"))
+    b = canonical_key(parse_query("vcf of 200 L diesel at 25 degrees"))
+    assert a == b == ("diesel", 25.0, "vcf", None)
+    assert canonical_key(parse_query("500 L at 30°C")) is None  # no fuel → error, not cached
+
+
+def test_fuel_data_change_invalidates(registry, computations):
+    cache = QueryResultCache(maxsize=16, ttl=60)
+    query = parse_query("calculate vcf for diesel at 25°C")
+    assert cache.get_or_compute(query)["rho15"] == 845.0
+
+    registry.path.write_text(json.dumps({"diesel": {"density_15C": 852.5}}))
+    os.utime(registry.path, ns=(2_000_000_000, 2_000_000_000))
+
+    assert cache.get_or_compute(query)["rho15"] == 852.5
+    assert len(computations) == 2
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_callers_get_copies(registry):
+    cache = QueryResultCache(maxsize=16, ttl=60)
+    query = parse_query("convert 500 L diesel @ 30°C")
+    result = cache.get_or_compute(query)
+    result["VCF"] = 0.0
+    result["equivalents"]["m3_15C"] = 0.0
+    again = cache.get_or_compute(query)
+    assert again["VCF"] != 0.0 and again["equivalents"]["m3_15C"] != 0.0
+
+
+def test_ttl_expiry(registry, computations):
+    now = [0.0]
+    cache = QueryResultCache(maxsize=16, ttl=10)
+    cache.cache.clock = lambda: now[0]
+    query = parse_query("calculate vcf for diesel at 25°C")
+    cache.get_or_compute(query)
+    now[0] = 11.0
+    cache.get_or_compute(query)
+    assert len(computations) == 2
+    assert cache.stats()["expirations"] == 1
@@ -0,0 +1,94 @@
+"""
+fuel_mcp/tests/test_query_counters.py
+=====================================
+
+Tests for the materialized query counters in db_logger:
+- triggers keep query_counters equal to COUNT(*) over queries on
+  insert, update and delete, from any writer
+- databases created before the counters table are backfilled on open
+- rebuild_query_counters() / `mcp-cli db rebuild-counters` repair drift
+- snapshot_metrics() feeds metrics_log from the counters
+"""
+
+import sqlite3
+
+import pytest
+
+from fuel_mcp.core import cli, db_logger
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    db = tmp_path / "history.db"
+    monkeypatch.setattr(db_logger, "DB_PATH", db)
+    monkeypatch.setattr(cli, "DB_PATH", db)
+    yield db
+    db_logger.close_connections()
+
+
+def _scan(conn, where="1"):
+    return conn.execute(f"SELECT COUNT(*) FROM queries WHERE {where}").fetchone()[0]
+
+
+def _assert_matches_scan(conn):
+    counts = db_logger.get_query_counts(conn)
+    assert counts == {"total": _scan(conn), "successful": _scan(conn, "success = 1"), "failed": _scan(conn, "success = 0")}
+
+
+def test_triggers_track_inserts_updates_and_deletes(temp_db):
+    rows = [(f"2026-01-0{1 + i % 3}T10:00:00", f"q{i}", "vcf" if i % 2 else "convert", "{}", i % 3 != 0)
+            for i in range(30)]
+    db_logger.write_log_batch(rows, [])
+    conn = db_logger.get_connection()
+    _assert_matches_scan(conn)
+
+    by_mode = db_logger.get_counts_by_mode(conn)
+    assert by_mode["vcf"]["total"] == 15 and by_mode["convert"]["total"] == 15
+    assert db_logger.get_query_counts(conn, mode="vcf", since="2026-01-02")["total"] == 10
+
+    other = sqlite3.connect(temp_db)  # a writer that bypasses db_logger
+    with other:
+        other.execute("INSERT INTO queries (timestamp, query, mode, success) VALUES (NULL, 'x', NULL, NULL)")
+        other.execute("UPDATE queries SET success = 0 WHERE query IN ('q1', 'q2')")
+        other.execute("DELETE FROM queries WHERE timestamp < '2026-01-02'")
+    other.close()
+    _assert_matches_scan(conn)
+    assert db_logger.get_query_counts(conn)["total"] == 21
+
+    with conn:
+        conn.execute("DELETE FROM queries")
+    assert conn.execute("SELECT COUNT(*) FROM query_counters").fetchone()[0] == 0  # empty keys are dropped
+
+
+def test_backfill_existing_database_and_rebuild(temp_db, capsys):
+    legacy = sqlite3.connect(temp_db)
+    with legacy:
+        for ddl in db_logger.SCHEMA[:3]:  # queries, errors, metrics_log — no counters yet
+            legacy.execute(ddl)
+        legacy.executemany(
+            "INSERT INTO queries (timestamp, query, mode, result, success) VALUES (?, ?, ?, ?, ?)",
+            [("2025-12-31T00:00:00", f"old{i}", "vcf", "{}", i % 2) for i in range(9)],
+        )
+    legacy.close()
+
+    conn = db_logger.get_connection()
+    _assert_matches_scan(conn)
+    assert db_logger.get_query_counts(conn) == {"total": 9, "successful": 4, "failed": 5}
+
+    with conn:
+        conn.execute("UPDATE query_counters SET count = 1000")  # drift
+    cli.db_rebuild_counters()
+    assert "Total queries: 9" in capsys.readouterr().out
+    _assert_matches_scan(conn)
+
+
+def test_snapshot_metrics_reads_counters(temp_db):
+    db_logger.write_log_batch([("2026-02-01T00:00:00", "q", "vcf", "{}", 1)] * 3
+                              + [("2026-02-01T00:00:00", "q", "vcf", "{}", 0)], [])
+    counts = db_logger.snapshot_metrics(12.5)
+    assert counts == {"total": 4, "successful": 3, "failed": 1}
+
+    row = db_logger.get_connection().execute(
+        "SELECT uptime_seconds, total_queries, successful_queries, failed_queries, success_ratio FROM metrics_log"
+    ).fetchone()
+    assert row == (12.5, 4, 3, 1, "75.0%")
@@ -12,7 +12,7 @@ import os
 from pathlib import Path
 from fuel_mcp.core import rag_bridge
 
-RAG_LOG = Path("fuel_mcp/logs/rag_activity.json")
+RAG_LOG = Path("fuel_mcp/logs/rag_activity.jsonl")
 
 # =====================================================
 # 🔍 1. Structural Integrity
@@ -57,11 +57,12 @@ def test_online_mode(monkeypatch):
 # 🧾 4. Structured Logging Check
 # =====================================================
 def test_rag_activity_log_exists():
-    """Ensure structured log file is created and valid JSON."""
-    assert RAG_LOG.exists(), "rag_activity.json was not created"
+    """Ensure structured log file is created and every line is valid JSON."""
+    log_data = rag_bridge.recent_rag_events(100)  # flushes buffered events
+    assert RAG_LOG.exists(), "rag_activity.jsonl was not created"
     with open(RAG_LOG, "r") as f:
-        log_data = json.load(f)
-    assert isinstance(log_data, list)
+        lines = [json.loads(line) for line in f if line.strip()]
+    assert lines[-len(log_data):] == log_data
     assert all("timestamp" in e for e in log_data)
     assert all("event" in e for e in log_data)
     assert all("mode" in e for e in log_data)
@@ -0,0 +1,97 @@
+"""
+test_response_schema.py
+=======================
+Legacy (v1) and lean (v2) response schemas:
+- v1 stays the default and keeps its flattened top-level keys
+- v2 is negotiated with ?schema=v2 or the X-MCP-Schema header
+- v2 carries only `result` and a compact `_meta`, for success and error
+- responses are serialized with orjson (numpy values included)
+- v1 metrics report a "0%" success ratio when no queries were logged yet
+"""
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from fuel_mcp.api.mcp_api import app
+from fuel_mcp.api.responses import MCPJSONResponse
+from fuel_mcp.core.response_schema import (
+    SCHEMA_LEAN,
+    SCHEMA_LEGACY,
+    current_schema,
+    error_response,
+    negotiate_schema,
+    reset_schema,
+    success_response,
+    use_schema,
+)
+
+client = TestClient(app)
+VCF_PARAMS = {"rho15": 850, "tempC": 25}
+
+
+def test_negotiate_schema():
+    assert negotiate_schema() == SCHEMA_LEGACY
+    assert negotiate_schema("v2") == SCHEMA_LEAN
+    assert negotiate_schema(header=" V2 ") == SCHEMA_LEAN
+    assert negotiate_schema("v1", "v2") == SCHEMA_LEGACY  # the query parameter wins
+    assert negotiate_schema("v9") == SCHEMA_LEGACY
+
+
+def test_lean_builders():
+    result = {"VCF": 0.99, "table": "54B"}
+    lean = success_response(result, "vcf", "vcf", "1.0", schema=SCHEMA_LEAN)
+    assert lean["result"] == result and set(lean) == {"result", "_meta"}
+    assert set(lean["_meta"]) == {"mode", "version", "ts"}
+    assert success_response([1, 2], "h", "history", "1.0", schema=SCHEMA_LEAN)["result"] == {"entries": [1, 2]}
+
+    error = error_response("boom", "q", "error", "1.0", "/vcf", schema=SCHEMA_LEAN)
+    assert error["result"] == {"error": "boom"} and error["_meta"]["endpoint"] == "/vcf"
+
+    token = use_schema(SCHEMA_LEAN)
+    try:
+        assert current_schema() == SCHEMA_LEAN
+        assert "VCF" not in success_response(result, "vcf", "vcf", "1.0")
+    finally:
+        reset_schema(token)
+    legacy = success_response(result, "vcf", "vcf", "1.0")
+    assert legacy["VCF"] == 0.99 and legacy["_meta"]["timestamp"] == legacy["timestamp"]
+
+
+def test_legacy_is_default():
+    data = client.get("/vcf", params=VCF_PARAMS).json()
+    assert "VCF" in data and data["result"]["VCF"] == data["VCF"]
+    assert data["_meta"]["query"] and data["mode"] == "vcf"
+
+
+def test_lean_by_param_and_header():
+    by_param = client.get("/vcf", params={**VCF_PARAMS, "schema": "v2"})
+    by_header = client.get("/vcf", params=VCF_PARAMS, headers={"X-MCP-Schema": "v2"})
+    legacy = client.get("/vcf", params=VCF_PARAMS).json()
+    for res in (by_param, by_header):
+        assert res.status_code == 200
+        data = res.json()
+        assert set(data) == {"result", "_meta"} and data["_meta"]["mode"] == "vcf"
+        assert data["result"]["VCF"] == legacy["VCF"]
+        assert len(res.content) < len(client.get("/vcf", params=VCF_PARAMS).content)
+
+    error = client.get("/vcf", params={"rho15": 5000, "tempC": 25, "schema": "v2"})
+    assert error.status_code == 400
+    assert set(error.json()) == {"result", "_meta"} and "error" in error.json()["result"]
+
+    metrics = client.get("/metrics", params={"schema": "v2"}).json()
+    assert "total_queries" in metrics["result"] and "db_path" not in metrics
+
+
+def test_metrics_success_ratio_without_queries():
+    empty = {"total_queries": 0, "successful_queries": 0, "failed_queries": 0}
+    resp = success_response(empty, "metrics", "metrics", "x", schema=SCHEMA_LEGACY)
+    assert resp["success_ratio"] == "0%"
+    resp = success_response({**empty, "total_queries": 4, "successful_queries": 3}, "metrics", "metrics", "x",
+                            schema=SCHEMA_LEGACY)
+    assert resp["success_ratio"] == "75.0%"
+
+
+def test_orjson_response_class():
+    res = MCPJSONResponse({"x": np.float64(0.5), "n": np.arange(3), 1: "key"})
+    assert res.body == b'{"x":0.5,"n":[0,1,2],"1":"key"}'
+    assert res.media_type == "application/json"
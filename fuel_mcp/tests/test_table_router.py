@@ -0,0 +1,80 @@
+"""
+fuel_mcp/tests/test_table_router.py
+===================================
+
+Tests for the rule-based table router and its use in mcp_core:
+- operation types and explicit table numbers resolve without embeddings
+- ambiguous matches fall back to semantic search
+- the path taken is reported in _meta["table_route"]
+- _meta["selected_table"] is the table the result was computed from; a
+  different routed table is reported as routed_table / table_conflict
+"""
+
+import pytest
+
+from fuel_mcp.core import mcp_core
+from fuel_mcp.core.table_router import TableRouter, get_router, route_table
+
+
+@pytest.mark.parametrize("query, op_type, table", [
+    ("calculate VCF for diesel at 25°C", "vcf", "VCF_official_equations"),
+    ("convert density 850 to ton", "density_to_mass", "ASTM_Table54B_Density15C_to_Short_and_Long_Tons_per_CubicMeter"),
+    ("density 850 to volume", "density_to_volume", "ASTM_Table53B_Density15C_to_CubicMeters_per_MetricTon"),
+])
+def test_operation_rules(query, op_type, table):
+    assert route_table(query, op_type) == {"table": table, "path": "rule:operation"}
+
+
+def test_explicit_table_number():
+    route = route_table("density 850 to volume using Table 56", "density_to_volume")
+    assert route == {"table": "ASTM_Table56_Density15C_to_VacuoAirFactor", "path": "rule:table_number"}
+
+
+def test_ambiguous_matches_return_none():
+    assert route_table("density 850 to ton per table 16", "density_to_mass") is None  # two Table16 files
+    assert route_table("air correction for 0.84", "air_correction") is None  # tables 56 and 57
+    assert route_table("something else") is None
+
+
+def test_router_built_from_registry_categories():
+    router = TableRouter(
+        {"ASTM_Table99B_Foo.csv": {"category": "density ↔ mass", "conversion_path": "ρ15 → x"}},
+        {"Bar_equations": {"category": "Analytical Equations", "outputs": ["VCF"]}},
+    )
+    assert router.route("q", "density_to_mass")["table"] == "ASTM_Table99B_Foo"
+    assert router.route("see table 99b")["table"] == "ASTM_Table99B_Foo"
+    assert router.route("q", "vcf")["table"] == "Bar_equations"
+    assert get_router() is get_router()
+
+
+def test_query_mcp_skips_semantic_search_on_rule_match(monkeypatch):
+    def no_rag(*args, **kwargs):
+        raise AssertionError("semantic search should not run")
+
+    monkeypatch.setattr(mcp_core, "find_table_for_query", no_rag)
+    result = mcp_core.query_mcp("calculate VCF for diesel at 25°C")
+    assert result["_meta"]["selected_table"] == "VCF_official_equations"
+    assert result["_meta"]["table_route"] == "rule:operation"
+    assert result["_meta"]["routed_table"] == "VCF_official_equations" and not result["_meta"]["table_conflict"]
+
+
+def test_query_mcp_reports_explicit_table_conflict():
+    result = mcp_core.query_mcp("density 850 to volume using Table 56")
+    meta = result["_meta"]
+    assert meta["table_route"] == "rule:table_number"
+    assert meta["routed_table"] == "ASTM_Table56_Density15C_to_VacuoAirFactor"
+    assert meta["selected_table"] == "ASTM_Table53B_Density15C_to_CubicMeters_per_MetricTon"
+    assert result["source_table"] == meta["selected_table"] + "_norm.csv"
+    assert meta["table_conflict"] is True
+
+    agreed = mcp_core.query_mcp("density 850 to volume using table 53B")["_meta"]
+    assert agreed["routed_table"] == agreed["selected_table"] and agreed["table_conflict"] is False
+
+
+def test_query_mcp_semantic_fallback(monkeypatch):
+    monkeypatch.setattr(mcp_core, "find_table_for_query", lambda q, top_k=1: [{"table": "ASTM_Table16_X"}])
+    result = mcp_core.query_mcp("convert density 850 to ton using table 16")
+    assert result["_meta"]["routed_table"] == "ASTM_Table16_X"
+    assert result["_meta"]["table_route"] == "semantic"
+    assert result["_meta"]["selected_table"] == "ASTM_Table54B_Density15C_to_Short_and_Long_Tons_per_CubicMeter"
+    assert result["_meta"]["table_conflict"] is True
@@ -0,0 +1,65 @@
+"""
+fuel_mcp/tests/test_tokenizer.py
+================================
+
+Golden-output tests for the shared query tokenizer: regex_parser.parse_query
+and mcp_core.extract_query_params must reproduce, for every query in
+golden/query_corpus.txt, what the previous per-pattern regex parsers
+returned (recorded in golden/parse_query_golden.json).
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from fuel_mcp.core.mcp_core import extract_query_params
+from fuel_mcp.core.regex_parser import parse_query
+from fuel_mcp.core.tokenizer import BARE_DENSITY, CELSIUS, MASS, TEMP, VOLUME, tokenize
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+GOLDEN = json.loads((GOLDEN_DIR / "parse_query_golden.json").read_text(encoding="utf-8"))
+ERRORS = {"op_type": "conversion type", "density": "No density"}
+
+
+def test_golden_covers_corpus():
+    corpus = [
+        line.rstrip("\n") for line in (GOLDEN_DIR / "query_corpus.txt").read_text(encoding="utf-8").splitlines()
+        if line.strip() and not line.startswith("#")
+    ]
+    assert [case["query"] for case in GOLDEN] == corpus
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=[c["query"] for c in GOLDEN])
+def test_parse_query_matches_golden(case):
+    assert parse_query(case["query"]) == case["parse_query"]
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=[c["query"] for c in GOLDEN])
+def test_mcp_core_extraction_matches_golden(case):
+    expected = case["mcp_core"]
+    if "error" in expected:
+        with pytest.raises(ValueError, match=ERRORS[expected["error"]]):
+            extract_query_params(case["query"])
+    else:
+        assert extract_query_params(case["query"]) == (expected["op_type"], expected["tempC"], expected["rho15"])
+
+
+def test_single_pass_tokens():
+    tokens = tokenize("Convert 500 L diesel @ 30°C, density 850 at 25 c, 2 tons, volume correction")
+    assert [n.value for n in tokens.numbers] == [500.0, 30.0, 850.0, 25.0, 2.0]
+    assert tokens.first(VOLUME).value == 500.0
+    assert tokens.first(TEMP).value == 30.0
+    assert tokens.first(MASS).unit == "t"
+    assert tokens.first(BARE_DENSITY).value == 850.0
+    assert {"convert", "diesel", "density", "ton", "volume correction", "volume", "correction"} <= tokens.terms
+
+
+def test_negative_celsius():
+    number = tokenize("jet a1 at -5°C").first(CELSIUS)
+    assert number.value == 5.0 and number.negative
+
+
+def test_decimal_fraction_is_also_a_candidate():
+    # "1.2.3 l": the legacy leftmost search found "2.3 l" after rejecting "1.2"
+    assert parse_query("1.2.3 l diesel")["volume_l"] == 2.3
@@ -0,0 +1,89 @@
+"""
+test_vcf_batch.py
+=================
+Ensures vcf_iso_official_batch() reproduces the scalar vcf_iso_official()
+bit for bit (VCF, table, coefficient_a, exponent_b) across all tables,
+and that auto_correct_batch() matches auto_correct() tank by tank.
+"""
+
+import numpy as np
+import pytest
+
+from fuel_mcp.core.vcf_official_full import (
+    VCF_INVALID,
+    VCF_TABLE_IDS,
+    auto_correct,
+    auto_correct_batch,
+    density_error,
+    vcf_iso_official,
+    vcf_iso_official_batch,
+)
+
+
+def _assert_matches_scalar(rho, temp, out):
+    for i in range(rho.size):
+        ref = vcf_iso_official(float(rho[i]), float(temp[i]))
+        assert out["VCF"][i] == ref["VCF"]
+        assert out["coefficient_a"][i] == ref["coefficient_a"]
+        assert out["exponent_b"][i] == ref["exponent_b"]
+        assert VCF_TABLE_IDS[out["table"][i]] == ref["table"]
+
+
+def test_batch_matches_scalar_on_grid():
+    """Regular density/temperature grid, including every table boundary."""
+    rho, temp = np.meshgrid(np.arange(610.5, 1164.01, 2.5), np.arange(-30, 120.01, 5.0), indexing="ij")
+    valid = (rho <= 770.0) | (rho > 770.5)
+    rho, temp = rho[valid], temp[valid]
+    _assert_matches_scalar(rho, temp, vcf_iso_official_batch(rho, temp))
+
+
+def test_batch_matches_scalar_random():
+    rng = np.random.default_rng(91)
+    rho = rng.uniform(770.6, 1164.0, 20_000)
+    temp = rng.uniform(-30.0, 120.0, 20_000)
+    _assert_matches_scalar(rho, temp, vcf_iso_official_batch(rho, temp))
+
+
+def test_batch_broadcasts_scalar_temperature():
+    out = vcf_iso_official_batch([740.0, 850.0, 1100.0], 25.0)
+    assert out.shape == (3,)
+    assert [VCF_TABLE_IDS[c][:3] for c in out["table"]] == ["54A", "54B", "54D"]
+
+
+@pytest.mark.parametrize("rho15", [600.0, 770.2, 1200.0])
+def test_batch_rejects_out_of_range_density(rho15):
+    with pytest.raises(ValueError) as batch_err:
+        vcf_iso_official_batch([850.0, rho15], 25.0)
+    with pytest.raises(ValueError) as scalar_err:
+        vcf_iso_official(rho15, 25.0)
+    assert str(batch_err.value) == str(scalar_err.value)
+
+
+def test_batch_masks_out_of_range_density():
+    out = vcf_iso_official_batch([850.0, 600.0, 770.2, 991.0], 25.0, invalid="mask")
+    assert out["table"].tolist()[1:3] == [VCF_INVALID, VCF_INVALID]
+    assert np.isnan(out["VCF"][1]) and np.isnan(out["VCF"][2])
+    assert out["VCF"][0] == vcf_iso_official(850.0, 25.0)["VCF"]
+    assert out["VCF"][3] == vcf_iso_official(991.0, 25.0)["VCF"]
+    with pytest.raises(ValueError, match=density_error(770.2)):
+        vcf_iso_official(770.2, 25.0)
+
+
+def test_auto_correct_batch_matches_scalar():
+    rng = np.random.default_rng(1250)
+    n = 4_000
+    fuels = rng.choice(["diesel", "hfo", "mgo", "lube", "jet"], n).tolist()
+    temp = np.round(rng.uniform(-10.0, 80.0, n), 1)
+    is_volume = rng.random(n) < 0.5
+    volume = np.where(is_volume, np.round(rng.uniform(0.5, 5000.0, n), 3), np.nan)
+    mass = np.where(is_volume, np.nan, np.round(rng.uniform(0.5, 5000.0, n), 3))
+    rho = np.where(rng.random(n) < 0.5, np.round(rng.uniform(780.0, 1100.0, n), 1), np.nan)
+    out = auto_correct_batch(fuels, temp, volume, mass, rho)
+
+    for i in range(n):
+        amount = {"volume_m3": float(volume[i])} if is_volume[i] else {"mass_ton": float(mass[i])}
+        ref = auto_correct(fuels[i], tempC=float(temp[i]), rho15=None if np.isnan(rho[i]) else float(rho[i]), **amount)
+        assert (out["VCF"][i], out["V15_m3"][i], out["mass_ton"][i]) == (ref["VCF"], ref["V15_m3"], ref["mass_ton"])
+        assert {k: out[k][i] for k in ref["equivalents"]} == ref["equivalents"]
+        if not is_volume[i]:
+            assert out["volume_obs_m3"][i] == ref["volume_obs_m3"]
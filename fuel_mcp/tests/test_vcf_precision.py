@@ -7,7 +7,9 @@ within ±0.0005 tolerance for a representative density/temperature grid.
 
 import pytest
 import math
-from fuel_mcp.core.vcf_official_full import vcf_iso_official
+import numpy as np
+from fuel_mcp.core.vcf_grid import SEGMENT_RANGES, VCFGrid
+from fuel_mcp.core.vcf_official_full import VCF_INVALID, _table_codes, _vcf_terms, vcf_iso_official
 
 # Official tolerance from ISO 91-1 Annex E
 VCF_TOL = 0.0005
@@ -35,3 +37,42 @@ def test_vcf_precision(case):
         f"VCF mismatch for ρ15={case['rho15']}, T={case['tempC']}°C: "
         f"computed={computed}, expected={expected}, Δ={diff:.6f}"
     )
+
+
+# =====================================================
+# 🧮 Precomputed grid (VCFGrid) — same tolerance
+# =====================================================
+@pytest.fixture(scope="module", params=["bilinear", "bicubic"])
+def vcf_grid(request):
+    return VCFGrid.build(rho_step=2.0, temp_step=2.0, method=request.param)
+
+
+def test_vcf_grid_max_error_within_tolerance(vcf_grid):
+    """Stated max error bound vs the analytic formula must sit inside ISO 91-1 tolerance."""
+    assert vcf_grid.max_abs_error <= VCF_TOL
+
+
+def test_vcf_grid_bound_holds_at_random_points(vcf_grid):
+    """Off-node points anywhere in the grid never exceed the stated max_abs_error."""
+    rng = np.random.default_rng(91)
+    rho = np.concatenate([rng.uniform(lo, hi, 50_000) for lo, hi in SEGMENT_RANGES])
+    rho = rho[_table_codes(rho) != VCF_INVALID]  # open lower bounds of the 54B segments
+    temp = rng.uniform(-30.0, 120.0, rho.size)
+    _, _, exact = _vcf_terms(_table_codes(rho), rho, temp)  # unrounded formula
+    assert np.max(np.abs(vcf_grid.vcf(rho, temp) - exact)) <= vcf_grid.max_abs_error
+    assert vcf_grid.meta["max_abs_error_sampled"] < vcf_grid.max_abs_error
+
+
+@pytest.mark.parametrize("case", REFERENCE_CASES)
+def test_vcf_grid_precision(vcf_grid, case):
+    grid_vcf = float(vcf_grid.vcf(case["rho15"], case["tempC"]))
+    assert abs(grid_vcf - case["expected_vcf"]) <= VCF_TOL
+
+
+def test_vcf_grid_memory_mapped_roundtrip(vcf_grid, tmp_path):
+    path = vcf_grid.save(tmp_path / "vcf_grid")
+    loaded = VCFGrid.load(path, mmap=True)
+    assert isinstance(loaded.values, np.memmap)
+    assert loaded.max_abs_error == vcf_grid.max_abs_error
+    rho = np.array([740.0, 850.0, 1100.0])
+    assert np.array_equal(loaded.vcf(rho, 25.0), vcf_grid.vcf(rho, 25.0))
@@ -0,0 +1,88 @@
+"""
+fuel_mcp/tests/test_vector_index.py
+===================================
+
+Tests for the shared in-memory VectorIndex in rag_bridge:
+- top-k matches a brute-force cosine ranking
+- the store is loaded once and hot-reloaded when it changes
+- online search scores against the same index
+"""
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+from fuel_mcp.core import rag_bridge
+from fuel_mcp.core.rag_bridge import VectorIndex
+from fuel_mcp.rag import vector_store
+
+
+def _write_store(path, vectors, mtime_ns=None):
+    data = {
+        f"T{i}": {"embedding": list(map(float, v)), "description": f"table {i}", "category": "test"}
+        for i, v in enumerate(vectors)
+    }
+    vector_store.write_store(data, path)
+    if mtime_ns is not None:
+        os.utime(vector_store.meta_path(path), ns=(mtime_ns, mtime_ns))
+
+
+def test_top_k_matches_brute_force(tmp_path):
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(40, 16))
+    store = tmp_path / "store.npy"
+    _write_store(store, vectors)
+    index = VectorIndex(store, check_interval=0)
+
+    q = rng.normal(size=16)
+    sims = vectors @ q / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(q))
+    expected = [f"T{i}" for i in np.argsort(-sims)[:5]]
+
+    hits = index.search(q, top_k=5)
+    assert [h["table"] for h in hits] == expected
+    assert hits[0]["similarity"] == round(float(sims.max()), 4)
+    assert hits[0]["description"].startswith("table")
+    assert len(index.search(q, top_k=100)) == 40
+
+
+def test_ties_keep_store_order(tmp_path):
+    store = tmp_path / "store.npy"
+    _write_store(store, [[1.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 0.0]])
+    hits = VectorIndex(store, check_interval=0).search([1.0, 0.0], top_k=2)
+    assert [h["table"] for h in hits] == ["T0", "T2"]
+
+
+def test_store_parsed_once_and_hot_reloaded(tmp_path, monkeypatch):
+    store = tmp_path / "store.npy"
+    _write_store(store, [[1.0, 0.0], [0.0, 1.0]], mtime_ns=1_000_000_000)
+    index = VectorIndex(store, check_interval=0)
+
+    calls = {"n": 0}
+    real_load = vector_store.load_store
+
+    def counting_load(path):
+        calls["n"] += 1
+        return real_load(path)
+
+    monkeypatch.setattr(vector_store, "load_store", counting_load)
+    for _ in range(20):
+        assert index.search([1.0, 0.0], top_k=1)[0]["table"] == "T0"
+    assert calls["n"] == 1
+
+    _write_store(store, [[0.0, 1.0], [1.0, 0.0]], mtime_ns=2_000_000_000)
+    assert index.search([1.0, 0.0], top_k=1)[0]["table"] == "T1"
+    assert calls["n"] == 2
+
+
+def test_online_search_uses_shared_index(monkeypatch):
+    index = rag_bridge.get_vector_index()
+    index.refresh()
+    target = index.matrix[3]
+    fake = SimpleNamespace(embeddings=SimpleNamespace(
+        create=lambda model, input: SimpleNamespace(data=[SimpleNamespace(embedding=target.tolist())])
+    ))
+    monkeypatch.setattr(rag_bridge, "client", fake)
+    hits = rag_bridge.find_table_online("anything", top_k=1)
+    assert hits[0]["similarity"] == 1.0
+    assert np.allclose(index.matrix[list(index.keys).index(hits[0]["table"])], target)
@@ -0,0 +1,98 @@
+"""
+fuel_mcp/tests/test_vector_store.py
+===================================
+
+Tests for the binary RAG vector store:
+- migration from vector_store.json preserves keys and embeddings
+- the matrix is memory-mapped and appends don't rewrite existing rows
+- in-place overwrite, dimension checks and float16 round trip
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from fuel_mcp.rag import vector_store
+
+
+def _entries(n, dim=8, seed=0, prefix="T"):
+    rng = np.random.default_rng(seed)
+    return {
+        f"{prefix}{i}": {"embedding": rng.normal(size=dim).tolist(), "description": f"table {i}", "category": "test"}
+        for i in range(n)
+    }
+
+
+def test_migrate_json_matches_legacy(tmp_path):
+    data = _entries(5)
+    legacy = tmp_path / "vector_store.json"
+    legacy.write_text(json.dumps(data, indent=2))
+    store = tmp_path / "vector_store.npy"
+
+    meta = vector_store.migrate_json(legacy, store)
+    matrix, loaded = vector_store.load_store(store)
+
+    assert isinstance(matrix, np.memmap)
+    assert meta == loaded
+    assert loaded["keys"] == list(data)
+    assert loaded["dim"] == 8 and loaded["count"] == 5 and loaded["dtype"] == "float32"
+    assert np.allclose(matrix, [v["embedding"] for v in data.values()], atol=1e-6)
+    assert loaded["descriptions"][2] == "table 2"
+
+
+def test_append_keeps_existing_rows_and_header_size(tmp_path):
+    store = tmp_path / "store.npy"
+    vector_store.write_store(_entries(3), store)
+    before = store.read_bytes()
+
+    meta = vector_store.upsert(_entries(2, seed=1, prefix="N"), store)
+    after = store.read_bytes()
+
+    assert meta["count"] == 5
+    assert meta["keys"] == ["T0", "T1", "T2", "N0", "N1"]
+    # only the shape in the fixed-size header changed; old rows are byte-identical
+    assert after[vector_store._HEADER_BYTES:len(before)] == before[vector_store._HEADER_BYTES:]
+    assert len(after) == vector_store._HEADER_BYTES + 5 * 8 * 4
+    matrix, _ = vector_store.load_store(store)
+    assert matrix.shape == (5, 8)
+
+
+def test_upsert_overwrites_existing_key_in_place(tmp_path):
+    store = tmp_path / "store.npy"
+    vector_store.write_store(_entries(3), store)
+    size = store.stat().st_size
+
+    new_vec = [1.0] * 8
+    meta = vector_store.upsert({"T1": {"embedding": new_vec, "description": "patched"}}, store)
+
+    assert store.stat().st_size == size
+    assert meta["count"] == 3
+    assert meta["descriptions"][1] == "patched"
+    assert meta["categories"][1] == "test"
+    matrix, _ = vector_store.load_store(store)
+    assert np.array_equal(matrix[1], new_vec)
+
+
+def test_dim_mismatch_rejected_without_changes(tmp_path):
+    store = tmp_path / "store.npy"
+    vector_store.write_store(_entries(2), store)
+    before = store.read_bytes()
+
+    with pytest.raises(ValueError):
+        vector_store.upsert({"X": {"embedding": [0.0] * 4}}, store)
+    assert store.read_bytes() == before
+    assert vector_store.read_meta(store)["count"] == 2
+
+
+def test_float16_round_trip_and_entries(tmp_path):
+    data = _entries(4, dim=16)
+    store = tmp_path / "store.npy"
+    vector_store.write_store(data, store, dtype="float16")
+
+    assert store.stat().st_size == vector_store._HEADER_BYTES + 4 * 16 * 2
+    entries = vector_store.load_entries(store)
+    assert [e["table"] for e in entries] == list(data)
+    for e in entries:
+        assert e["embedding"].dtype == np.float32
+        assert np.allclose(e["embedding"], data[e["table"]]["embedding"], atol=1e-2)